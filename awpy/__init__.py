@@ -1,3 +1,21 @@
-from awpy.parser import DemoParser
+import importlib
+from typing import Any
 
 __version__ = "1.2.2.1"
+
+# Names are resolved on first access so that `import awpy` does not pull in
+# pandas or the compiled Go wrapper
+_LAZY_ATTRIBUTES = {"DemoParser": "awpy.parser"}
+_SUBMODULES = ["analytics", "data", "parser", "types", "utils", "visualization"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES) + _SUBMODULES)
@@ -0,0 +1,268 @@
+"""Parallel, resumable builder of the area and place distance matrices of many maps.
+
+The source rows of every map are split into blocks that run in a process pool.
+Each finished block is checkpointed in the nav cache
+(``<map_name>.matrix_block_<start>_<stop>.npz``), so an interrupted build resumes
+with the blocks that are still missing. Once all blocks of a map exist they are
+assembled into the binary files of AreaDistanceMatrix (including predecessors),
+the symmetric and place distance matrices are derived from it and the checkpoints
+are removed.
+
+    Typical usage example:
+
+    python -m awpy.analytics.nav build-matrices de_anubis de_bank --processes 8
+
+    from awpy.analytics.matrix_builder import build_matrices
+
+    build_matrices(["de_anubis"], output_dir="matrices")
+"""
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from awpy.data import NAV, PATH
+from awpy.data.cache import (
+    clear_matrix_blocks,
+    graph_checksum,
+    load_matrix_block,
+    matrix_block_done,
+    save_matrix_block,
+)
+from awpy.data.matrix import (
+    AreaDistanceMatrix,
+    SymmetricAreaDistanceMatrix,
+    DIST_TYPE_INDEX,
+    PATH_DIST_TYPE_INDEX,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Source rows per task. About 6 MB of checkpoint per block on the largest maps
+DEFAULT_BLOCK_SIZE = 256
+
+
+def _blocks(n_areas: int, block_size: int) -> list[tuple[int, int]]:
+    return [
+        (start, min(start + block_size, n_areas))
+        for start in range(0, n_areas, block_size)
+    ]
+
+
+def compute_block(map_name: str, start: int, stop: int) -> tuple[str, int, int]:
+    """Computes and checkpoints the distances from the rows start to stop of a map
+
+    Args:
+        map_name (string): Name of the map
+        start (int): First row of the block
+        stop (int): Row after the last row of the block
+
+    Returns:
+        Tuple of the arguments, to identify the finished block"""
+    from scipy.sparse.csgraph import dijkstra
+    from scipy.spatial.distance import cdist
+
+    mesh = NAV[map_name]
+    graph = mesh.csr_graph()
+    rows = np.arange(start, stop)
+    distances = np.empty((len(rows), len(mesh), len(DIST_TYPE_INDEX)), np.float32)
+    predecessors = np.empty(
+        (len(rows), len(mesh), len(PATH_DIST_TYPE_INDEX)), dtype=np.int32
+    )
+    for dist_type, i in PATH_DIST_TYPE_INDEX.items():
+        # Same searches as compute_area_distance_matrix, restricted to the block
+        distances[..., DIST_TYPE_INDEX[dist_type]], predecessors[..., i] = dijkstra(
+            graph,
+            directed=True,
+            indices=rows,
+            unweighted=dist_type == "graph",
+            return_predecessors=True,
+        )
+    distances[..., DIST_TYPE_INDEX["euclidean"]] = cdist(
+        mesh.centers[start:stop], mesh.centers
+    )
+    save_matrix_block(
+        map_name,
+        start,
+        stop,
+        {"distances": distances, "predecessors": predecessors},
+        graph_checksum(mesh),
+    )
+    return map_name, start, stop
+
+
+def assemble_area_matrix(
+    map_name: str, output_dir: Union[str, Path], block_size: int
+) -> Path:
+    """Joins the checkpointed blocks of a map, saves the matrix and removes the blocks
+
+    Args:
+        map_name (string): Name of the map
+        output_dir (str): Directory to write the matrix files to
+        block_size (int): Block size the blocks were computed with
+
+    Returns:
+        Path of the written distance file
+
+    Raises:
+        RuntimeError: If a block is missing or was computed on another nav mesh"""
+    mesh = NAV[map_name]
+    checksum = graph_checksum(mesh)
+    distances = np.empty((len(mesh), len(mesh), len(DIST_TYPE_INDEX)), np.float32)
+    predecessors = np.empty(
+        (len(mesh), len(mesh), len(PATH_DIST_TYPE_INDEX)), dtype=np.int32
+    )
+    for start, stop in _blocks(len(mesh), block_size):
+        block = load_matrix_block(map_name, start, stop, checksum)
+        if block is None:
+            raise RuntimeError(f"Block {start}:{stop} of {map_name} is missing.")
+        distances[start:stop] = block["distances"]
+        predecessors[start:stop] = block["predecessors"]
+    path = AreaDistanceMatrix(map_name, mesh.area_ids, distances, predecessors).save(
+        output_dir
+    )
+    clear_matrix_blocks(map_name)
+    return path
+
+
+def build_place_matrix(map_name: str, output_dir: Union[str, Path]) -> Path:
+    """Derives the place distance matrix of a map from its saved area distance matrix
+
+    Args:
+        map_name (string): Name of the map
+        output_dir (str): Directory holding the area matrix and receiving the place matrix
+
+    Returns:
+        Path of the written distance file"""
+    from awpy.analytics.nav import compute_place_distance_matrix
+
+    area_matrix = AreaDistanceMatrix.load(output_dir, map_name)
+    return compute_place_distance_matrix(map_name, area_matrix).save(output_dir)
+
+
+def build_symmetric_matrix(map_name: str, output_dir: Union[str, Path]) -> Path:
+    """Derives the symmetric area distance matrix of a map from its saved area distance matrix
+
+    Args:
+        map_name (string): Name of the map
+        output_dir (str): Directory holding the area matrix and receiving the symmetric matrix
+
+    Returns:
+        Path of the written distance file"""
+    area_matrix = AreaDistanceMatrix.load(output_dir, map_name)
+    return SymmetricAreaDistanceMatrix.from_area_matrix(area_matrix).save(output_dir)
+
+
+def build_matrices(
+    map_names: Optional[list[str]] = None,
+    output_dir: Optional[Union[str, Path]] = None,
+    processes: Optional[int] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    places: bool = True,
+    symmetric: bool = True,
+) -> dict[str, Path]:
+    """Builds the area (and the symmetric and place) distance matrices of maps
+
+    Blocks that were checkpointed by an earlier, interrupted run for the same nav
+    mesh are not computed again. Workers read the maps from awpy.data.NAV, so maps
+    registered with register_nav are only available to them with the fork start method.
+
+    Args:
+        map_names (list, optional): Maps to build. Defaults to every map with an edge list
+        output_dir (str, optional): Directory to write the matrices to. Defaults to the nav directory of awpy.data
+        processes (int, optional): Number of worker processes, 1 runs everything in this process.
+            Defaults to the number of CPUs
+        block_size (int, optional): Source rows per task. Defaults to DEFAULT_BLOCK_SIZE
+        places (bool, optional): Whether to build the place distance matrices as well. Defaults to True
+        symmetric (bool, optional): Whether to build the symmetric area distance matrices as well. Defaults to True
+
+    Returns:
+        Dictionary mapping every map to the path of its area distance file
+
+    Raises:
+        ValueError: If a map is not in awpy.data.NAV or has no edges, or block_size is not positive
+    """
+    if block_size < 1:
+        raise ValueError(f"'block_size' has to be positive not {block_size}")
+    if map_names is None:
+        map_names = [
+            map_name for map_name in NAV.keys() if NAV[map_name].edges is not None
+        ]
+    for map_name in map_names:
+        if map_name not in NAV:
+            raise ValueError(f"Map {map_name} not found.")
+        if NAV[map_name].edges is None:
+            raise ValueError(f"Nav mesh of {map_name} has no edges.")
+    if output_dir is None:
+        output_dir = os.path.join(PATH, "nav")
+    tasks: list[tuple[str, int, int]] = []
+    remaining: dict[str, int] = {}
+    for map_name in map_names:
+        checksum = graph_checksum(NAV[map_name])
+        blocks = _blocks(len(NAV[map_name]), block_size)
+        missing = [
+            (map_name, start, stop)
+            for start, stop in blocks
+            if not matrix_block_done(map_name, start, stop, checksum)
+        ]
+        if len(missing) < len(blocks):
+            logger.info(
+                "%s: resuming with %d of %d blocks", map_name, len(missing), len(blocks)
+            )
+        remaining[map_name] = len(missing)
+        tasks.extend(missing)
+    paths: dict[str, Path] = {}
+
+    derived = ([build_place_matrix] if places else []) + (
+        [build_symmetric_matrix] if symmetric else []
+    )
+
+    def finish(map_name: str) -> None:
+        paths[map_name] = assemble_area_matrix(map_name, output_dir, block_size)
+        logger.info("%s: wrote %s", map_name, paths[map_name])
+
+    if processes == 1:
+        for task in tasks:
+            compute_block(*task)
+        for map_name in map_names:
+            finish(map_name)
+            for build in derived:
+                try:
+                    build(map_name, output_dir)
+                except Exception:
+                    logger.error("%s: %s failed", map_name, build.__name__)
+                    raise
+        return paths
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Step ("compute_block" or the name of a derived build) and map of every future
+        futures: dict[Future, tuple[str, str]] = {
+            pool.submit(compute_block, *task): ("compute_block", task[0])
+            for task in tasks
+        }
+        done_maps = [map_name for map_name, count in remaining.items() if count == 0]
+        while done_maps or futures:
+            for map_name in done_maps:
+                finish(map_name)
+                for build in derived:
+                    future = pool.submit(build, map_name, output_dir)
+                    futures[future] = (build.__name__, map_name)
+            done_maps = []
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, map_name = futures.pop(future)
+                try:
+                    future.result()
+                except Exception:
+                    logger.error("%s: %s failed", map_name, kind)
+                    # Otherwise leaving the pool waits for every queued block
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    raise
+                if kind == "compute_block":
+                    remaining[map_name] -= 1
+                    if remaining[map_name] == 0:
+                        done_maps.append(map_name)
+    return paths
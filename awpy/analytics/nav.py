@@ -23,21 +23,126 @@
 """
 import sys
 import os
-from typing import TypedDict, Literal, cast, get_args
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Optional,
+    TypedDict,
+    Literal,
+    Union,
+    cast,
+    get_args,
+)
 import itertools
+import threading
 from collections import defaultdict
-from statistics import mean, median
 import math
 import json
-from sympy.utilities.iterables import multiset_permutations
-import networkx as nx
 import numpy as np
-from scipy.spatial import distance
-from shapely.geometry import Polygon
 
-from awpy.data import NAV, NAV_GRAPHS, AREA_DIST_MATRIX, PLACE_DIST_MATRIX, PATH
+from awpy.data import (
+    NAV,
+    NAV_GRAPHS,
+    AREA_DIST_MATRIX,
+    PLACE_DIST_MATRIX,
+    SYMMETRIC_DIST_MATRIX,
+    MAP_DATA,
+    PATH,
+)
+from awpy.data.navmesh import NavMesh
+from awpy.data.lru import LRUCache
+from awpy.data.spatial import AreaRaster
+from awpy.data.matrix import (
+    AreaDistanceMatrix,
+    PlaceDistanceMatrix,
+    SymmetricAreaDistanceMatrix,
+    DIST_TYPE_INDEX,
+    PATH_DIST_TYPES,
+    PATH_DIST_TYPE_INDEX,
+    REFERENCE_POINT_INDEX,
+)
 from awpy.types import GameFrame, AreaMatrix, PlaceMatrix, DistanceType, Token
 
+if TYPE_CHECKING:
+    # scipy, shapely and sympy are imported inside the functions that need them
+    # so that importing this module stays cheap
+    from scipy.sparse import csr_matrix
+
+
+def _get_nav_mesh(map_name: str) -> NavMesh:
+    """Returns the columnar nav mesh of a map.
+
+    NAV can also hold plain ``dict[int, Area]`` values (for example custom meshes),
+    these are converted on the fly.
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    return NavMesh.from_dict(map_name, NAV[map_name])
+
+
+def _get_csr_graph(map_name: str) -> tuple[NavMesh, "csr_matrix"]:
+    """Returns the nav mesh of a map together with its sparse adjacency matrix.
+
+    Meshes without edges (for example plain dicts in NAV) take them from awpy.data.NAV_GRAPHS.
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+    """
+    mesh = _get_nav_mesh(map_name)
+    if mesh.edges is None and map_name in NAV_GRAPHS:
+        graph_edges = list(NAV_GRAPHS[map_name].edges(data="weight"))
+        mesh.set_edges(
+            np.array([(u, v) for u, v, _ in graph_edges], dtype=np.int64),
+            np.array([w for _, _, w in graph_edges], dtype=np.float64),
+        )
+    return mesh, mesh.csr_graph()
+
+
+def _path_from_predecessors(
+    mesh: NavMesh, predecessors: np.ndarray, row_a: int, row_b: int
+) -> list[int]:
+    """Walks a predecessor array of scipy.sparse.csgraph back from row_b to row_a
+
+    Returns:
+        List of area ids from area a to area b, empty if there is no path"""
+    if row_a != row_b and predecessors[row_b] < 0:
+        return []
+    path_rows = [row_b]
+    while path_rows[-1] != row_a:
+        path_rows.append(predecessors[path_rows[-1]])
+    return mesh.area_ids[path_rows[::-1]].tolist()
+
+
+def _get_area_matrix(map_name: str) -> Optional[AreaDistanceMatrix]:
+    """Returns the precomputed area distance matrix of a map if there is one.
+
+    Falls back to a matrix warmed into AREA_DISTANCE_CACHE.
+    Legacy nested dict matrices are converted on the fly.
+    """
+    if map_name not in AREA_DIST_MATRIX:
+        return AREA_DISTANCE_CACHE.matrix(map_name)
+    return AreaDistanceMatrix.from_dict(map_name, AREA_DIST_MATRIX[map_name])
+
+
+def _get_symmetric_matrix(map_name: str) -> Optional[SymmetricAreaDistanceMatrix]:
+    """Returns the precomputed symmetric area distance matrix of a map if there is one."""
+    if map_name not in SYMMETRIC_DIST_MATRIX:
+        return None
+    return SYMMETRIC_DIST_MATRIX[map_name]
+
+
+def _get_place_matrix(map_name: str) -> Optional[PlaceDistanceMatrix]:
+    """Returns the precomputed place distance matrix of a map if there is one.
+
+    Legacy nested dict matrices are converted on the fly.
+    """
+    if map_name not in PLACE_DIST_MATRIX:
+        return None
+    return PlaceDistanceMatrix.from_dict(map_name, PLACE_DIST_MATRIX[map_name])
+
 
 def point_in_area(map_name: str, area_id: int, point: list[float]) -> bool:
     """Returns if the point is within a nav area for a map.
@@ -89,12 +194,56 @@ class ClosestArea(TypedDict):
     distance: float
 
 
-def find_closest_area(map_name: str, point: list[float]) -> ClosestArea:
-    """Finds the closest area in the nav mesh. Searches through all the areas by comparing point to area centerpoint.
+# Relative tolerance under which two KD-tree distances may still tie after exact recomputation
+_TIE_TOLERANCE = 1e-9
+
+
+def _center_distances(
+    mesh: NavMesh, points: np.ndarray, rows: np.ndarray
+) -> np.ndarray:
+    """Distances from points (n, 3) to the centers of rows (n,), same formula as a linear scan"""
+    centers = mesh.centers[rows]
+    return np.sqrt(
+        (points[:, 0] - centers[:, 0]) ** 2
+        + (points[:, 1] - centers[:, 1]) ** 2
+        + (points[:, 2] - centers[:, 2]) ** 2
+    )
+
+
+def _closest_row(
+    mesh: NavMesh, point: np.ndarray, tree_dist: float
+) -> tuple[int, float]:
+    """Resolves the closest center exactly among all centers within tree_dist of point.
+    On ties the row that comes first in the mesh wins, like a linear scan"""
+    candidates = np.array(
+        sorted(
+            mesh.kd_tree().query_ball_point(
+                point, tree_dist * (1 + _TIE_TOLERANCE) + _TIE_TOLERANCE
+            )
+        ),
+        dtype=np.int64,
+    )
+    dists = _center_distances(
+        mesh, np.broadcast_to(point, (len(candidates), 3)), candidates
+    )
+    # argmin returns the first minimum
+    closest = int(np.argmin(dists))
+    return int(candidates[closest]), dists[closest]
+
+
+def find_closest_area(
+    map_name: str, point: list[float], use_raster: bool = False
+) -> ClosestArea:
+    """Finds the closest area in the nav mesh. Compares the point to the center of every area.
+
+    Uses the KD-tree of the map, the result is the same as comparing against every area:
+    on ties the area that comes first in the nav mesh wins.
 
     Args:
         map_name (string): Map to search
         point (list): Point as a list [x,y,z]
+        use_raster (bool, optional): Take the area from the raster of the map (see area_raster) instead.
+            Much faster for large batches but only as exact as the cell size. Defaults to False
 
     Returns:
         A dict containing info on the closest area
@@ -107,6 +256,7 @@ def find_closest_area(map_name: str, point: list[float]) -> ClosestArea:
         raise ValueError("Map not found.")
     if len(point) != 3:
         raise ValueError("Point must be a list [X,Y,Z]")
+    mesh = _get_nav_mesh(map_name)
     closest_area: ClosestArea = {
         "mapName": map_name,
         # I do not think there is anyway this can actually be None
@@ -114,25 +264,184 @@ def find_closest_area(map_name: str, point: list[float]) -> ClosestArea:
         "areaId": 0,
         "distance": float("inf"),
     }
-    for area in NAV[map_name].keys():
-        avg_x = (
-            NAV[map_name][area]["northWestX"] + NAV[map_name][area]["southEastX"]
-        ) / 2
-        avg_y = (
-            NAV[map_name][area]["northWestY"] + NAV[map_name][area]["southEastY"]
-        ) / 2
-        avg_z = (
-            NAV[map_name][area]["northWestZ"] + NAV[map_name][area]["southEastZ"]
-        ) / 2
-        dist = np.sqrt(
-            (point[0] - avg_x) ** 2 + (point[1] - avg_y) ** 2 + (point[2] - avg_z) ** 2
-        )
-        if dist < closest_area["distance"]:
-            closest_area["areaId"] = area
-            closest_area["distance"] = dist
+    query = np.asarray(point, dtype=np.float64)
+    if len(mesh) == 0 or not np.isfinite(query).all():
+        return closest_area
+    if use_raster:
+        row = mesh.row(int(area_raster(map_name).lookup(query)[0]))
+        dist = _center_distances(mesh, query[None, :], np.array([row]))[0]
+    else:
+        tree_dist, _ = mesh.kd_tree().query(query)
+        row, dist = _closest_row(mesh, query, tree_dist)
+    closest_area["areaId"] = int(mesh.area_ids[row])
+    closest_area["distance"] = dist
     return closest_area
 
 
+def find_closest_areas(
+    map_name: str, points: np.ndarray, use_raster: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the closest area for many points at once. Batch version of find_closest_area
+    with the same results.
+
+    Args:
+        map_name (string): Map to search
+        points (np.ndarray): Points with shape (n, 3)
+        use_raster (bool, optional): Take the areas from the raster of the map (see area_raster) instead.
+            Defaults to False
+
+    Returns:
+        Tuple of the closest area ids (shape (n,), int64) and the distances to their centers (shape (n,)).
+        Points that are not finite get area id 0 and distance inf
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If points does not have shape (n, 3)
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("Points must have shape (n, 3)")
+    mesh = _get_nav_mesh(map_name)
+    area_ids = np.zeros(len(points), dtype=np.int64)
+    distances = np.full(len(points), np.inf)
+    valid = np.flatnonzero(np.isfinite(points).all(axis=1))
+    if len(mesh) == 0 or len(valid) == 0:
+        return area_ids, distances
+    if use_raster:
+        rows = mesh.rows(area_raster(map_name).lookup(points[valid]))
+        area_ids[valid] = mesh.area_ids[rows]
+        distances[valid] = _center_distances(mesh, points[valid], rows)
+        return area_ids, distances
+    k = min(2, len(mesh))
+    tree_dists, rows = mesh.kd_tree().query(points[valid], k=k)
+    tree_dists, rows = tree_dists.reshape(-1, k), rows.reshape(-1, k)
+    best_rows = rows[:, 0]
+    best_dists = _center_distances(mesh, points[valid], best_rows)
+    if k > 1:
+        # The two nearest centers are (almost) equally far away, resolve those points exactly
+        ambiguous = np.flatnonzero(
+            tree_dists[:, 1] <= tree_dists[:, 0] * (1 + _TIE_TOLERANCE) + _TIE_TOLERANCE
+        )
+        for i in ambiguous:
+            best_rows[i], best_dists[i] = _closest_row(
+                mesh, points[valid[i]], tree_dists[i, 0]
+            )
+    area_ids[valid] = mesh.area_ids[best_rows]
+    distances[valid] = best_dists
+    return area_ids, distances
+
+
+def locate_areas(map_name: str, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the area that contains each point, for many points at once.
+
+    A point lies in an area if it is within the area's bounds in x and y. Where areas
+    overlap (different floors), the area closest to the point in z is used. Points
+    that no area contains fall back to the area with the closest center, like
+    find_closest_areas.
+
+    Args:
+        map_name (string): Map to search
+        points (np.ndarray): Points with shape (n, 3)
+
+    Returns:
+        Tuple of the area ids (shape (n,), int64) and whether the area contains the point (shape (n,)).
+        Points that are not finite get area id 0
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If points does not have shape (n, 3)
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 3:
+        raise ValueError("Points must have shape (n, 3)")
+    mesh = _get_nav_mesh(map_name)
+    rows, contained = mesh.area_grid().locate(points)
+    area_ids = np.zeros(len(points), dtype=np.int64)
+    area_ids[contained] = mesh.area_ids[rows[contained]]
+    if not contained.all():
+        area_ids[~contained], _ = find_closest_areas(map_name, points[~contained])
+    return area_ids, contained
+
+
+def area_raster(map_name: str, cell_size: Optional[float] = None) -> AreaRaster:
+    """Returns the raster of area ids of a map used by the use_raster options.
+
+    Maps with a z_cutoff in awpy.data.MAP_DATA get one layer above and one below the cutoff.
+    Rasters are compiled into the nav cache once per map and cell size. The raster
+    is kept on the nav mesh, so calling this with a cell size also sets the
+    resolution used by find_closest_area, generate_position_token and point_distance.
+
+    Args:
+        map_name (string): Map to search
+        cell_size (float, optional): Edge length of a cell in game units. Defaults to the
+            cell size of the current raster of the map or DEFAULT_RASTER_CELL_SIZE (8)
+
+    Returns:
+        AreaRaster of the map
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    z_cutoff = MAP_DATA[map_name].get("z_cutoff") if map_name in MAP_DATA else None
+    return _get_nav_mesh(map_name).area_raster(cell_size, z_cutoff)
+
+
+def place_names(map_name: str) -> list[str]:
+    """Returns the sorted names of all places of a map.
+
+    The position of a name in this list is its place index, as used by position tokens
+    and place_indices.
+
+    Args:
+        map_name (string): Map to search
+
+    Returns:
+        Sorted list of place names
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    return _get_nav_mesh(map_name).place_table()[0].tolist()
+
+
+def place_indices(
+    map_name: str, points: np.ndarray, use_raster: bool = False
+) -> np.ndarray:
+    """Finds the place index (see place_names) of the closest area of many points at once.
+
+    Args:
+        map_name (string): Map to search
+        points (np.ndarray): Points with shape (n, 3)
+        use_raster (bool, optional): Find the areas with the raster of the map (see area_raster).
+            Defaults to False
+
+    Returns:
+        Place indices with shape (n,) and dtype int16. Points that are not finite get -1
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If points does not have shape (n, 3)
+    """
+    area_ids, distances = find_closest_areas(map_name, points, use_raster)
+    mesh = _get_nav_mesh(map_name)
+    indices = np.full(len(area_ids), -1, dtype=np.int16)
+    found = np.isfinite(distances)
+    indices[found] = mesh.place_table()[1][mesh.rows(area_ids[found])]
+    return indices
+
+
+# Landmark lower bound of the geodesic distance, see area_distance
+AreaDistanceType = Literal[DistanceType, "geodesic_approx"]
+
+
 class DistanceObject(TypedDict):
     """TypedDict for distance object holding information about
     distance type, distance and the areas in the path between two points/areas"""
@@ -142,20 +451,170 @@ class DistanceObject(TypedDict):
     areas: list[int]
 
 
+class AreaDistanceCache:
+    """Opt-in, size bounded and thread-safe memoization of area_distance.
+
+    The cache is disabled until enable() is called. Entries are keyed by
+    (map_name, area_a, area_b, dist_type) and only used while the nav mesh of the
+    map is the one they were computed on. warm() attaches a precomputed
+    AreaDistanceMatrix to a map. area_distance then answers pairs of the matrix
+    from it, rebuilding paths from its predecessors, whether or not the cache is
+    enabled, and so do the distance-only lookups of position_state_distance,
+    token_state_distance and generate_place_distance_matrix (maps with an entry in
+    awpy.data.AREA_DIST_MATRIX already use that one). Such lookups count as hits.
+
+        Typical usage example:
+
+        from awpy.analytics.nav import AREA_DISTANCE_CACHE
+
+        AREA_DISTANCE_CACHE.enable(maxsize=100_000)
+        AREA_DISTANCE_CACHE.warm("de_nuke", compute_area_distance_matrix("de_nuke"))
+        AREA_DISTANCE_CACHE.stats()
+    """
+
+    def __init__(self) -> None:
+        self._lru = LRUCache(maxsize=0)
+        self._matrices: dict[str, AreaDistanceMatrix] = {}
+        self._matrix_hits = 0
+        self._lock = threading.Lock()
+
+    def enable(self, maxsize: int = 65536) -> None:
+        """Starts caching up to maxsize area_distance results"""
+        self._lru.resize(maxsize)
+
+    def disable(self) -> None:
+        """Stops caching and drops all entries and warmed matrices"""
+        self._lru.resize(0)
+        self.clear()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether area_distance results are cached"""
+        return self._lru.maxsize > 0
+
+    def clear(self) -> None:
+        """Drops all entries, warmed matrices and statistics"""
+        self._lru.clear()
+        with self._lock:
+            self._matrices.clear()
+            self._matrix_hits = 0
+
+    def warm(
+        self,
+        map_name: str,
+        matrix: Optional[Union[AreaDistanceMatrix, AreaMatrix]] = None,
+    ) -> None:
+        """Makes the distances of a matrix available without any search
+
+        Args:
+            map_name (string): Map the matrix belongs to
+            matrix (AreaDistanceMatrix, optional): Matrix, for example from compute_area_distance_matrix
+                or a legacy nested dict. Defaults to the matrix in awpy.data.AREA_DIST_MATRIX
+
+        Raises:
+            ValueError: If map_name is not in awpy.data.NAV or there is no matrix for it
+        """
+        if map_name not in NAV:
+            raise ValueError("Map not found.")
+        if matrix is None:
+            if map_name not in AREA_DIST_MATRIX:
+                raise ValueError(f"No area distance matrix for {map_name}.")
+            matrix = AREA_DIST_MATRIX[map_name]
+        self._matrices[map_name] = AreaDistanceMatrix.from_dict(map_name, matrix)
+
+    def matrix(self, map_name: str) -> Optional[AreaDistanceMatrix]:
+        """Returns the matrix warmed for a map, if any"""
+        return self._matrices.get(map_name)
+
+    def stats(self) -> dict[str, int]:
+        """Returns the hits, misses, size and maximum size of the cache and the number of warmed maps
+
+        Hits include the area_distance calls answered by a warmed matrix."""
+        stats = self._lru.stats()
+        with self._lock:
+            stats["hits"] += self._matrix_hits
+            stats["matrices"] = len(self._matrices)
+        return stats
+
+    def lookup(
+        self, map_name: str, area_a: int, area_b: int, dist_type: AreaDistanceType
+    ) -> Optional[DistanceObject]:
+        """Returns the result of area_distance from the matrix warmed for map_name
+
+        Returns None if there is no such matrix, it misses one of the areas or it has
+        no predecessors to rebuild a graph or geodesic path from."""
+        matrix = self._matrices.get(map_name)
+        if matrix is None or area_a not in matrix.index or area_b not in matrix.index:
+            return None
+        if dist_type in PATH_DIST_TYPE_INDEX and matrix.predecessors is None:
+            return None
+        # The exact geodesic distance is the best possible approximation
+        distance = matrix.distance(
+            area_a, area_b, "geodesic" if dist_type == "geodesic_approx" else dist_type
+        )
+        distance_obj: DistanceObject = {
+            "distanceType": dist_type,
+            "distance": distance,
+            "areas": [],
+        }
+        if dist_type in PATH_DIST_TYPE_INDEX:
+            distance_obj["areas"] = matrix.path(area_a, area_b, dist_type)
+            if dist_type == "graph" and distance_obj["areas"]:
+                distance_obj["distance"] = len(distance_obj["areas"]) - 1
+        with self._lock:
+            self._matrix_hits += 1
+        return distance_obj
+
+    def get(self, mesh: NavMesh, key: tuple) -> Optional[DistanceObject]:
+        """Returns a copy of the cached result of key if it was computed on mesh"""
+        if not self.enabled:
+            return None
+        cached = self._lru.get(key, valid=lambda value: value[0] is mesh)
+        if cached is None:
+            return None
+        distance_obj = cached[1]
+        return {**distance_obj, "areas": list(distance_obj["areas"])}
+
+    def put(self, mesh: NavMesh, key: tuple, distance_obj: DistanceObject) -> None:
+        """Stores a copy of the result of key computed on mesh"""
+        if self.enabled:
+            self._lru.put(
+                key, (mesh, {**distance_obj, "areas": list(distance_obj["areas"])})
+            )
+
+    def __repr__(self) -> str:
+        return f"AreaDistanceCache({self.stats()})"
+
+
+AREA_DISTANCE_CACHE = AreaDistanceCache()
+
+
 def area_distance(
     map_name: str,
     area_a: int,
     area_b: int,
-    dist_type: DistanceType = "graph",
+    dist_type: AreaDistanceType = "graph",
 ) -> DistanceObject:
-    """Returns the distance between two areas. Dist type can be graph, geodesic or euclidean.
+    """Returns the distance between two areas. Dist type can be graph, geodesic, euclidean or geodesic_approx.
+
+    geodesic_approx needs no graph search and returns no path. It is the landmark
+    lower bound of the geodesic distance (see NavMesh.landmarks), so it never exceeds
+    the geodesic distance and falls short of it by at most upper - lower, where upper
+    is the length of the shortest detour over a landmark (Landmarks.upper_bound).
+    Pairs without such a detour are searched exactly, and maps with a precomputed
+    area distance matrix return the exact value. The landmarks are built on the first
+    geodesic_approx call of a map. Exact geodesic searches only use landmarks that
+    already exist, kept on the mesh or in the nav cache, to limit how far they expand.
+
+    Pairs of a matrix warmed into AREA_DISTANCE_CACHE are answered from it, other
+    results are memoized in AREA_DISTANCE_CACHE once it is enabled.
 
     Args:
         map_name (string): Map to search
         area_a (int): Area id
         area_b (int): Area id
         dist_type (string, optional): String indicating the type of distance to use (graph,
-            geodesic or euclidean). Defaults to 'graph'
+            geodesic, euclidean or geodesic_approx). Defaults to 'graph'
 
     Returns:
         A dict containing info on the path between two areas.
@@ -163,77 +622,446 @@ def area_distance(
     Raises:
         ValueError: If map_name is not in awpy.data.NAV
                     If either area_a or area_b is not in awpy.data.NAV[map_name]
-                    If the dist_type is not one of ["graph", "geodesic", "euclidean"]
+                    If the dist_type is not one of ["graph", "geodesic", "euclidean", "geodesic_approx"]
     """
     if map_name not in NAV:
         raise ValueError("Map not found.")
     if (area_a not in NAV[map_name].keys()) or (area_b not in NAV[map_name].keys()):
         raise ValueError("Area ID not found.")
-    if dist_type not in get_args(DistanceType):
-        raise ValueError("dist_type can only be graph, geodesic or euclidean")
-    G = NAV_GRAPHS[map_name]
+    if dist_type not in get_args(AreaDistanceType):
+        raise ValueError(
+            "dist_type can only be graph, geodesic, euclidean or geodesic_approx"
+        )
+    distance_obj = AREA_DISTANCE_CACHE.lookup(map_name, area_a, area_b, dist_type)
+    if distance_obj is not None:
+        return distance_obj
+    if not AREA_DISTANCE_CACHE.enabled:
+        return _area_distance(map_name, area_a, area_b, dist_type)
+    mesh = _get_nav_mesh(map_name)
+    key = (map_name, area_a, area_b, dist_type)
+    distance_obj = AREA_DISTANCE_CACHE.get(mesh, key)
+    if distance_obj is None:
+        distance_obj = _area_distance(map_name, area_a, area_b, dist_type)
+        AREA_DISTANCE_CACHE.put(mesh, key, distance_obj)
+    return distance_obj
+
+
+# Relative slack on landmark upper bounds, which sum distances in another order
+_LANDMARK_SLACK = 1e-9
+
+
+def _area_distance(
+    map_name: str, area_a: int, area_b: int, dist_type: AreaDistanceType
+) -> DistanceObject:
+    """area_distance without validation and caching"""
     distance_obj: DistanceObject = {
         "distanceType": dist_type,
         "distance": float("inf"),
         "areas": [],
     }
-    if dist_type == "graph":
-        try:
-            discovered_path = nx.shortest_path(G, area_a, area_b)
-            distance_obj["distance"] = len(discovered_path) - 1
-            distance_obj["areas"] = discovered_path
-        except nx.NetworkXNoPath:
-            distance_obj["distance"] = float("inf")
-            distance_obj["areas"] = []
+    if dist_type == "geodesic_approx":
+        distance_obj["distance"] = float(
+            _approximate_geodesic(map_name, np.array([[area_a, area_b]]))[0]
+        )
         return distance_obj
-    if dist_type == "geodesic":
-
-        def dist_heuristic(a, b):
-            return distance.euclidean(G.nodes()[a]["center"], G.nodes()[b]["center"])
-
-        try:
-            geodesic_path = nx.astar_path(
-                G, area_a, area_b, heuristic=dist_heuristic, weight="weight"
-            )
-            geodesic_cost = sum(
-                G[u][v]["weight"] for u, v in zip(geodesic_path[:-1], geodesic_path[1:])
+    if dist_type in ["graph", "geodesic"]:
+        from scipy.sparse.csgraph import dijkstra
+
+        mesh, graph = _get_csr_graph(map_name)
+        row_a, row_b = mesh.row(area_a), mesh.row(area_b)
+        limit = np.inf
+        landmarks = (
+            mesh.cached_landmarks()
+            if dist_type == "geodesic" and mesh is NAV[map_name]
+            else None
+        )
+        if landmarks is not None:
+            # Areas farther away than the detour over the best landmark cannot be
+            # on the shortest path, so the search does not need to expand them
+            upper_bound = landmarks.upper_bound(row_a, row_b)
+            limit = float(upper_bound) * (1 + _LANDMARK_SLACK) + _LANDMARK_SLACK
+        # Single source search from area_a. Graph distance ignores the weights (BFS)
+        dists, predecessors = dijkstra(
+            graph,
+            directed=True,
+            indices=row_a,
+            return_predecessors=True,
+            unweighted=dist_type == "graph",
+            limit=limit,
+        )
+        discovered_path = _path_from_predecessors(mesh, predecessors, row_a, row_b)
+        if discovered_path:
+            distance_obj["areas"] = discovered_path
+            distance_obj["distance"] = (
+                len(discovered_path) - 1
+                if dist_type == "graph"
+                else float(dists[row_b])
             )
-            distance_obj["distance"] = geodesic_cost
-            distance_obj["areas"] = geodesic_path
-        except nx.NetworkXNoPath:
-            distance_obj["distance"] = float("inf")
-            distance_obj["areas"] = []
         return distance_obj
     # redundant due to asserting that only ["graph", "geodesic", "euclidean"] are valid
     # and if checks that it is neither 'graph' nor 'geodesic'
     # if dist_type == "euclidean":
-    area_a_x = (
-        NAV[map_name][area_a]["southEastX"] + NAV[map_name][area_a]["northWestX"]
-    ) / 2
-    area_a_y = (
-        NAV[map_name][area_a]["southEastY"] + NAV[map_name][area_a]["northWestY"]
-    ) / 2
-    area_a_z = (
-        NAV[map_name][area_a]["southEastZ"] + NAV[map_name][area_a]["northWestZ"]
-    ) / 2
-    area_b_x = (
-        NAV[map_name][area_b]["southEastX"] + NAV[map_name][area_b]["northWestX"]
-    ) / 2
-    area_b_y = (
-        NAV[map_name][area_b]["southEastY"] + NAV[map_name][area_b]["northWestY"]
-    ) / 2
-    area_b_z = (
-        NAV[map_name][area_b]["southEastZ"] + NAV[map_name][area_b]["northWestZ"]
-    ) / 2
+    mesh = _get_nav_mesh(map_name)
+    center_a = mesh.centers[mesh.row(area_a)]
+    center_b = mesh.centers[mesh.row(area_b)]
     distance_obj["distance"] = math.sqrt(
-        (area_a_x - area_b_x) ** 2
-        + (area_a_y - area_b_y) ** 2
-        + (area_a_z - area_b_z) ** 2
+        (center_a[0] - center_b[0]) ** 2
+        + (center_a[1] - center_b[1]) ** 2
+        + (center_a[2] - center_b[2]) ** 2
     )
     return distance_obj
 
 
-PointDistanceType = Literal[DistanceType, "manhattan", "canberra", "cosine"]
+def _approximate_geodesic(map_name: str, pairs: np.ndarray) -> np.ndarray:
+    """Landmark lower bounds of the geodesic distances between pairs of area ids, see area_distance"""
+    area_matrix = _get_area_matrix(map_name)
+    if area_matrix is not None:
+        try:
+            matrix_rows = area_matrix.rows(pairs.ravel()).reshape(-1, 2)
+        except KeyError:
+            pass
+        else:
+            return np.asarray(
+                area_matrix.distances[
+                    matrix_rows[:, 0], matrix_rows[:, 1], DIST_TYPE_INDEX["geodesic"]
+                ],
+                dtype=np.float64,
+            )
+    mesh, _ = _get_csr_graph(map_name)
+    rows = mesh.rows(pairs.ravel()).reshape(-1, 2)
+    landmarks = mesh.landmarks()
+    distances = landmarks.lower_bound(rows[:, 0], rows[:, 1])
+    # Reachable as far as the landmarks know, but without a detour to bound it
+    unbounded = np.flatnonzero(
+        np.isfinite(distances)
+        & ~np.isfinite(landmarks.upper_bound(rows[:, 0], rows[:, 1]))
+    )
+    if len(unbounded) > 0:
+        distances[unbounded] = area_distances(map_name, pairs[unbounded], "geodesic")
+    return distances
+
+
+def reconstruct_path(
+    map_name: str,
+    area_a: int,
+    area_b: int,
+    dist_type: DistanceType = "graph",
+) -> list[int]:
+    """Returns the area ids of a shortest path between two areas.
+
+    Walks the predecessors of the precomputed area distance matrix of the map
+    (see compute_area_distance_matrix) and falls back to area_distance if the map
+    has no matrix with predecessors.
+
+    Args:
+        map_name (string): Map to search
+        area_a (int): Area id to start from
+        area_b (int): Area id to end in
+        dist_type (string, optional): Either graph or geodesic. Defaults to 'graph'
+
+    Returns:
+        List of area ids from area_a to area_b, empty if there is no path
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If either area_a or area_b is not in awpy.data.NAV[map_name]
+                    If the dist_type is not one of ["graph", "geodesic"]
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    if (area_a not in NAV[map_name].keys()) or (area_b not in NAV[map_name].keys()):
+        raise ValueError("Area ID not found.")
+    if dist_type not in PATH_DIST_TYPE_INDEX:
+        raise ValueError("dist_type can only be graph or geodesic")
+    area_matrix = _get_area_matrix(map_name)
+    if (
+        area_matrix is not None
+        and area_matrix.predecessors is not None
+        and area_a in area_matrix.index
+        and area_b in area_matrix.index
+    ):
+        return area_matrix.path(area_a, area_b, dist_type)
+    return area_distance(map_name, area_a, area_b, dist_type)["areas"]
+
+
+# Distance fields kept by distance_field, keyed by (map_name, source rows, dist_type)
+DISTANCE_FIELD_CACHE = LRUCache(maxsize=256)
+
+
+def _compute_distance_field(
+    mesh: NavMesh, map_name: str, rows: tuple[int, ...], dist_type: DistanceType
+) -> np.ndarray:
+    if dist_type == "euclidean":
+        from scipy.spatial.distance import cdist
+
+        field = cdist(mesh.centers[list(rows)], mesh.centers).min(axis=0)
+    else:
+        from scipy.sparse.csgraph import dijkstra
+
+        _, graph = _get_csr_graph(map_name)
+        # Graph distance ignores the weights (BFS)
+        field = dijkstra(
+            graph,
+            directed=True,
+            indices=list(rows),
+            unweighted=dist_type == "graph",
+            min_only=True,
+        )
+    field.setflags(write=False)
+    return field
+
+
+def distance_field(
+    map_name: str,
+    source_area: Union[int, Iterable[int]],
+    dist_type: DistanceType = "graph",
+) -> np.ndarray:
+    """Returns the distance from a source area to every area of a map.
+
+    All distances come from a single search over the nav graph and are the same as
+    area_distance(map_name, source_area, area, dist_type) for every area. With several
+    source areas every value is the distance from the closest source. Results are kept
+    in DISTANCE_FIELD_CACHE, an LRU cache keyed by map, sources and distance type.
+
+    Args:
+        map_name (string): Map to search
+        source_area (int or list): Area id or several area ids
+        dist_type (string, optional): String indicating the type of distance to use (graph,
+            geodesic or euclidean). Defaults to 'graph'
+
+    Returns:
+        Read-only numpy array with one distance per area in the order of NAV[map_name].area_ids
+        (use NAV[map_name].row(area_id) to index it). Unreachable areas are inf
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If no source area is given or a source area is not in awpy.data.NAV[map_name]
+                    If the dist_type is not one of ["graph", "geodesic", "euclidean"]
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    if dist_type not in get_args(DistanceType):
+        raise ValueError("dist_type can only be graph, geodesic or euclidean")
+    sources = (
+        [source_area] if isinstance(source_area, (int, np.integer)) else source_area
+    )
+    mesh = _get_nav_mesh(map_name)
+    try:
+        rows = tuple(sorted(set(mesh.rows(list(sources)).tolist())))
+    except KeyError as e:
+        raise ValueError("Area ID not found.") from e
+    if len(rows) == 0:
+        raise ValueError("At least one source area is needed.")
+    key = (map_name, rows, dist_type)
+    # The entry is only valid for the mesh it was computed on
+    cached = DISTANCE_FIELD_CACHE.get(key, valid=lambda value: value[0] is mesh)
+    if cached is not None:
+        return cached[1]
+    field = _compute_distance_field(mesh, map_name, rows, dist_type)
+    DISTANCE_FIELD_CACHE.put(key, (mesh, field))
+    return field
+
+
+# Sources per search of area_distances, bounds the (sources, n_areas) result arrays
+_SOURCE_CHUNK = 256
+
+
+def area_distances(
+    map_name: str,
+    pairs: np.ndarray,
+    dist_type: AreaDistanceType = "graph",
+    return_paths: bool = False,
+) -> Union[np.ndarray, tuple[np.ndarray, list[list[int]]]]:
+    """Returns the distances between many pairs of areas at once.
+
+    Pairs are grouped by their first area and every distinct source area is searched
+    once. If the map has a precomputed area distance matrix the distances (and, with
+    predecessors, the paths) are read from it instead.
+
+    Args:
+        map_name (string): Map to search
+        pairs (np.ndarray): Area ids with shape (m, 2). Distances are from the first to the second area
+        dist_type (string, optional): String indicating the type of distance to use (graph,
+            geodesic, euclidean or geodesic_approx). Defaults to 'graph'
+        return_paths (bool, optional): Whether to also return the path of every pair. Defaults to False
+
+    Returns:
+        Distances with shape (m,), the same as area_distance returns for every pair.
+        With return_paths a tuple of the distances and a list with the area ids of every
+        path (empty for euclidean and approximate distance and unreachable pairs)
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If any area is not in awpy.data.NAV[map_name]
+                    If the dist_type is not one of ["graph", "geodesic", "euclidean", "geodesic_approx"]
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    if dist_type not in get_args(AreaDistanceType):
+        raise ValueError(
+            "dist_type can only be graph, geodesic, euclidean or geodesic_approx"
+        )
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if dist_type == "geodesic_approx":
+        if not np.isin(pairs, _get_nav_mesh(map_name).area_ids).all():
+            raise ValueError("Area ID not found.")
+        distances = _approximate_geodesic(map_name, pairs)
+        return (distances, [[] for _ in pairs]) if return_paths else distances
+    if dist_type == "euclidean":
+        mesh = _get_nav_mesh(map_name)
+    else:
+        mesh, graph = _get_csr_graph(map_name)
+    try:
+        rows = mesh.rows(pairs.ravel()).reshape(-1, 2)
+    except KeyError as e:
+        raise ValueError("Area ID not found.") from e
+    paths: list[list[int]] = [[] for _ in range(len(pairs))]
+    if dist_type == "euclidean":
+        differences = mesh.centers[rows[:, 0]] - mesh.centers[rows[:, 1]]
+        distances = np.sqrt((differences**2).sum(axis=1))
+        return (distances, paths) if return_paths else distances
+    area_matrix = _get_area_matrix(map_name)
+    if area_matrix is not None and (
+        not return_paths or area_matrix.predecessors is not None
+    ):
+        try:
+            matrix_rows = area_matrix.rows(pairs.ravel()).reshape(-1, 2)
+        except KeyError:
+            area_matrix = None
+        else:
+            distances = np.asarray(
+                area_matrix.distances[
+                    matrix_rows[:, 0], matrix_rows[:, 1], DIST_TYPE_INDEX[dist_type]
+                ],
+                dtype=np.float64,
+            )
+            if return_paths:
+                paths = [
+                    area_matrix.path(area_a, area_b, dist_type)
+                    for area_a, area_b in pairs.tolist()
+                ]
+            return (distances, paths) if return_paths else distances
+    from scipy.sparse.csgraph import dijkstra
+
+    distances = np.empty(len(pairs))
+    sources, source_index = np.unique(rows[:, 0], return_inverse=True)
+    source_index = source_index.reshape(-1)
+    order = np.argsort(source_index, kind="stable")
+    bounds = np.searchsorted(source_index[order], np.arange(len(sources) + 1))
+    for start in range(0, len(sources), _SOURCE_CHUNK):
+        stop = min(start + _SOURCE_CHUNK, len(sources))
+        # Graph distance ignores the weights (BFS)
+        result = dijkstra(
+            graph,
+            directed=True,
+            indices=sources[start:stop],
+            unweighted=dist_type == "graph",
+            return_predecessors=return_paths,
+        )
+        dists, predecessors = result if return_paths else (result, None)
+        selected = order[bounds[start] : bounds[stop]]
+        distances[selected] = dists[source_index[selected] - start, rows[selected, 1]]
+        if predecessors is not None:
+            for i in selected.tolist():
+                paths[i] = _path_from_predecessors(
+                    mesh,
+                    predecessors[source_index[i] - start],
+                    rows[i, 0],
+                    rows[i, 1],
+                )
+    return (distances, paths) if return_paths else distances
+
+
+def symmetric_area_distances(
+    map_name: str,
+    area_ids_a: Union[np.ndarray, list[int]],
+    area_ids_b: Union[np.ndarray, list[int]],
+    dist_type: AreaDistanceType = "geodesic",
+) -> np.ndarray:
+    """Returns the shorter of both directions between every area of area_ids_a and every area of area_ids_b
+
+    The nav graph is directed (dropping down a ledge is shorter than climbing back up),
+    state distances take min(d(a, b), d(b, a)) to be commutative. Graph and geodesic
+    distances are looked up in awpy.data.SYMMETRIC_DIST_MATRIX or the area distance
+    matrix of the map. Without either, there is one search per distinct area of the
+    smaller side on the graph and one on the reversed graph.
+
+    Args:
+        map_name (string): Map to search
+        area_ids_a (np.ndarray): Area ids, shape (m,)
+        area_ids_b (np.ndarray): Area ids, shape (k,)
+        dist_type (string, optional): String indicating the type of distance to use (graph,
+            geodesic, euclidean or geodesic_approx). Defaults to 'geodesic'
+
+    Returns:
+        Distances with shape (m, k), inf for pairs that are unreachable in both directions
+
+    Raises:
+        ValueError: If map_name is not in awpy.data.NAV
+                    If any area is not in awpy.data.NAV[map_name]
+                    If the dist_type is not one of ["graph", "geodesic", "euclidean", "geodesic_approx"]
+    """
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    if dist_type not in get_args(AreaDistanceType):
+        raise ValueError(
+            "dist_type can only be graph, geodesic, euclidean or geodesic_approx"
+        )
+    area_ids_a = np.asarray(area_ids_a, dtype=np.int64).reshape(-1)
+    area_ids_b = np.asarray(area_ids_b, dtype=np.int64).reshape(-1)
+    if dist_type in PATH_DIST_TYPE_INDEX:
+        symmetric_matrix = _get_symmetric_matrix(map_name)
+        if symmetric_matrix is not None:
+            try:
+                return symmetric_matrix.pair_distances(
+                    area_ids_a[:, None], area_ids_b[None, :], dist_type
+                )
+            except KeyError:
+                pass
+    if dist_type not in PATH_DIST_TYPE_INDEX or _get_area_matrix(map_name) is not None:
+        pairs = np.stack(
+            np.broadcast_arrays(area_ids_a[:, None], area_ids_b[None, :]), axis=-1
+        ).reshape(-1, 2)
+        return np.minimum(
+            area_distances(map_name, pairs, dist_type),
+            area_distances(map_name, pairs[:, ::-1], dist_type),
+        ).reshape(len(area_ids_a), len(area_ids_b))
+    from scipy.sparse.csgraph import dijkstra
+
+    mesh, graph = _get_csr_graph(map_name)
+    try:
+        rows_a, rows_b = mesh.rows(area_ids_a), mesh.rows(area_ids_b)
+    except KeyError as e:
+        raise ValueError("Area ID not found.") from e
+    # The result is symmetric, so search from the side with fewer distinct areas
+    swap = len(np.unique(rows_b)) < len(np.unique(rows_a))
+    if swap:
+        rows_a, rows_b = rows_b, rows_a
+    sources, source_index = np.unique(rows_a, return_inverse=True)
+    distances = np.empty((len(sources), len(rows_b)))
+    reverse = graph.T.tocsr()
+    for start in range(0, len(sources), _SOURCE_CHUNK):
+        stop = min(start + _SOURCE_CHUNK, len(sources))
+        # d(a, b) on the graph and d(b, a) on the reversed graph
+        distances[start:stop] = np.minimum(
+            dijkstra(
+                graph,
+                directed=True,
+                indices=sources[start:stop],
+                unweighted=dist_type == "graph",
+            )[:, rows_b],
+            dijkstra(
+                reverse,
+                directed=True,
+                indices=sources[start:stop],
+                unweighted=dist_type == "graph",
+            )[:, rows_b],
+        )
+    distances = distances[source_index.reshape(-1)]
+    return distances.T if swap else distances
+
+
+PointDistanceType = Literal[AreaDistanceType, "manhattan", "canberra", "cosine"]
 
 
 def point_distance(
@@ -241,6 +1069,7 @@ def point_distance(
     point_a: list[float],
     point_b: list[float],
     dist_type: PointDistanceType = "graph",
+    use_raster: bool = False,
 ) -> DistanceObject:
     """Returns the distance between two points.
 
@@ -249,19 +1078,21 @@ def point_distance(
         point_a (list): Point as a list (x,y,z)
         point_b (list): Point as a list (x,y,z)
         dist_type (string, optional): String indicating the type of distance to use.
-            Can be graph, geodesic, euclidean, manhattan, canberra or cosine.
-            Defaults to 'graph'
+            Can be graph, geodesic, geodesic_approx (see area_distance), euclidean, manhattan,
+            canberra or cosine. Defaults to 'graph'
+        use_raster (bool, optional): For graph and geodesic distances, find the areas of the points
+            with the raster of the map (see area_raster). Defaults to False
 
     Returns:
         A dict containing info on the distance between two points.
 
     Raises:
-        ValueError: If map_name is not in awpy.data.NAV if dist_type is "graph" or "geodesic"
-                    If either point_a or point_b does not have a length of 3 (for "graph" or "geodesic" dist_type)
+        ValueError: If map_name is not in awpy.data.NAV if dist_type is "graph", "geodesic" or "geodesic_approx"
+                    If either point_a or point_b does not have a length of 3 (for "graph", "geodesic" or "geodesic_approx" dist_type)
     """
     if dist_type not in get_args(PointDistanceType):
         raise ValueError(
-            "dist_type can only be graph, geodesic, euclidean, manhattan, canberra or cosine"
+            "dist_type can only be graph, geodesic, geodesic_approx, euclidean, manhattan, canberra or cosine"
         )
     distance_obj: DistanceObject = {
         "distanceType": dist_type,
@@ -275,19 +1106,21 @@ def point_distance(
             raise ValueError(
                 "When using graph or geodesic distance, point must be X/Y/Z"
             )
-        area_a = find_closest_area(map_name, point_a)["areaId"]
-        area_b = find_closest_area(map_name, point_b)["areaId"]
+        area_a = find_closest_area(map_name, point_a, use_raster)["areaId"]
+        area_b = find_closest_area(map_name, point_b, use_raster)["areaId"]
         return area_distance(map_name, area_a, area_b, dist_type=dist_type)
-    if dist_type == "geodesic":
+    if dist_type in ["geodesic", "geodesic_approx"]:
         if map_name not in NAV:
             raise ValueError("Map not found.")
         if len(point_a) != 3 or len(point_b) != 3:
             raise ValueError(
                 "When using graph or geodesic distance, point must be X/Y/Z"
             )
-        area_a = find_closest_area(map_name, point_a)["areaId"]
-        area_b = find_closest_area(map_name, point_b)["areaId"]
+        area_a = find_closest_area(map_name, point_a, use_raster)["areaId"]
+        area_b = find_closest_area(map_name, point_b, use_raster)["areaId"]
         return area_distance(map_name, area_a, area_b, dist_type=dist_type)
+    from scipy.spatial import distance
+
     if dist_type == "euclidean":
         distance_obj["distance"] = distance.euclidean(point_a, point_b)
         return distance_obj
@@ -304,12 +1137,16 @@ def point_distance(
     return distance_obj
 
 
-def generate_position_token(map_name: str, frame: GameFrame) -> Token:
+def generate_position_token(
+    map_name: str, frame: GameFrame, use_raster: bool = False
+) -> Token:
     """Generates the position token for a game frame.
 
     Args:
         map_name (string): Map to search
         frame (dict): A game frame
+        use_raster (bool, optional): Assign players to areas with the raster of the map (see area_raster).
+            Defaults to False
 
     Returns:
         A dict containing the T token, CT token and combined token (T + CT concatenated)
@@ -325,33 +1162,24 @@ def generate_position_token(map_name: str, frame: GameFrame) -> Token:
     ):
         raise ValueError("CT or T players has length of 0")
     # Create map area list
-    map_area_names = []
-    for area_id in NAV[map_name]:
-        if NAV[map_name][area_id]["areaName"] not in map_area_names:
-            map_area_names.append(NAV[map_name][area_id]["areaName"])
-    map_area_names.sort()
-    # Create token
-    ct_token = np.zeros(len(map_area_names), dtype=np.int8)
-    # We know this is not None because otherwise we would have already
+    map_area_names = place_names(map_name)
+    # We know the players are not None because otherwise we would have already
     # thrown a ValueError
-    for player in frame["ct"]["players"]:  # type: ignore[union-attr]
-        if player["isAlive"]:
-            closest_area = find_closest_area(
-                map_name, [player["x"], player["y"], player["z"]]
-            )
-            ct_token[
-                map_area_names.index(NAV[map_name][closest_area["areaId"]]["areaName"])
-            ] += 1
-    t_token = np.zeros(len(map_area_names), dtype=np.int8)
-    # Same here
-    for player in frame["t"]["players"]:  # type: ignore[union-attr]
-        if player["isAlive"]:
-            closest_area = find_closest_area(
-                map_name, [player["x"], player["y"], player["z"]]
-            )
-            t_token[
-                map_area_names.index(NAV[map_name][closest_area["areaId"]]["areaName"])
-            ] += 1
+    tokens = {}
+    for side in ["ct", "t"]:
+        side = cast(Literal["ct", "t"], side)
+        alive = [
+            [player["x"], player["y"], player["z"]]
+            for player in frame[side]["players"]  # type: ignore[union-attr]
+            if player["isAlive"]
+        ]
+        places = place_indices(
+            map_name, np.array(alive).reshape(-1, 3), use_raster=use_raster
+        )
+        tokens[side] = np.bincount(places, minlength=len(map_area_names)).astype(
+            np.int8
+        )
+    ct_token, t_token = tokens["ct"], tokens["t"]
     # Create payload
     ttoken = (
         str(t_token).replace("'", "").replace("[", "").replace("]", "").replace(" ", "")
@@ -382,13 +1210,66 @@ def tree() -> dict:
     return the_tree()
 
 
+def compute_area_distance_matrix(
+    map_name: str, predecessors: bool = True
+) -> AreaDistanceMatrix:
+    """Computes the distances between all pairs of areas of a map.
+
+    Graph (unweighted) and geodesic distances come from one all-pairs run of
+    scipy.sparse.csgraph.shortest_path over the nav graph, euclidean distances from
+    one cdist over the area centers. The values are the same as area_distance returns
+    for every pair: unreachable pairs are inf.
+
+    Args:
+        map_name (string): Map to generate the matrix for
+        predecessors (bool, optional): Whether to keep the int32 shortest path
+            predecessors that reconstruct_path walks. Defaults to True
+
+    Returns:
+        AreaDistanceMatrix with a dense (n_areas, n_areas, 3) float64 array.
+        Use its to_dict or save_json method for the legacy nested dict layout
+
+    Raises:
+        ValueError: Raises a ValueError if map_name is not in awpy.data.NAV
+    """
+    from scipy.sparse.csgraph import shortest_path
+    from scipy.spatial.distance import cdist
+
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    mesh, graph = _get_csr_graph(map_name)
+    distances = np.empty((len(mesh), len(mesh), len(DIST_TYPE_INDEX)))
+    predecessor_array = (
+        np.empty((len(mesh), len(mesh), len(PATH_DIST_TYPE_INDEX)), dtype=np.int32)
+        if predecessors
+        else None
+    )
+    for dist_type, i in PATH_DIST_TYPE_INDEX.items():
+        result = shortest_path(
+            graph,
+            method="D",
+            directed=True,
+            unweighted=dist_type == "graph",
+            return_predecessors=predecessors,
+        )
+        if predecessor_array is None:
+            distances[..., DIST_TYPE_INDEX[dist_type]] = result
+        else:
+            distances[..., DIST_TYPE_INDEX[dist_type]] = result[0]
+            predecessor_array[..., i] = result[1]
+    distances[..., DIST_TYPE_INDEX["euclidean"]] = cdist(mesh.centers, mesh.centers)
+    return AreaDistanceMatrix(map_name, mesh.area_ids, distances, predecessor_array)
+
+
 def generate_area_distance_matrix(map_name: str, save: bool = False) -> AreaMatrix:
     """Generates or grabs a tree like nested dictionary containing distance matrices (as dicts) for each map for all area
     Structures is [map_name][area1id][area2id][dist_type(euclidean,graph,geodesic)]
 
-    Note that this can take 20min to 5h to run depending on the map and produces
-    an output file of 50-300mb. If you run this offline and want to store the result for
-    later reuse make sure to set 'save=True'!
+    The distances are computed with compute_area_distance_matrix, which takes seconds
+    to a minute depending on the map. With 'save=True' the matrix is written in the
+    binary format of awpy.data.matrix.AreaDistanceMatrix
+    (area_distance_matrix_<map_name>.npy, area_distance_ids_<map_name>.npy and
+    area_predecessors_<map_name>.npy) which awpy.data opens with np.memmap.
 
     Args:
         map_name (string): Map to generate the place matrix for
@@ -400,70 +1281,157 @@ def generate_area_distance_matrix(map_name: str, save: bool = False) -> AreaMatr
     Raises:
         ValueError: Raises a ValueError if map_name is not in awpy.data.NAV
     """
-    print(
-        """Note that this can take 20min to 5h to run depending on the map and produces an output file of 50-300mb.
-    If you run this offline and want to store the result for later reuse make sure to set 'save=True'!"""
-    )
-    # Initialize the dict structure
-    area_distance_matrix: AreaMatrix = tree()
+    area_distance_matrix = compute_area_distance_matrix(map_name)
+    if save:
+        area_distance_matrix.save(os.path.join(PATH, "nav"))
+    return area_distance_matrix.to_dict()
+
+
+def generate_symmetric_distance_matrix(
+    map_name: str, save: bool = False
+) -> SymmetricAreaDistanceMatrix:
+    """Generates the symmetric graph and geodesic distances between all pairs of areas
+
+    Every entry is min(d(a, b), d(b, a)), what position_state_distance needs per player
+    pair. The directed distances come from the area distance matrix of the map if
+    there is one, otherwise from the same all-pairs search as
+    compute_area_distance_matrix. With 'save=True' the matrix is written in the binary
+    format of awpy.data.matrix.SymmetricAreaDistanceMatrix
+    (area_symmetric_matrix_<map_name>.npy and area_symmetric_ids_<map_name>.npy).
+
+    Args:
+        map_name (string): Map to generate the matrix for
+        save (bool, optional): Whether to save the matrix to file Defaults to 'False'
+
+    Returns:
+        SymmetricAreaDistanceMatrix of the map
+
+    Raises:
+        ValueError: Raises a ValueError if map_name is not in awpy.data.NAV
+    """
+    from scipy.sparse.csgraph import shortest_path
+
     if map_name not in NAV:
         raise ValueError("Map not found.")
-    areas = NAV[map_name]
-    # And there over each area
-    for area1 in areas:
-        # Precompute the tile center
-        area1_x = (
-            NAV[map_name][area1]["southEastX"] + NAV[map_name][area1]["northWestX"]
-        ) / 2
-        area1_y = (
-            NAV[map_name][area1]["southEastY"] + NAV[map_name][area1]["northWestY"]
-        ) / 2
-        area1_z = (
-            NAV[map_name][area1]["southEastZ"] + NAV[map_name][area1]["northWestZ"]
-        ) / 2
-        # Loop over every pair of areas
-        for area2 in areas:
-            # # Compute center of second area
-            area2_x = (
-                NAV[map_name][area2]["southEastX"] + NAV[map_name][area2]["northWestX"]
-            ) / 2
-            area2_y = (
-                NAV[map_name][area2]["southEastY"] + NAV[map_name][area2]["northWestY"]
-            ) / 2
-            area2_z = (
-                NAV[map_name][area2]["southEastZ"] + NAV[map_name][area2]["northWestZ"]
-            ) / 2
-            # Calculate basic euclidean distance
-            area_distance_matrix[str(area1)][str(area2)]["euclidean"] = math.sqrt(
-                (area1_x - area2_x) ** 2
-                + (area1_y - area2_y) ** 2
-                + (area1_z - area2_z) ** 2
-            )
-            # Also get graph distance
-            graph = area_distance(map_name, area1, area2, dist_type="graph")
-            area_distance_matrix[str(area1)][str(area2)]["graph"] = graph["distance"]
-            # And geodesic like distance
-            geodesic = area_distance(map_name, area1, area2, dist_type="geodesic")
-            area_distance_matrix[str(area1)][str(area2)]["geodesic"] = geodesic[
-                "distance"
-            ]
+    area_matrix = _get_area_matrix(map_name)
+    if area_matrix is not None:
+        symmetric_matrix = SymmetricAreaDistanceMatrix.from_area_matrix(area_matrix)
+    else:
+        mesh, graph = _get_csr_graph(map_name)
+        symmetric_matrix = SymmetricAreaDistanceMatrix.from_directed(
+            map_name,
+            mesh.area_ids,
+            [
+                shortest_path(
+                    graph, method="D", directed=True, unweighted=dist_type == "graph"
+                )
+                for dist_type in PATH_DIST_TYPES
+            ],
+        )
     if save:
-        with open(
-            os.path.join(PATH, f"nav/area_distance_matrix_{map_name}.json"),
-            "w",
-            encoding="utf8",
-        ) as json_file:
-            json.dump(area_distance_matrix, json_file)
-    return area_distance_matrix
+        symmetric_matrix.save(os.path.join(PATH, "nav"))
+    return symmetric_matrix
+
+
+def compute_place_distance_matrix(
+    map_name: str, area_matrix: Optional[AreaDistanceMatrix] = None
+) -> PlaceDistanceMatrix:
+    """Computes the distances between all pairs of named places of a map.
+
+    The centroid and representative_point distances are the area distances between
+    the tiles generate_centroids picks for the places, median_dist is the median over
+    all pairs of areas of the two places. Centroids are computed once. For each place
+    the distances from its areas to every area form one dense block with the columns
+    grouped by place, and the medians are taken over its column slices.
 
+    Args:
+        map_name (string): Map to compute the place matrix for
+        area_matrix (AreaDistanceMatrix, optional): Area distances to derive the place distances from.
+            Defaults to the precomputed matrix of the map, if there is none the distances
+            from the areas of one place at a time are searched
+
+    Returns:
+        PlaceDistanceMatrix with a dense (n_places, n_places, 3, 3) float64 array.
+        Use its to_dict method for the legacy nested dict layout
 
-def generate_place_distance_matrix(map_name: str, save: bool = False) -> PlaceMatrix:
+    Raises:
+        ValueError: Raises a ValueError if map_name is not in awpy.data.NAV
+    """
+    from scipy.sparse.csgraph import dijkstra
+    from scipy.spatial.distance import cdist
+
+    if map_name not in NAV:
+        raise ValueError("Map not found.")
+    if area_matrix is None:
+        area_matrix = _get_area_matrix(map_name)
+    mesh = _get_nav_mesh(map_name)
+    matrix_rows = None
+    if area_matrix is not None:
+        try:
+            matrix_rows = area_matrix.rows(mesh.area_ids)
+        except KeyError:
+            pass
+    if matrix_rows is None:
+        mesh, graph = _get_csr_graph(map_name)
+
+    def distances_from(rows: np.ndarray) -> np.ndarray:
+        """Distances from the mesh rows to every area in mesh row order, shape (len(rows), n, 3)"""
+        if matrix_rows is not None:
+            # Keeps the dtype of the matrix, like its single lookups
+            return area_matrix.distances[matrix_rows[rows]][:, matrix_rows]
+        distances = np.empty((len(rows), len(mesh), len(DIST_TYPE_INDEX)))
+        for dist_type in PATH_DIST_TYPES:
+            # Graph distance ignores the weights (BFS)
+            distances[..., DIST_TYPE_INDEX[dist_type]] = dijkstra(
+                graph, directed=True, indices=rows, unweighted=dist_type == "graph"
+            )
+        distances[..., DIST_TYPE_INDEX["euclidean"]] = cdist(
+            mesh.centers[rows], mesh.centers
+        )
+        return distances
+
+    places, place_of_row = mesh.place_table()
+    n_places = len(places)
+    centroids, reps = generate_centroids(map_name)
+    place_distances = np.empty(
+        (n_places, n_places, len(DIST_TYPE_INDEX), len(REFERENCE_POINT_INDEX))
+    )
+    for reference_point, reference_areas in [
+        ("centroid", centroids),
+        ("representative_point", reps),
+    ]:
+        reference_rows = mesh.rows([reference_areas[place] for place in places])
+        place_distances[..., REFERENCE_POINT_INDEX[reference_point]] = distances_from(
+            reference_rows
+        )[:, reference_rows]
+    # The areas of place i are the rows order[bounds[i]:bounds[i + 1]]
+    order = np.argsort(place_of_row, kind="stable")
+    bounds = np.searchsorted(place_of_row[order], np.arange(n_places + 1))
+    median_index = REFERENCE_POINT_INDEX["median_dist"]
+    for i in range(n_places):
+        block = distances_from(order[bounds[i] : bounds[i + 1]])[:, order]
+        for j in range(n_places):
+            place_distances[i, j, :, median_index] = np.median(
+                block[:, bounds[j] : bounds[j + 1]], axis=(0, 1)
+            )
+    return PlaceDistanceMatrix(map_name, places.tolist(), place_distances)
+
+
+def generate_place_distance_matrix(
+    map_name: str,
+    save: bool = False,
+    area_matrix: Optional[AreaDistanceMatrix] = None,
+) -> PlaceMatrix:
     """Generates or grabs a tree like nested dictionary containing distance matrices (as dicts) for each map for all regions
     Structures is [map_name][placeid][place2id][dist_type(euclidean,graph,geodesic)][reference_point(centroid,representative_point,median_dist)]
 
+    The distances are computed with compute_place_distance_matrix.
+
     Args:
         map_name (string): Map to generate the place matrix for
         save (bool, optional): Whether to save the matrix to file. Defaults to 'False'
+        area_matrix (AreaDistanceMatrix, optional): Area distances to derive the place distances from.
+            Defaults to the precomputed matrix of the map, if there is none distances are searched
 
     Returns:
         Tree structure containing distances for all place pairs on all maps
@@ -471,80 +1439,9 @@ def generate_place_distance_matrix(map_name: str, save: bool = False) -> PlaceMa
     Raises:
         ValueError: Raises a ValueError if map_name is not in awpy.data.NAV
     """
-    if map_name not in NAV:
-        raise ValueError("Map not found.")
-    areas = NAV[map_name]
-    place_distance_matrix: PlaceMatrix = tree()
-    # Loop over all three considered distance types
-    for dist_type in ["geodesic", "graph", "euclidean"]:
-        dist_type = cast(DistanceType, dist_type)
-        # Get the mapping "areaName": [areas that have this area name]
-        area_mapping = defaultdict(list)
-        for area in areas:
-            area_mapping[areas[area]["areaName"]].append(area)
-        # Get the centroids and representative points for each named place on the map
-        centroids, reps = generate_centroids(map_name)
-        # Loop over all pairs of named places
-        for place1, centroid1 in centroids.items():
-            for place2, centroid2 in centroids.items():
-                # If precomputed values do not exist calculate them
-                if map_name not in AREA_DIST_MATRIX:
-                    # Distances between the centroids for each named place
-                    place_distance_matrix[place1][place2][dist_type][
-                        "centroid"
-                    ] = area_distance(
-                        map_name, centroid1, centroid2, dist_type=dist_type
-                    )[
-                        "distance"
-                    ]
-                    # Distances between the representative points for each named place
-                    place_distance_matrix[place1][place2][dist_type][
-                        "representative_point"
-                    ] = area_distance(
-                        map_name, reps[place1], reps[place2], dist_type=dist_type
-                    )[
-                        "distance"
-                    ]
-                    # Median of all the distance pairs for areaA in place1 to areaB in place2
-                    connections = []
-                    for sub_area1 in area_mapping[place1]:
-                        for sub_area2 in area_mapping[place2]:
-                            connections.append(
-                                area_distance(
-                                    map_name,
-                                    sub_area1,
-                                    sub_area2,
-                                    dist_type=dist_type,
-                                )["distance"]
-                            )
-                    place_distance_matrix[place1][place2][dist_type][
-                        "median_dist"
-                    ] = median(connections)
-                # If precomputed values exist just grab those
-                else:
-                    place_distance_matrix[place1][place2][dist_type][
-                        "centroid"
-                    ] = AREA_DIST_MATRIX[map_name][str(centroid1)][str(centroid2)][
-                        dist_type
-                    ]
-                    place_distance_matrix[place1][place2][dist_type][
-                        "representative_point"
-                    ] = AREA_DIST_MATRIX[map_name][str(reps[place1])][
-                        str(reps[place2])
-                    ][
-                        dist_type
-                    ]
-                    connections = []
-                    for sub_area1 in area_mapping[place1]:
-                        for sub_area2 in area_mapping[place2]:
-                            connections.append(
-                                AREA_DIST_MATRIX[map_name][str(sub_area1)][
-                                    str(sub_area2)
-                                ][dist_type]
-                            )
-                    place_distance_matrix[place1][place2][dist_type][
-                        "median_dist"
-                    ] = median(connections)
+    place_distance_matrix = compute_place_distance_matrix(
+        map_name, area_matrix
+    ).to_dict()
     if save:
         with open(
             os.path.join(PATH, f"nav/place_distance_matrix_{map_name}.json"),
@@ -555,11 +1452,65 @@ def generate_place_distance_matrix(map_name: str, save: bool = False) -> PlaceMa
     return place_distance_matrix
 
 
+# Centroid and representative tiles of the places of a map, keyed by map_name
+CENTROID_CACHE = LRUCache(maxsize=64)
+
+
+def _compute_centroids(
+    map_name: str, mesh: NavMesh
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """generate_centroids without caching
+
+    Returns:
+        Tuple of the place names in order of their first area, and the area ids of
+        the centroid and representative tile of every place"""
+    from shapely.geometry import Polygon
+
+    places, place_of_row = mesh.place_table()
+    # Every corner of every area, the same points stepped_hull gets per place
+    corners = np.stack(
+        [
+            np.stack([mesh.south_east[:, 0], mesh.south_east[:, 1]], axis=1),
+            np.stack([mesh.south_east[:, 0], mesh.north_west[:, 1]], axis=1),
+            np.stack([mesh.north_west[:, 0], mesh.south_east[:, 1]], axis=1),
+            np.stack([mesh.north_west[:, 0], mesh.north_west[:, 1]], axis=1),
+        ],
+        axis=1,
+    )
+    heights = np.stack([mesh.north_west[:, 2], mesh.south_east[:, 2]], axis=1)
+    # The areas of place i are the rows order[bounds[i]:bounds[i + 1]]
+    order = np.argsort(place_of_row, kind="stable")
+    bounds = np.searchsorted(place_of_row[order], np.arange(len(places) + 1))
+    # Places in order of their first area, like the previous dict based grouping
+    place_order = np.argsort(order[bounds[:-1]], kind="stable")
+    points = np.empty((2, len(places), 3))
+    for i, place in enumerate(place_order.tolist()):
+        rows = order[bounds[place] : bounds[place + 1]]
+        hull = _stepped_hull_array(corners[rows].reshape(-1, 2))
+        z = math.fsum(heights[rows].ravel().tolist()) / (2 * len(rows))
+        # Get the centroids and rep. point of the hull
+        try:
+            polygon = Polygon(hull)
+            points[0, i, :2] = np.array(polygon.centroid.coords)[0]
+            points[1, i, :2] = np.array(polygon.representative_point().coords)[0]
+        except ValueError:  # A LinearRing must have at least 3 coordinate tuples
+            points[0, i, :2] = hull.mean(axis=0)
+            points[1, i, :2] = points[0, i, :2]
+        points[:, i, 2] = z
+    # Find the closest tile for these points
+    area_ids, _ = find_closest_areas(map_name, points.reshape(-1, 3))
+    area_ids = area_ids.reshape(2, len(places))
+    return places[place_order].tolist(), area_ids[0], area_ids[1]
+
+
 def generate_centroids(
     map_name: str,
 ) -> tuple[dict[str, int], dict[str, int]]:
     """For each region in the given map calculates the centroid and a representative point and finds the closest tile for each
 
+    The tiles are computed once per nav mesh, kept in CENTROID_CACHE and stored in the
+    nav cache (<map_name>.centroids.npz), so later calls and processes skip the geometry.
+
     Args:
         map_name (string): Name of the map for which to calculate the centroids
 
@@ -569,51 +1520,69 @@ def generate_centroids(
     Raises:
         ValueError: If map_name is not in awpy.data.NAV
     """
+    from awpy.data.cache import centroids_checksum, load_centroids, save_centroids
+
     if map_name not in NAV:
         raise ValueError("Map not found.")
-    area_points: dict[str, list[tuple[float, float]]] = defaultdict(list)
-    z_s = defaultdict(list)
-    area_ids_cent: dict[str, int] = {}
-    area_ids_rep: dict[str, int] = {}
-    for a in NAV[map_name]:
-        area = NAV[map_name][a]
-        cur_x = []
-        cur_y = []
-        cur_x.append(area["southEastX"])
-        cur_x.append(area["northWestX"])
-        cur_y.append(area["southEastY"])
-        cur_y.append(area["northWestY"])
-        # Get the z coordinates for each tile of a named area
-        z_s[area["areaName"]].append(area["northWestZ"])
-        z_s[area["areaName"]].append(area["southEastZ"])
-        # Get all the (x,y) points that make up each tile of a named area
-        for x, y in itertools.product(cur_x, cur_y):
-            area_points[area["areaName"]].append((x, y))
-    # For each named area
-    for area_name in area_points:
-        # Get the (approximate) orthogonal convex hull
-        hull = np.array(stepped_hull(area_points[area_name]))
-        # Get the centroids and rep. point of the hull
-        try:
-            my_polygon = Polygon(hull)
-            my_centroid = list(np.array(my_polygon.centroid.coords)[0]) + [
-                mean(z_s[area_name])
-            ]
-            rep_point = list(np.array(my_polygon.representative_point().coords)[0]) + [
-                mean(z_s[area_name])
-            ]
-        except ValueError:  # A LinearRing must have at least 3 coordinate tuples
-            my_centroid = [
-                mean([x for (x, _) in hull]),
-                mean([y for (_, y) in hull]),
-                mean(z_s[area_name]),
-            ]
-            rep_point = my_centroid
+    mesh = _get_nav_mesh(map_name)
+    # The entry is only valid for the mesh it was computed on
+    cached = CENTROID_CACHE.get(map_name, valid=lambda value: value[0] is mesh)
+    if cached is None:
+        checksum = centroids_checksum(mesh)
+        tiles = load_centroids(map_name, checksum)
+        if tiles is None:
+            tiles = _compute_centroids(map_name, mesh)
+            save_centroids(map_name, *tiles, checksum)
+        cached = (mesh, tiles)
+        CENTROID_CACHE.put(map_name, cached)
+    places, centroid_ids, rep_ids = cached[1]
+    return (
+        dict(zip(places, centroid_ids.tolist())),
+        dict(zip(places, rep_ids.tolist())),
+    )
+
+
+def _stepped_hull_array(points: np.ndarray) -> np.ndarray:
+    """stepped_hull for an array of points with shape (n, 2)
+
+    Every section of the hull is the running maximum (or minimum) of y over the points
+    in one of four orders, up to the extreme point, so no Python loop over the points
+    is needed.
 
-        # Find the closest tile for these points
-        area_ids_cent[area_name] = find_closest_area(map_name, my_centroid)["areaId"]
-        area_ids_rep[area_name] = find_closest_area(map_name, rep_point)["areaId"]
-    return area_ids_cent, area_ids_rep
+    Returns:
+        Points of the hull with shape (m, 2), the same as stepped_hull returns"""
+    # Sorted by x and then y, like sorted(set(points))
+    points = np.unique(np.asarray(points, dtype=np.float64).reshape(-1, 2), axis=0)
+    if len(points) <= 1:
+        return points
+    x, y = points[:, 0], points[:, 1]
+    # argmin and argmax return the first of the sorted points, like min and max
+    min_y, max_y = int(np.argmin(y)), int(np.argmax(y))
+
+    def section(order: np.ndarray, stop: int, upper: bool) -> np.ndarray:
+        """Indices build_stepped_upper or build_stepped_lower picks from points[order]"""
+        ys = y[order]
+        extreme = np.maximum.accumulate(ys) if upper else np.minimum.accumulate(ys)
+        end = int(np.flatnonzero(order == stop)[0]) + 1
+        return order[:end][ys[:end] == extreme[:end]]
+
+    def lower_section(order: np.ndarray) -> np.ndarray:
+        # build_stepped_lower compares min_y with the second point
+        if order[1] == min_y:
+            return order[:1]
+        return section(order, min_y, upper=False)
+
+    lower_left = lower_section(np.lexsort((-y, x)))
+    lower_right = lower_section(np.lexsort((-y, -x)))
+    upper_right = section(np.lexsort((y, -x)), max_y, upper=True)
+    upper_left = section(np.lexsort((y, x)), max_y, upper=True)
+    hull = np.concatenate(
+        [lower_left, lower_right[::-1], upper_right, upper_left[::-1]]
+    )
+    # Remove duplicate points, keeping the first occurrence
+    _, first = np.unique(hull, return_index=True)
+    hull = hull[np.sort(first)]
+    return points[np.append(hull, hull[0])]
 
 
 def stepped_hull(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
@@ -715,7 +1684,7 @@ def position_state_distance(
     map_name: str,
     position_array_1: np.ndarray,
     position_array_2: np.ndarray,
-    distance_type: DistanceType = "geodesic",
+    distance_type: AreaDistanceType = "geodesic",
 ) -> float:
     """Calculates a distance between two game states based on player positions
 
@@ -723,25 +1692,27 @@ def position_state_distance(
         map_name (string): Map to search
         position_array_1 (numpy array): Numpy array with shape (2|1, 5, 3) with the first index indicating the team,
             the second the player and the third the coordinate. Alternatively the array can have shape (2|1, 5, 1)
-            where the last value gives the area_id. Used only with geodesic and graph distance
+            where the last value gives the area_id. Used only with geodesic, geodesic_approx and graph distance
         position_array_2 (numpy array): Numpy array with shape (2|1, 5, 3) with the first index indicating the team,
             the second the player and the third the coordinate. Alternatively the array can have shape (2|1, 5, 1)
-            where the last value gives the area_id. Used only with geodesic and graph distance
+            where the last value gives the area_id. Used only with geodesic, geodesic_approx and graph distance
         distance_type (string, optional): String indicating how the distance between two player positions should be calculated.
-            Options are "geodesic", "graph" and "euclidean". Defaults to 'geodesic'
+            Options are "geodesic", "graph", "euclidean" and "geodesic_approx" (see area_distance). Defaults to 'geodesic'
 
     Returns:
         A float representing the distance between these two game states
 
     Raises:
         ValueError: If map_name is not in awpy.data.NAV
-                    If distance_type is not one of ["graph", "geodesic", "euclidean"]
+                    If distance_type is not one of ["graph", "geodesic", "euclidean", "geodesic_approx"]
                     If the 0th(number of teams) and 2nd(number of features) dimensions of the inputs do not have the same size
     """
     if map_name not in NAV:
         raise ValueError("Map not found.")
-    if distance_type not in get_args(DistanceType):
-        raise ValueError("distance_type can only be graph, geodesic or euclidean")
+    if distance_type not in get_args(AreaDistanceType):
+        raise ValueError(
+            "distance_type can only be graph, geodesic, euclidean or geodesic_approx"
+        )
     pos_distance: float = 0
     if (
         position_array_1.shape[0] != position_array_2.shape[0]
@@ -750,30 +1721,39 @@ def position_state_distance(
         raise ValueError(
             "Game state shapes do not match! Both states have to have the same number of teams(1 or 2) and same number of coordinates."
         )
-    if distance_type not in ["geodesic", "graph"] and position_array_1.shape[2] != 3:
+    area_distance_types = ["geodesic", "graph", "geodesic_approx"]
+    if distance_type not in area_distance_types and position_array_1.shape[2] != 3:
         raise ValueError(
             "Game state shapes are incorrect! Both states have to have the same number of coordinates (3) when not using 'geodesic' or graph 'distance'."
         )
     # Make sure array1 is the one with more players alive
     if position_array_1.shape[1] < position_array_2.shape[1]:
         position_array_1, position_array_2 = position_array_2, position_array_1
-    # Pre compute the area names for each player's position
-    # If the x,y and z coordinate are given
-    if distance_type in ["geodesic", "graph"] and position_array_1.shape[-1] == 3:
-        areas: dict[int, defaultdict[int, dict]] = {
-            1: defaultdict(dict),
-            2: defaultdict(dict),
-        }
-        for team in range(position_array_1.shape[0]):
-            for player in range(position_array_1.shape[1]):
-                areas[1][team][player] = find_closest_area(
-                    map_name, position_array_1[team][player]
-                )["areaId"]
-        for team in range(position_array_2.shape[0]):
-            for player in range(position_array_2.shape[1]):
-                areas[2][team][player] = find_closest_area(
-                    map_name, position_array_2[team][player]
-                )["areaId"]
+    if distance_type in area_distance_types:
+        # Pre compute the area ids for each player's position
+        # If the x,y and z coordinate are given
+        if position_array_1.shape[-1] == 3:
+            area_ids_1 = find_closest_areas(map_name, position_array_1.reshape(-1, 3))[
+                0
+            ].reshape(position_array_1.shape[:2])
+            area_ids_2 = find_closest_areas(map_name, position_array_2.reshape(-1, 3))[
+                0
+            ].reshape(position_array_2.shape[:2])
+        # or if only one position value is given that should be the area id already
+        else:
+            area_ids_1 = position_array_1[..., 0].astype(np.int64)
+            area_ids_2 = position_array_2[..., 0].astype(np.int64)
+        # The underlying graph is directed (There is a short path to drop down a ledge but a long one is needed to get back up)
+        # So take the shorter direction of every player pair so that the distance between two states/trajectories is commutative
+        pair_distances = np.stack(
+            [
+                symmetric_area_distances(
+                    map_name, area_ids_1[team], area_ids_2[team], distance_type
+                )
+                for team in range(position_array_1.shape[0])
+            ]
+        )
+        pair_distances[np.isinf(pair_distances)] = sys.maxsize / 6
     # Get the minimum mapping distance for each side separately
     for team in range(position_array_1.shape[0]):
         side_distance = float("inf")
@@ -805,47 +1785,8 @@ def position_state_distance(
                         ** 2
                     )
                 # Use a more accurate graph based distance that takes into account the actual map
-                elif distance_type in ["geodesic", "graph"]:
-                    # The underlying graph is directed (There is a short path to drop down a ledge but a long one is needed to get back up)
-                    # So calculate both possible values and take the minimum one so that the distance between two states/trajectories is commutative
-                    area1 = (
-                        # either take values precomputed here
-                        areas[1][team][player1]
-                        if position_array_1.shape[-1] == 3
-                        # or if only one position value is given that should be the area id already
-                        else int(position_array_1[team][player1][0])
-                    )
-                    area2 = (
-                        areas[2][team][player2]
-                        if position_array_2.shape[-1] == 3
-                        else int(position_array_2[team][player2][0])
-                    )
-                    if map_name not in AREA_DIST_MATRIX:
-                        this_dist = min(
-                            area_distance(
-                                map_name,
-                                area1,
-                                area2,
-                                dist_type=distance_type,
-                            )["distance"],
-                            area_distance(
-                                map_name,
-                                area2,
-                                area1,
-                                dist_type=distance_type,
-                            )["distance"],
-                        )
-                    else:
-                        this_dist = min(
-                            AREA_DIST_MATRIX[map_name][str(area1)][str(area2)][
-                                distance_type
-                            ],
-                            AREA_DIST_MATRIX[map_name][str(area2)][str(area1)][
-                                distance_type
-                            ],
-                        )
-                    if this_dist == float("inf"):
-                        this_dist = sys.maxsize / 6
+                else:
+                    this_dist = float(pair_distances[team, player1, player2])
                 # Build up the overall distance for the current mapping of the current side
                 cur_dist += this_dist / len(mapping)
             # Only keep the smallest distance from all the mappings
@@ -896,11 +1837,7 @@ def token_state_distance(
     if len(token_array_1) != len(token_array_2):
         raise ValueError("Token arrays have to have the same length!")
     # Get the list of named areas. Needed to translate back from token position to area name
-    map_area_names = []
-    for area_id in NAV[map_name]:
-        if NAV[map_name][area_id]["areaName"] not in map_area_names:
-            map_area_names.append(NAV[map_name][area_id]["areaName"])
-    map_area_names.sort()
+    map_area_names = place_names(map_name)
 
     if (
         len(token_array_1) != len(map_area_names)
@@ -920,13 +1857,28 @@ def token_state_distance(
 
     # More complicated distances based on actual area locations
     elif distance_type in ["geodesic", "graph", "euclidean"]:
-        # If we do not have the precomputed matrix we need to first build the centroids to get them ourselves later
-        if map_name not in PLACE_DIST_MATRIX:
-            ref_points = {}
-            (
-                ref_points["centroid"],
-                ref_points["representative_point"],
-            ) = generate_centroids(map_name)
+        from sympy.utilities.iterables import multiset_permutations
+
+        # Symmetric distances between the named places, indexed like the token.
+        # The distance between two places is the minimum of both directions.
+        # Pairs that are not known yet are nan
+        place_dists = np.full((len(map_area_names), len(map_area_names)), np.nan)
+        place_matrix = _get_place_matrix(map_name)
+        if place_matrix is not None:
+            # The precomputed matrix can be older than the nav mesh and lack places
+            known = np.flatnonzero(
+                [place in place_matrix.index for place in map_area_names]
+            )
+            place_rows = place_matrix.rows([map_area_names[i] for i in known])
+            known_dists = place_matrix.distances[np.ix_(place_rows, place_rows)][
+                ...,
+                DIST_TYPE_INDEX[distance_type],
+                REFERENCE_POINT_INDEX[reference_point],
+            ]
+            place_dists[np.ix_(known, known)] = np.minimum(known_dists, known_dists.T)
+        # Places without precomputed distances are compared by the areas of their
+        # reference points, built only when such a pair is needed
+        ref_points: dict[str, dict[str, int]] = {}
         # Loop over each team
         for i in range(len(token_array_1) // len(map_area_names)):
             side_distance = float("inf")
@@ -950,49 +1902,43 @@ def token_state_distance(
             # Get the indices where array1 and array2 have larger values than the other.
             # Use each index as often as it if larger
             diff_array = np.subtract(array1, array2)
-            pos_indices = []
-            neg_indices = []
-            for i, difference in enumerate(diff_array):
-                if difference > 0:
-                    pos_indices.extend([i] * int(difference))
-                elif difference < 0:
-                    neg_indices.extend([i] * int((abs(difference))))
-            # Get all possible mappings between the differences
-            # Eg: diff array is [1,1,-1,-1] then pos_indices is [0,1] and neg_indices is [2,3]
-            # The possible mappings are then [(0,2),(1,3)] and [(0,3),(1,2)]
-            for mapping in (
-                list(zip(x, neg_indices))
-                for x in multiset_permutations(pos_indices, len(neg_indices))
-            ):
-                this_dist: float = 0
-                # Iterate of the mapping. Eg: [(0,2),(1,3)] and get their total distance
-                # For the example this would be dist(0,2)+dist(1,3)
-                for area1, area2 in mapping:
-                    if map_name not in PLACE_DIST_MATRIX:
-                        this_dist += min(
+            place_indices = np.arange(len(diff_array))
+            pos_indices = np.repeat(
+                place_indices, np.clip(diff_array, 0, None).astype(int)
+            )
+            neg_indices = np.repeat(
+                place_indices, np.clip(-diff_array, 0, None).astype(int)
+            )
+            for area1 in set(pos_indices.tolist()):
+                for area2 in set(neg_indices.tolist()):
+                    if np.isnan(place_dists[area1, area2]):
+                        if not ref_points:
+                            (
+                                ref_points["centroid"],
+                                ref_points["representative_point"],
+                            ) = generate_centroids(map_name)
+                        ref_1 = ref_points[reference_point][map_area_names[area1]]
+                        ref_2 = ref_points[reference_point][map_area_names[area2]]
+                        place_dists[area1, area2] = min(
                             area_distance(
-                                map_name,
-                                ref_points[reference_point][map_area_names[area1]],
-                                ref_points[reference_point][map_area_names[area2]],
-                                dist_type=distance_type,
+                                map_name, ref_1, ref_2, dist_type=distance_type
                             )["distance"],
                             area_distance(
-                                map_name,
-                                ref_points[reference_point][map_area_names[area2]],
-                                ref_points[reference_point][map_area_names[area1]],
-                                dist_type=distance_type,
+                                map_name, ref_2, ref_1, dist_type=distance_type
                             )["distance"],
                         )
-                    else:
-                        this_dist += min(
-                            PLACE_DIST_MATRIX[map_name][map_area_names[area1]][
-                                map_area_names[area2]
-                            ][distance_type][reference_point],
-                            PLACE_DIST_MATRIX[map_name][map_area_names[area2]][
-                                map_area_names[area1]
-                            ][distance_type][reference_point],
-                        )
-                this_dist /= size
+            # Get all possible mappings between the differences
+            # Eg: diff array is [1,1,-1,-1] then pos_indices is [0,1] and neg_indices is [2,3]
+            # The possible mappings are then [(0,2),(1,3)] and [(0,3),(1,2)]
+            mappings = list(
+                multiset_permutations(pos_indices.tolist(), len(neg_indices))
+            )
+            mappings_array = np.array(mappings, dtype=np.int64).reshape(
+                len(mappings), len(neg_indices)
+            )
+            # Total distance of every mapping. Eg: for [(0,2),(1,3)] this is dist(0,2)+dist(1,3)
+            mapping_dists = place_dists[mappings_array, neg_indices].sum(axis=1) / size
+            for this_dist in mapping_dists:
                 side_distance = min(side_distance, this_dist)
             token_dist += side_distance / (len(token_array_1) // len(map_area_names))
     return token_dist
@@ -1105,3 +2051,64 @@ def token_distance(
         distance_type,
         reference_point,
     )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command line interface, see ``python -m awpy.analytics.nav --help``
+
+    Args:
+        argv (list, optional): Arguments to parse. Defaults to sys.argv
+    """
+    import argparse
+    import logging
+
+    from awpy.analytics.matrix_builder import DEFAULT_BLOCK_SIZE, build_matrices
+
+    parser = argparse.ArgumentParser(prog="python -m awpy.analytics.nav")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser(
+        "build-matrices",
+        help="(Re)build the area, symmetric and place distance matrices of maps",
+    )
+    build.add_argument(
+        "maps", nargs="*", help="Maps to build. Defaults to every map with edges"
+    )
+    build.add_argument(
+        "--output",
+        default=None,
+        help="Directory to write the matrices to. Defaults to the nav directory of awpy.data",
+    )
+    build.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to the number of CPUs",
+    )
+    build.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help=f"Source areas per task. Defaults to {DEFAULT_BLOCK_SIZE}",
+    )
+    build.add_argument(
+        "--no-places", action="store_true", help="Do not build place distance matrices"
+    )
+    build.add_argument(
+        "--no-symmetric",
+        action="store_true",
+        help="Do not build symmetric area distance matrices",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    build_matrices(
+        args.maps or None,
+        args.output,
+        args.processes,
+        args.block_size,
+        not args.no_places,
+        not args.no_symmetric,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,108 +1,439 @@
 import json
 import os
+import re
+import threading
 from pathlib import Path
-import pandas as pd
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+    cast,
+)
 import numpy as np
-from scipy.spatial import distance
-import networkx as nx
 
-from awpy.utils import transform_csv_to_json
-from awpy.types import AreaMatrix, PlaceMatrix, Area
+from awpy.types import Area
+from awpy.data.navmesh import NavMesh
+from awpy.data.matrix import (
+    AreaDistanceMatrix,
+    PlaceDistanceMatrix,
+    SymmetricAreaDistanceMatrix,
+)
+from awpy.data.cache import (
+    edge_weights,
+    load_cache_index,
+    load_nav_cache,
+    nav_cache_checksum,
+    read_edge_list,
+    save_cache_index,
+    save_nav_cache,
+    sources_checksum,
+)
+
+
+if TYPE_CHECKING:
+    # pandas and networkx are only imported when the CSV or a graph is needed
+    import pandas as pd
+    import networkx as nx
 
 
 PATH = os.path.join(os.path.dirname(__file__), "")
 
-# Create nav tile info
-# nav_dfs: list[pd.DataFrame] = []
-# for file in os.listdir(PATH + "nav/"):
-#     if file.endswith(".csv"):
-#         df = pd.read_csv(PATH + "nav/" + file)
-#         nav_dfs.append(df)
 
-# NAV_CSV = pd.concat(nav_dfs, ignore_index=True)
-NAV_CSV = pd.read_csv(PATH + "nav/nav_info.csv")
-NAV_CSV.areaName = NAV_CSV.areaName.fillna("")
+class LazyMapDict(dict):
+    """Dictionary keyed by map name whose values are only built when a map is first accessed.
+
+    Membership tests and iteration over the keys only need the list of available maps,
+    so checks like ``map_name in NAV`` stay cheap. Iterating over the values or items
+    materializes every map.
+
+    Args:
+        map_names (Callable): Returns the names of all maps that can be loaded
+        load_map (Callable): Builds the value for a single map name
+    """
+
+    def __init__(
+        self,
+        map_names: Callable[[], Iterable[str]],
+        load_map: Callable[[str], Any],
+    ) -> None:
+        super().__init__()
+        self._map_names_loader = map_names
+        self._map_names: Optional[list[str]] = None
+        self._load_map = load_map
+        self._lock = threading.RLock()
+
+    def _available(self) -> list[str]:
+        if self._map_names is None:
+            with self._lock:
+                if self._map_names is None:
+                    self._map_names = list(dict.fromkeys(self._map_names_loader()))
+        return self._map_names
+
+    def __missing__(self, key: str) -> Any:
+        if key not in self._available():
+            raise KeyError(key)
+        with self._lock:
+            if not dict.__contains__(self, key):
+                dict.__setitem__(self, key, self._load_map(key))
+            return dict.__getitem__(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._available()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        loaded = [k for k in self.keys() if dict.__contains__(self, k)]
+        return f"{type(self).__name__}(maps={self.keys()}, loaded={loaded})"
+
+    def keys(self) -> list[str]:  # type: ignore[override]
+        names = self._available()
+        return names + [k for k in dict.keys(self) if k not in names]
+
+    def values(self) -> list[Any]:  # type: ignore[override]
+        return [self[k] for k in self.keys()]
+
+    def items(self) -> list[tuple[str, Any]]:  # type: ignore[override]
+        return [(k, self[k]) for k in self.keys()]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        return default
+
+    def register(self, key: str) -> None:
+        """Makes an additional map available. A value that was already built for it is dropped"""
+        with self._lock:
+            names = self._available()
+            if key not in names:
+                names.append(key)
+            dict.pop(self, key, None)
+
+    def loaded(self) -> list[str]:
+        """Returns the names of the maps that have already been materialized"""
+        return list(dict.keys(self))
+
+
+_NAV_CSV: Optional["pd.DataFrame"] = None
+
+
+def load_nav_csv() -> "pd.DataFrame":
+    """Reads nav/nav_info.csv once and caches the resulting DataFrame
+
+    Returns:
+        pd.DataFrame containing information about the areas of every map"""
+    global _NAV_CSV
+    if _NAV_CSV is None:
+        import pandas as pd
+
+        # Create nav tile info
+        # nav_dfs: list[pd.DataFrame] = []
+        # for file in os.listdir(PATH + "nav/"):
+        #     if file.endswith(".csv"):
+        #         df = pd.read_csv(PATH + "nav/" + file)
+        #         nav_dfs.append(df)
+
+        # NAV_CSV = pd.concat(nav_dfs, ignore_index=True)
+        nav_csv = pd.read_csv(PATH + "nav/nav_info.csv")
+        nav_csv.areaName = nav_csv.areaName.fillna("")
+        _NAV_CSV = nav_csv
+    return _NAV_CSV
+
+
+# Source files of maps added with register_nav: [areas_csv, edges_txt]
+_CUSTOM_NAV: dict[str, list[str]] = {}
+
+NAV_COLUMNS = [
+    "areaId",
+    "northWestX",
+    "northWestY",
+    "northWestZ",
+    "southEastX",
+    "southEastY",
+    "southEastZ",
+]
+
+
+def _nav_sources(map_name: str) -> list[str]:
+    if map_name in _CUSTOM_NAV:
+        return _CUSTOM_NAV[map_name]
+    sources = [PATH + "nav/nav_info.csv"]
+    if os.path.exists(PATH + "nav/" + map_name + ".txt"):
+        sources.append(PATH + "nav/" + map_name + ".txt")
+    return sources
+
+
+def _nav_map_names() -> list[str]:
+    checksum = sources_checksum([PATH + "nav/nav_info.csv"])
+    map_names = load_cache_index("maps", checksum)
+    if map_names is None:
+        map_names = list(load_nav_csv()["mapName"].unique())
+        save_cache_index("maps", checksum, map_names)
+    return cast(list[str], map_names)
+
+
+def compile_nav(map_name: str) -> NavMesh:
+    """Builds the nav mesh of a map from nav_info.csv and its edge list and stores it in the cache
+
+    Args:
+        map_name (string): Map to compile
+
+    Returns:
+        NavMesh of the map including its edges and edge weights"""
+    sources = _nav_sources(map_name)
+    if map_name in _CUSTOM_NAV:
+        mesh = _read_custom_areas(map_name, sources[0])
+    else:
+        nav_csv = load_nav_csv()
+        mesh = NavMesh.from_dataframe(map_name, nav_csv[nav_csv["mapName"] == map_name])
+    if len(sources) > 1:
+        edges = read_edge_list(sources[1])
+        try:
+            weights = edge_weights(mesh, edges)
+        except KeyError as e:
+            raise ValueError(f"Edge list of {map_name} contains unknown areas.") from e
+        mesh.set_edges(edges, weights)
+    save_nav_cache(mesh, sources_checksum(sources))
+    return mesh
+
+
+def _load_nav(map_name: str) -> NavMesh:
+    mesh = load_nav_cache(map_name, sources_checksum(_nav_sources(map_name)))
+    if mesh is None:
+        mesh = compile_nav(map_name)
+    return mesh
+
+
+NAV: dict[str, NavMesh] = LazyMapDict(_nav_map_names, _load_nav)
+
+
+def _read_custom_areas(map_name: str, areas_csv: str) -> NavMesh:
+    """Reads and validates the areas of a custom map"""
+    import pandas as pd
+
+    df = pd.read_csv(areas_csv)
+    missing = [column for column in NAV_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"{areas_csv} is missing the columns {missing}.")
+    if "mapName" in df.columns:
+        df = df[df["mapName"] == map_name]
+    if len(df) == 0:
+        raise ValueError(f"{areas_csv} contains no areas for {map_name}.")
+    if "areaName" not in df.columns:
+        df = df.assign(areaName="")
+    if df[NAV_COLUMNS].isna().any(axis=None):
+        raise ValueError(f"{areas_csv} contains missing values.")
+    try:
+        df = df.astype({column: float for column in NAV_COLUMNS[1:]})
+        if not (df["areaId"] == df["areaId"].astype("int64")).all():
+            raise ValueError
+        df = df.astype({"areaId": "int64"})
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"{areas_csv} contains non numeric values.") from e
+    if df["areaId"].duplicated().any():
+        raise ValueError(f"{areas_csv} contains duplicate area ids.")
+    return NavMesh.from_dataframe(map_name, df)
+
 
+def register_nav(
+    map_name: str,
+    areas_csv: Union[str, Path],
+    edges_txt: Optional[Union[str, Path]] = None,
+) -> None:
+    """Adds the nav mesh of a custom map to NAV and NAV_GRAPHS
 
-NAV: dict[str, dict[int, Area]] = transform_csv_to_json(NAV_CSV)
+    The inputs are validated and compiled into the nav cache once. Later calls
+    with unchanged files only compare checksums, and the map itself is loaded
+    from the cache the first time NAV or NAV_GRAPHS is accessed.
+
+    Args:
+        map_name (string): Name of the map
+        areas_csv (str): CSV file with the columns of nav_info.csv. A mapName column is optional,
+            if present only the rows of map_name are used
+        edges_txt (str, optional): Edge list with one "area_a,area_b" pair per line. Defaults to None (no edges)
+
+    Raises:
+        ValueError: If map_name has characters other than letters, digits, _ and -, is a bundled map or the files are not valid
+        FileNotFoundError: If one of the files does not exist
+    """
+    # Cache files append dotted suffixes to the name, so it cannot contain dots
+    if not re.fullmatch(r"[\w-]+", map_name):
+        raise ValueError(f"{map_name!r} is not a valid map name.")
+    if map_name not in _CUSTOM_NAV and map_name in NAV:
+        raise ValueError(f"{map_name} is a bundled map.")
+    sources = [os.fspath(areas_csv)]
+    if edges_txt is not None:
+        sources.append(os.fspath(edges_txt))
+    checksum = sources_checksum(sources)
+    previous = _CUSTOM_NAV.get(map_name)
+    _CUSTOM_NAV[map_name] = sources
+    if nav_cache_checksum(map_name) != checksum:
+        try:
+            compile_nav(map_name)
+        except BaseException:
+            if previous is None:
+                del _CUSTOM_NAV[map_name]
+            else:
+                _CUSTOM_NAV[map_name] = previous
+            raise
+    NAV.register(map_name)  # type: ignore[attr-defined]
+    NAV_GRAPHS.register(map_name)  # type: ignore[attr-defined]
+
+
+def build_nav_graph(
+    mesh: NavMesh,
+    edges: Optional[np.ndarray] = None,
+    weights: Optional[np.ndarray] = None,
+) -> "nx.DiGraph":
+    """Creates the DiGraph of a map from a nav mesh
+
+    Args:
+        mesh (NavMesh): Nav mesh of the map
+        edges (np.ndarray, optional): Edges as pairs of area ids. Defaults to the edges of the mesh
+        weights (np.ndarray, optional): Weight of every edge. Defaults to the edge weights of the mesh
+
+    Returns:
+        nx.DiGraph of the traversible areas of the map"""
+    import networkx as nx
+
+    G = nx.DiGraph()
+    north_west = mesh.north_west.tolist()
+    south_east = mesh.south_east.tolist()
+    centers = mesh.centers.tolist()
+    G.add_nodes_from(
+        (
+            area_id,
+            {
+                "mapName": mesh.map_name,
+                "areaID": area_id,
+                "areaName": area_name,
+                "northWestX": nw[0],
+                "northWestY": nw[1],
+                "northWestZ": nw[2],
+                "southEastX": se[0],
+                "southEastY": se[1],
+                "southEastZ": se[2],
+                "center": center,
+                "size": size,
+            },
+        )
+        for area_id, area_name, nw, se, center, size in zip(
+            mesh.area_ids.tolist(),
+            mesh.area_names.tolist(),
+            north_west,
+            south_east,
+            centers,
+            mesh.sizes,
+        )
+    )
+    if edges is None:
+        edges, weights = mesh.edges, mesh.edge_weights
+    if edges is not None and weights is not None:
+        G.add_weighted_edges_from(
+            zip(edges[:, 0].tolist(), edges[:, 1].tolist(), weights.tolist())
+        )
+    return G
 
 
 def create_nav_graphs(
-    nav: dict[str, dict[int, Area]], data_path: str
-) -> dict[str, nx.DiGraph]:
+    nav: Mapping[str, Mapping[int, Area]], data_path: str
+) -> dict[str, "nx.DiGraph"]:
     """Function to create a dict of DiGraphs from dict of areas and edge_list file
 
     Args:
-        nav (dict): Dictionary containing information about each area of each map
+        nav (dict): Dictionary containing information about each area of each map.
+            Values can be NavMesh objects or plain dictionaries of areas
         data_path (str): Path to the awpy.data folder containing navigation and map data
 
     Returns:
         A dictionary mapping each map (str) to an nx.DiGraph of its traversible areas"""
-    nav_graphs: dict[str, nx.DiGraph] = {}
+    nav_graphs: dict[str, "nx.DiGraph"] = {}
     for m in nav:
-        G = nx.DiGraph()
-        for a in nav[m].keys():
-            r = nav[m][a]
-            G.add_nodes_from(
-                [
-                    (
-                        a,
-                        {
-                            "mapName": m,
-                            "areaID": a,
-                            "areaName": r["areaName"],
-                            "northWestX": r["northWestX"],
-                            "northWestY": r["northWestY"],
-                            "northWestZ": r["northWestZ"],
-                            "southEastX": r["southEastX"],
-                            "southEastY": r["southEastY"],
-                            "southEastZ": r["southEastZ"],
-                            "center": [
-                                (r["northWestX"] + r["southEastX"]) / 2,
-                                (r["northWestY"] + r["southEastY"]) / 2,
-                                (r["northWestZ"] + r["southEastZ"]) / 2,
-                            ],
-                            "size": np.sqrt(
-                                (r["northWestX"] - r["southEastX"]) ** 2
-                                + (r["northWestY"] - r["southEastY"]) ** 2
-                                + (r["northWestZ"] - r["southEastZ"]) ** 2
-                            ),
-                        },
-                    ),
-                ]
-            )
-        edge_list = open(data_path + "nav/" + m + ".txt", "r", encoding="utf8")
-        edge_list_lines = edge_list.readlines()
-        for line in edge_list_lines:
-            areas = line.strip().split(",")
-            G.add_edge(
-                int(areas[0]),
-                int(areas[1]),
-                weight=distance.euclidean(
-                    G.nodes()[int(areas[0])]["center"],
-                    G.nodes()[int(areas[1])]["center"],
-                ),
-            )
-        nav_graphs[m] = G
+        mesh = NavMesh.from_dict(m, nav[m])
+        edges = read_edge_list(data_path + "nav/" + m + ".txt")
+        nav_graphs[m] = build_nav_graph(mesh, edges, edge_weights(mesh, edges))
     return nav_graphs
 
 
-NAV_GRAPHS = create_nav_graphs(NAV, PATH)
-
-# Open map data
-with open(Path(PATH + "map/map_data.json"), encoding="utf8") as f:
-    MAP_DATA: dict = json.load(f)
-
-PLACE_DIST_MATRIX: dict[str, PlaceMatrix]
-AREA_DIST_MATRIX: dict[str, AreaMatrix]
-PLACE_DIST_MATRIX = {}
-AREA_DIST_MATRIX = {}
-for file in os.listdir(PATH + "nav/"):
-    if file.startswith("place_distance_matrix"):
-        this_map_name = "_".join(file.split(".")[0].split("_")[-2:])
-        with open(Path(PATH + "nav/" + file), encoding="utf8") as f:
-            PLACE_DIST_MATRIX[this_map_name] = json.load(f)
-    elif file.startswith("area_distance_matrix"):
-        this_map_name = "_".join(file.split(".")[0].split("_")[-2:])
-        with open(Path(PATH + "nav/" + file), encoding="utf8") as f:
-            AREA_DIST_MATRIX[this_map_name] = json.load(f)
+NAV_GRAPHS: dict[str, "nx.DiGraph"] = LazyMapDict(
+    lambda: NAV.keys(), lambda map_name: build_nav_graph(NAV[map_name])
+)
+
+_MAP_DATA: Optional[dict] = None
+
+
+def _load_map_data() -> dict:
+    global _MAP_DATA
+    if _MAP_DATA is None:
+        # Open map data
+        with open(Path(PATH + "map/map_data.json"), encoding="utf8") as f:
+            _MAP_DATA = json.load(f)
+    return _MAP_DATA
+
+
+MAP_DATA: dict = LazyMapDict(
+    lambda: _load_map_data().keys(), lambda map_name: _load_map_data()[map_name]
+)
+
+
+def _matrix_files(prefix: str) -> dict[str, str]:
+    """Maps each map name to the precomputed matrix file starting with prefix.
+    Binary .npy files take precedence over legacy .json files"""
+    files: dict[str, str] = {}
+    for file in sorted(os.listdir(PATH + "nav/")):
+        if file.startswith(prefix):
+            this_map_name = "_".join(file.split(".")[0].split("_")[-2:])
+            if this_map_name not in files or file.endswith(".npy"):
+                files[this_map_name] = file
+    return files
+
+
+def _load_matrix(prefix: str, map_name: str) -> Any:
+    with open(
+        Path(PATH + "nav/" + _matrix_files(prefix)[map_name]), encoding="utf8"
+    ) as f:
+        return json.load(f)
+
+
+def _load_area_matrix(map_name: str) -> AreaDistanceMatrix:
+    if _matrix_files("area_distance_matrix")[map_name].endswith(".npy"):
+        return AreaDistanceMatrix.load(PATH + "nav/", map_name)
+    return AreaDistanceMatrix.from_dict(
+        map_name, _load_matrix("area_distance_matrix", map_name)
+    )
+
+
+def _load_place_matrix(map_name: str) -> PlaceDistanceMatrix:
+    if _matrix_files("place_distance_matrix")[map_name].endswith(".npy"):
+        return PlaceDistanceMatrix.load(PATH + "nav/", map_name)
+    return PlaceDistanceMatrix.from_dict(
+        map_name, _load_matrix("place_distance_matrix", map_name)
+    )
+
+
+PLACE_DIST_MATRIX: dict[str, PlaceDistanceMatrix] = LazyMapDict(
+    lambda: _matrix_files("place_distance_matrix").keys(), _load_place_matrix
+)
+AREA_DIST_MATRIX: dict[str, AreaDistanceMatrix] = LazyMapDict(
+    lambda: _matrix_files("area_distance_matrix").keys(), _load_area_matrix
+)
+SYMMETRIC_DIST_MATRIX: dict[str, SymmetricAreaDistanceMatrix] = LazyMapDict(
+    lambda: _matrix_files("area_symmetric_matrix").keys(),
+    lambda map_name: SymmetricAreaDistanceMatrix.load(PATH + "nav/", map_name),
+)
+
+
+def __getattr__(name: str) -> Any:
+    # NAV_CSV is only read from disk the first time it is requested
+    if name == "NAV_CSV":
+        return load_nav_csv()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,557 @@
+"""Compiled binary cache of the navigation data.
+
+Parsing nav_info.csv and the edge lists is slow, so every map is compiled once
+into an uncompressed ``.npz`` file holding the area arrays, the edge list and
+the edge weights. Each file stores a checksum of the source files it was built
+from and is ignored (and rebuilt) as soon as one of them changes.
+
+The cache lives in ``$AWPY_CACHE_DIR`` if set, otherwise in ``~/.cache/awpy``.
+
+    Typical usage example:
+
+    from awpy.data.cache import clear_nav_cache, nav_cache_dir
+
+    print(nav_cache_dir())
+    clear_nav_cache("de_dust2")
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from awpy.data.landmarks import SELECTION_VERSION, Landmarks
+from awpy.data.navmesh import NavMesh
+from awpy.data.spatial import AreaRaster
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached files changes
+CACHE_VERSION = 1
+
+_checksums: dict[tuple[str, int, int], str] = {}
+
+
+def nav_cache_dir() -> Path:
+    """Returns the directory holding the compiled nav files
+
+    Returns:
+        Path of the cache directory. It is not created by this function"""
+    root = os.environ.get("AWPY_CACHE_DIR")
+    if root is None:
+        root = os.path.join(
+            os.environ.get("XDG_CACHE_HOME", os.path.join(Path.home(), ".cache")),
+            "awpy",
+        )
+    return Path(root) / "nav"
+
+
+def file_checksum(path: Union[str, Path]) -> str:
+    """Returns the sha256 of a file. Results are memoized on path, size and mtime
+
+    Args:
+        path (str): Path of the file
+
+    Returns:
+        Hex digest of the file contents"""
+    stat = os.stat(path)
+    key = (os.fspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _checksums:
+        with open(path, "rb") as f:
+            _checksums[key] = hashlib.sha256(f.read()).hexdigest()
+    return _checksums[key]
+
+
+def sources_checksum(sources: list[Union[str, Path]]) -> str:
+    """Combines the checksums of several source files and the cache version
+
+    Args:
+        sources (list): Paths of the files the cached data is built from
+
+    Returns:
+        Hex digest identifying this exact set of sources"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for source in sources:
+        digest.update(file_checksum(source).encode())
+    return digest.hexdigest()
+
+
+def read_edge_list(path: Union[str, Path]) -> np.ndarray:
+    """Reads an edge list file with one "area_a,area_b" pair per line
+
+    Args:
+        path (str): Path of the edge list
+
+    Returns:
+        numpy array of area ids with shape (n_edges, 2)"""
+    with open(path, "r", encoding="utf8") as f:
+        pairs = [line.strip().split(",") for line in f if line.strip()]
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def edge_weights(mesh: NavMesh, edges: np.ndarray) -> np.ndarray:
+    """Euclidean distance between the centers of the two areas of every edge
+
+    Args:
+        mesh (NavMesh): Nav mesh containing the areas
+        edges (np.ndarray): Area ids with shape (n_edges, 2)
+
+    Returns:
+        numpy array of edge weights with shape (n_edges,)"""
+    centers_a = mesh.centers[mesh.rows(edges[:, 0])]
+    centers_b = mesh.centers[mesh.rows(edges[:, 1])]
+    return np.sqrt(((centers_a - centers_b) ** 2).sum(axis=1))
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Writes through a temporary file so concurrent readers never see partial files"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def save_nav_cache(mesh: NavMesh, checksum: str) -> Optional[Path]:
+    """Writes a compiled nav mesh (areas, edges and edge weights) to the cache
+
+    Args:
+        mesh (NavMesh): Nav mesh to store. Edges are stored if the mesh has them
+        checksum (str): Checksum of the sources the mesh was built from
+
+    Returns:
+        Path of the written file or None if the cache directory is not writable"""
+    path = nav_cache_dir() / f"{mesh.map_name}.npz"
+    arrays = {
+        "checksum": np.array(checksum),
+        "area_ids": mesh.area_ids,
+        "area_names": mesh.area_names,
+        "north_west": mesh.north_west,
+        "south_east": mesh.south_east,
+    }
+    if mesh.edges is not None:
+        arrays["edges"] = mesh.edges
+        arrays["edge_weights"] = mesh.edge_weights
+    try:
+        _atomic_write(path, lambda f: np.savez(f, **arrays))
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+        return None
+    return path
+
+
+def load_nav_cache(map_name: str, checksum: str) -> Optional[NavMesh]:
+    """Loads a compiled nav mesh if it exists and matches the checksum
+
+    Args:
+        map_name (string): Map to load
+        checksum (str): Expected checksum of the sources
+
+    Returns:
+        NavMesh with edges and edge weights, or None if the cache is missing or stale"""
+    path = nav_cache_dir() / f"{map_name}.npz"
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if str(data["checksum"]) != checksum:
+                return None
+            mesh = NavMesh(
+                map_name,
+                data["area_ids"],
+                data["area_names"],
+                data["north_west"],
+                data["south_east"],
+            )
+            if "edges" in data:
+                mesh.set_edges(data["edges"], data["edge_weights"])
+    except (OSError, KeyError, ValueError):
+        return None
+    return mesh
+
+
+def nav_cache_checksum(map_name: str) -> Optional[str]:
+    """Returns the checksum stored in the compiled file of a map without loading its arrays
+
+    Args:
+        map_name (string): Map to look up
+
+    Returns:
+        The stored checksum or None if the map has not been compiled"""
+    path = nav_cache_dir() / f"{map_name}.npz"
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return str(data["checksum"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _raster_path(map_name: str, cell_size: float) -> Path:
+    return nav_cache_dir() / f"{map_name}.raster_{cell_size:g}.npz"
+
+
+def raster_checksum(
+    mesh: NavMesh, cell_size: float, z_cutoff: Optional[float] = None
+) -> str:
+    """Checksum of everything an area raster is derived from
+
+    Args:
+        mesh (NavMesh): Nav mesh that is rasterized
+        cell_size (float): Edge length of a cell
+        z_cutoff (float, optional): Height separating the layers. Defaults to None
+
+    Returns:
+        Hex digest of the mesh arrays and the raster parameters"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}|{cell_size!r}|{z_cutoff!r}".encode())
+    for array in (mesh.area_ids, mesh.north_west, mesh.south_east):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def save_area_raster(
+    map_name: str, raster: AreaRaster, checksum: str
+) -> Optional[Path]:
+    """Writes an area raster to the cache
+
+    Args:
+        map_name (string): Name of the map
+        raster (AreaRaster): Raster to store
+        checksum (str): Checksum from raster_checksum
+
+    Returns:
+        Path of the written file or None if the cache directory is not writable"""
+    path = _raster_path(map_name, raster.cell_size)
+    arrays = {
+        "checksum": np.array(checksum),
+        "grid": raster.grid,
+        "origin": raster.origin,
+        "cell_size": np.array(raster.cell_size),
+        "z_cutoff": np.array(np.nan if raster.z_cutoff is None else raster.z_cutoff),
+    }
+    try:
+        _atomic_write(path, lambda f: np.savez(f, **arrays))
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+        return None
+    return path
+
+
+def load_area_raster(
+    map_name: str, cell_size: float, checksum: str
+) -> Optional[AreaRaster]:
+    """Loads an area raster if it exists and matches the checksum
+
+    Args:
+        map_name (string): Name of the map
+        cell_size (float): Edge length of a cell
+        checksum (str): Expected checksum from raster_checksum
+
+    Returns:
+        AreaRaster or None if the cache is missing or stale"""
+    try:
+        with np.load(_raster_path(map_name, cell_size), allow_pickle=False) as data:
+            if str(data["checksum"]) != checksum:
+                return None
+            z_cutoff = float(data["z_cutoff"])
+            return AreaRaster(
+                data["grid"],
+                data["origin"],
+                float(data["cell_size"]),
+                None if np.isnan(z_cutoff) else z_cutoff,
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _landmarks_path(map_name: str, k: int) -> Path:
+    return nav_cache_dir() / f"{map_name}.landmarks_{k}.npz"
+
+
+def graph_checksum(mesh: NavMesh) -> str:
+    """Checksum of the areas and edges of a mesh, everything its distances are derived from
+
+    Args:
+        mesh (NavMesh): Nav mesh, usually with edges
+
+    Returns:
+        Hex digest of the mesh arrays and the edges"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for array in (mesh.area_ids, mesh.north_west, mesh.south_east):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    if mesh.edges is not None and mesh.edge_weights is not None:
+        digest.update(np.ascontiguousarray(mesh.edges).tobytes())
+        digest.update(np.ascontiguousarray(mesh.edge_weights).tobytes())
+    return digest.hexdigest()
+
+
+def landmarks_checksum(mesh: NavMesh, k: int) -> str:
+    """Checksum of everything the landmarks of a mesh are derived from
+
+    Args:
+        mesh (NavMesh): Nav mesh with edges
+        k (int): Number of landmarks
+
+    Returns:
+        Hex digest of the mesh arrays, the edges and the number of landmarks"""
+    return hashlib.sha256(
+        f"{graph_checksum(mesh)}|{k}|{SELECTION_VERSION}".encode()
+    ).hexdigest()
+
+
+def save_landmarks(
+    map_name: str, k: int, landmarks: Landmarks, checksum: str
+) -> Optional[Path]:
+    """Writes the landmarks of a map to the cache
+
+    Args:
+        map_name (string): Name of the map
+        k (int): Number of landmarks that were requested
+        landmarks (Landmarks): Landmarks to store
+        checksum (str): Checksum from landmarks_checksum
+
+    Returns:
+        Path of the written file or None if the cache directory is not writable"""
+    path = _landmarks_path(map_name, k)
+    arrays = {
+        "checksum": np.array(checksum),
+        "rows": landmarks.rows,
+        "from_landmark": landmarks.from_landmark,
+        "to_landmark": landmarks.to_landmark,
+    }
+    try:
+        _atomic_write(path, lambda f: np.savez(f, **arrays))
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+        return None
+    return path
+
+
+def load_landmarks(map_name: str, k: int, checksum: str) -> Optional[Landmarks]:
+    """Loads the landmarks of a map if they exist and match the checksum
+
+    Args:
+        map_name (string): Name of the map
+        k (int): Number of landmarks
+        checksum (str): Expected checksum from landmarks_checksum
+
+    Returns:
+        Landmarks or None if the cache is missing or stale"""
+    try:
+        with np.load(_landmarks_path(map_name, k), allow_pickle=False) as data:
+            if str(data["checksum"]) != checksum:
+                return None
+            return Landmarks(data["rows"], data["from_landmark"], data["to_landmark"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _centroids_path(map_name: str) -> Path:
+    return nav_cache_dir() / f"{map_name}.centroids.npz"
+
+
+def centroids_checksum(mesh: NavMesh) -> str:
+    """Checksum of everything the place centroids of a mesh are derived from
+
+    Args:
+        mesh (NavMesh): Nav mesh
+
+    Returns:
+        Hex digest of the mesh arrays including the place names"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for array in (mesh.area_ids, mesh.north_west, mesh.south_east):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update("\0".join(mesh.area_names.tolist()).encode())
+    return digest.hexdigest()
+
+
+def save_centroids(
+    map_name: str,
+    places: list[str],
+    centroid_ids: np.ndarray,
+    rep_ids: np.ndarray,
+    checksum: str,
+) -> Optional[Path]:
+    """Writes the centroid and representative tiles of the places of a map to the cache
+
+    Args:
+        map_name (string): Name of the map
+        places (list): Place names
+        centroid_ids (np.ndarray): Area id of the centroid tile of every place
+        rep_ids (np.ndarray): Area id of the representative tile of every place
+        checksum (str): Checksum from centroids_checksum
+
+    Returns:
+        Path of the written file or None if the cache directory is not writable"""
+    path = _centroids_path(map_name)
+    arrays = {
+        "checksum": np.array(checksum),
+        "places": np.array(places, dtype=str),
+        "centroid_ids": np.asarray(centroid_ids, dtype=np.int64),
+        "rep_ids": np.asarray(rep_ids, dtype=np.int64),
+    }
+    try:
+        _atomic_write(path, lambda f: np.savez(f, **arrays))
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+        return None
+    return path
+
+
+def load_centroids(
+    map_name: str, checksum: str
+) -> Optional[tuple[list[str], np.ndarray, np.ndarray]]:
+    """Loads the centroid and representative tiles of a map if they match the checksum
+
+    Args:
+        map_name (string): Name of the map
+        checksum (str): Expected checksum from centroids_checksum
+
+    Returns:
+        Tuple of the place names, centroid and representative area ids or None if
+        the cache is missing or stale"""
+    try:
+        with np.load(_centroids_path(map_name), allow_pickle=False) as data:
+            if str(data["checksum"]) != checksum:
+                return None
+            return data["places"].tolist(), data["centroid_ids"], data["rep_ids"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _matrix_block_path(map_name: str, start: int, stop: int) -> Path:
+    return nav_cache_dir() / f"{map_name}.matrix_block_{start}_{stop}.npz"
+
+
+def save_matrix_block(
+    map_name: str,
+    start: int,
+    stop: int,
+    arrays: dict[str, np.ndarray],
+    checksum: str,
+) -> Optional[Path]:
+    """Checkpoints the distance matrix rows start to stop of a map in the cache
+
+    Args:
+        map_name (string): Name of the map
+        start (int): First row of the block
+        stop (int): Row after the last row of the block
+        arrays (dict): Arrays of the block
+        checksum (str): Checksum from graph_checksum
+
+    Returns:
+        Path of the written file or None if the cache directory is not writable"""
+    path = _matrix_block_path(map_name, start, stop)
+    try:
+        _atomic_write(
+            path, lambda f: np.savez(f, checksum=np.array(checksum), **arrays)
+        )
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+        return None
+    return path
+
+
+def matrix_block_done(map_name: str, start: int, stop: int, checksum: str) -> bool:
+    """Returns whether a block was checkpointed for the current nav mesh of a map
+
+    Args:
+        map_name (string): Name of the map
+        start (int): First row of the block
+        stop (int): Row after the last row of the block
+        checksum (str): Expected checksum from graph_checksum"""
+    try:
+        with np.load(
+            _matrix_block_path(map_name, start, stop), allow_pickle=False
+        ) as data:
+            return str(data["checksum"]) == checksum
+    except (OSError, KeyError, ValueError):
+        return False
+
+
+def load_matrix_block(
+    map_name: str, start: int, stop: int, checksum: str
+) -> Optional[dict[str, np.ndarray]]:
+    """Loads a checkpointed block if it exists and matches the checksum
+
+    Args:
+        map_name (string): Name of the map
+        start (int): First row of the block
+        stop (int): Row after the last row of the block
+        checksum (str): Expected checksum from graph_checksum
+
+    Returns:
+        Arrays of the block or None if the checkpoint is missing or stale"""
+    try:
+        with np.load(
+            _matrix_block_path(map_name, start, stop), allow_pickle=False
+        ) as data:
+            if str(data["checksum"]) != checksum:
+                return None
+            return {key: data[key] for key in data.files if key != "checksum"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def clear_matrix_blocks(map_name: str) -> None:
+    """Removes all checkpointed matrix blocks of a map
+
+    Args:
+        map_name (string): Name of the map"""
+    for path in nav_cache_dir().glob(f"{map_name}.matrix_block_*.npz"):
+        path.unlink()
+
+
+def save_cache_index(name: str, checksum: str, content: object) -> None:
+    """Stores a small JSON document (like the list of maps in a file) in the cache
+
+    Args:
+        name (str): Name of the index
+        checksum (str): Checksum of the sources the content was derived from
+        content (object): JSON serializable content"""
+    path = nav_cache_dir() / f"{name}.json"
+    payload = json.dumps({"checksum": checksum, "content": content}).encode()
+    try:
+        _atomic_write(path, lambda f: f.write(payload))
+    except OSError as e:
+        logger.warning("Could not write nav cache %s: %s", path, e)
+
+
+def load_cache_index(name: str, checksum: str) -> Optional[object]:
+    """Loads a JSON document written by save_cache_index if the checksum matches
+
+    Args:
+        name (str): Name of the index
+        checksum (str): Expected checksum of the sources
+
+    Returns:
+        The stored content or None"""
+    path = nav_cache_dir() / f"{name}.json"
+    try:
+        with open(path, encoding="utf8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if payload.get("checksum") != checksum:
+        return None
+    return payload.get("content")
+
+
+def clear_nav_cache(map_name: Optional[str] = None) -> None:
+    """Removes compiled files from the cache
+
+    Args:
+        map_name (string, optional): Only remove the files of this map. Defaults to all maps"""
+    directory = nav_cache_dir()
+    if not directory.exists():
+        return
+    for file in directory.iterdir():
+        if map_name is None or file.name.startswith(f"{map_name}."):
+            file.unlink()
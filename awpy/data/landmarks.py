@@ -0,0 +1,160 @@
+"""Landmark distance bounds (ALT) for the directed nav graph of a map.
+
+A few landmark areas are chosen far apart from each other and the distances from
+every area to each landmark and back are stored. By the triangle inequality they
+bound the geodesic distance between any two areas from below and above without a
+graph search.
+
+    Typical usage example:
+
+    from awpy.data import NAV
+
+    mesh = NAV["de_nuke"]
+    landmarks = mesh.landmarks()
+    landmarks.lower_bound(rows_a, rows_b) <= true_distance <= landmarks.upper_bound(rows_a, rows_b)
+"""
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+# Bump when the selection of landmarks changes, so cached landmarks are rebuilt
+SELECTION_VERSION = 2
+
+
+class Landmarks:
+    """Distances between every area and a set of landmark areas.
+
+    Attributes:
+        rows (np.ndarray): Mesh row of every landmark, shape (k,)
+        from_landmark (np.ndarray): Distance from each landmark to each area, shape (k, n)
+        to_landmark (np.ndarray): Distance from each area to each landmark, shape (k, n)
+    """
+
+    def __init__(
+        self, rows: np.ndarray, from_landmark: np.ndarray, to_landmark: np.ndarray
+    ) -> None:
+        if from_landmark.shape != to_landmark.shape or from_landmark.shape[0] != len(
+            rows
+        ):
+            raise ValueError(
+                f"Landmark distances have shapes {from_landmark.shape} and {to_landmark.shape}, expected ({len(rows)}, n)"
+            )
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.from_landmark = from_landmark
+        self.to_landmark = to_landmark
+
+    @classmethod
+    def build(cls, graph: "csr_matrix", k: int) -> "Landmarks":
+        """Picks k landmarks by farthest point selection and computes their distances
+
+        Every (weakly) connected component with at least n_areas / k areas first gets
+        a landmark at its area farthest from an arbitrary one. Every further landmark
+        is the area with the largest round trip distance to its closest landmark.
+        Areas that no landmark is connected to do not attract landmarks.
+
+        Args:
+            graph (csr_matrix): Weighted, directed adjacency matrix with shape (n, n)
+            k (int): Number of landmarks. Capped at the number of areas
+
+        Returns:
+            Landmarks of the graph
+
+        Raises:
+            ValueError: If k is not positive or the graph is empty
+        """
+        from scipy.sparse.csgraph import connected_components, dijkstra
+
+        if k < 1:
+            raise ValueError(f"'k' has to be positive not {k}")
+        n_areas = graph.shape[0]
+        if n_areas == 0:
+            raise ValueError("Cannot pick landmarks in an empty graph.")
+        reverse = graph.T.tocsr()
+
+        def round_trip(row: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            from_row = dijkstra(graph, directed=True, indices=row)
+            to_row = dijkstra(reverse, directed=True, indices=row)
+            # inf for areas that are not connected to row in either direction
+            total = np.where(np.isfinite(from_row), from_row, 0) + np.where(
+                np.isfinite(to_row), to_row, 0
+            )
+            total[~np.isfinite(from_row) & ~np.isfinite(to_row)] = np.inf
+            return from_row, to_row, total
+
+        _, labels = connected_components(graph, directed=True, connection="weak")
+        sizes = np.bincount(labels)
+        large = [
+            component
+            for component in np.argsort(-sizes, kind="stable").tolist()
+            if sizes[component] >= max(2, n_areas / k)
+        ]
+        rows: list[int] = []
+        from_landmark, to_landmark = [], []
+        closest = np.full(n_areas, np.inf)
+        for i in range(min(k, n_areas)):
+            if i < len(large):
+                members = labels == large[i]
+                total = round_trip(int(np.argmax(members)))[2]
+                row = int(np.argmax(np.where(members & np.isfinite(total), total, -1)))
+            else:
+                # Landmarks have a distance of 0 to themselves
+                row = int(np.argmax(np.where(np.isfinite(closest), closest, 0)))
+            from_row, to_row, total = round_trip(row)
+            rows.append(row)
+            from_landmark.append(from_row)
+            to_landmark.append(to_row)
+            closest = np.minimum(closest, total)
+        return cls(np.array(rows), np.array(from_landmark), np.array(to_landmark))
+
+    def lower_bound(
+        self, rows_a: Union[int, np.ndarray], rows_b: Union[int, np.ndarray]
+    ) -> np.ndarray:
+        """Returns lower bounds of the distance from rows_a to rows_b
+
+        inf means that rows_b cannot be reached from rows_a.
+
+        Args:
+            rows_a (np.ndarray): Mesh rows to start from, shape (m,)
+            rows_b (np.ndarray): Mesh rows to end in, shape (m,)
+
+        Returns:
+            Lower bounds with shape (m,)"""
+        rows_a, rows_b = np.asarray(rows_a), np.asarray(rows_b)
+        with np.errstate(invalid="ignore"):
+            # d(a, b) >= d(L, b) - d(L, a) if L reaches a
+            forward = self.from_landmark[:, rows_b] - self.from_landmark[:, rows_a]
+            forward[~np.isfinite(self.from_landmark[:, rows_a])] = -np.inf
+            # d(a, b) >= d(a, L) - d(b, L) if b reaches L
+            backward = self.to_landmark[:, rows_a] - self.to_landmark[:, rows_b]
+            backward[~np.isfinite(self.to_landmark[:, rows_b])] = -np.inf
+        bound = np.maximum(forward, backward).max(axis=0, initial=0.0)
+        return np.where(rows_a == rows_b, 0.0, bound)
+
+    def upper_bound(
+        self, rows_a: Union[int, np.ndarray], rows_b: Union[int, np.ndarray]
+    ) -> np.ndarray:
+        """Returns upper bounds of the distance from rows_a to rows_b
+
+        The bound is the length of the shortest detour over a landmark, inf if no
+        landmark lies on a route between the areas.
+
+        Args:
+            rows_a (np.ndarray): Mesh rows to start from, shape (m,)
+            rows_b (np.ndarray): Mesh rows to end in, shape (m,)
+
+        Returns:
+            Upper bounds with shape (m,)"""
+        rows_a, rows_b = np.asarray(rows_a), np.asarray(rows_b)
+        bound = (self.to_landmark[:, rows_a] + self.from_landmark[:, rows_b]).min(
+            axis=0
+        )
+        return np.where(rows_a == rows_b, 0.0, bound)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __repr__(self) -> str:
+        return f"Landmarks(k={len(self)}, areas={self.from_landmark.shape[1]})"
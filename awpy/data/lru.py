@@ -0,0 +1,110 @@
+"""A small thread-safe LRU cache with hit and miss statistics.
+
+    Typical usage example:
+
+    from awpy.data.lru import LRUCache
+
+    cache = LRUCache(maxsize=1024)
+    value = cache.get_or_compute(("de_dust2", 152), lambda: expensive(152))
+    cache.stats()  # {'hits': 0, 'misses': 1, 'size': 1, 'maxsize': 1024}
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Maps keys to values and evicts the least recently used entry once full.
+
+    All methods can be called from several threads.
+
+    Args:
+        maxsize (int): Maximum number of entries. 0 disables the cache
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError(f"'maxsize' has to be at least 0 not {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        key: Hashable,
+        default: Optional[Any] = None,
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Returns the value of key and marks it as recently used, or default
+
+        Values for which valid returns False are treated (and counted) as missing."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING or (valid is not None and not valid(value)):
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entries if the cache is full"""
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the cached value of key or computes and stores it
+
+        compute runs outside of the lock, so two threads may compute the same key at once."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """Changes the maximum number of entries, evicting entries if needed"""
+        if maxsize < 0:
+            raise ValueError(f"'maxsize' has to be at least 0 not {maxsize}")
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Returns the number of hits, misses, entries and the maximum number of entries"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"LRUCache({self.stats()})"
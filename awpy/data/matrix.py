@@ -0,0 +1,600 @@
+"""Dense, array backed distance matrices for areas and places.
+
+Area distance matrices are stored as two ``.npy`` files in the nav directory:
+``area_distance_matrix_<map>.npy`` holds a float32 array of shape
+(n_areas, n_areas, 3) and ``area_distance_ids_<map>.npy`` the area id of every row.
+An optional third file, ``area_predecessors_<map>.npy``, holds int32 shortest path
+predecessors of shape (n_areas, n_areas, 2) for graph and geodesic distance. All of
+them are opened with ``np.memmap``, so any number of processes share one copy in the
+OS page cache.
+
+    Typical usage example:
+
+    from awpy.data import AREA_DIST_MATRIX
+
+    matrix = AREA_DIST_MATRIX["de_dust2"]
+    matrix.distance(152, 8970, "geodesic")
+    matrix.path(152, 8970, "geodesic")  # [152, ..., 8970] if predecessors were saved
+
+Symmetric area distance matrices hold ``min(d(a, b), d(b, a))`` for graph and
+geodesic distance, the distance that state distances use on the directed nav graph.
+Only the upper triangle is stored (``area_symmetric_matrix_<map>.npy``, float32 of
+shape (n_areas * (n_areas - 1) / 2, 2), next to ``area_symmetric_ids_<map>.npy``),
+half the size of a full matrix with the same memory mapping.
+
+Place distance matrices are small and kept in memory as a
+(n_places, n_places, 3, 3) array indexed by the sorted place names. Their binary
+files are ``place_distance_matrix_<map>.npy`` (float32) and
+``place_distance_names_<map>.npy``.
+"""
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Optional, Union, get_args
+
+import numpy as np
+
+from awpy.data.navmesh import _IdIndex
+from awpy.types import AreaMatrix, DistanceType, PlaceMatrix, ReferencePoint
+
+
+DIST_TYPES: tuple[DistanceType, ...] = get_args(DistanceType)
+DIST_TYPE_INDEX: dict[str, int] = {
+    dist_type: i for i, dist_type in enumerate(DIST_TYPES)
+}
+# Distance types with a shortest path, the last axis of predecessor arrays
+PATH_DIST_TYPES: tuple[DistanceType, ...] = ("graph", "geodesic")
+PATH_DIST_TYPE_INDEX: dict[str, int] = {
+    dist_type: i for i, dist_type in enumerate(PATH_DIST_TYPES)
+}
+REFERENCE_POINTS: tuple[ReferencePoint, ...] = get_args(ReferencePoint)
+REFERENCE_POINT_INDEX: dict[str, int] = {
+    reference_point: i for i, reference_point in enumerate(REFERENCE_POINTS)
+}
+
+
+class AreaDistanceMatrix(Mapping):
+    """Distances between all pairs of areas of a map.
+
+    ``distances[i, j, k]`` is the distance from the area in row i to the area in row j
+    for the k-th distance type of ``DIST_TYPES``. The object can also be indexed like
+    the legacy nested dict: ``matrix[str(area_a)][str(area_b)][dist_type]``.
+
+    ``predecessors[i, j, k]`` is the row before row j on a shortest path from row i
+    for the k-th distance type of ``PATH_DIST_TYPES``, negative if there is none.
+
+    Attributes:
+        map_name (str): Name of the map
+        area_ids (np.ndarray): Area id of every row, shape (n,)
+        distances (np.ndarray): Distances, shape (n, n, 3)
+        predecessors (np.ndarray, optional): Shortest path predecessors, shape (n, n, 2)
+        index (dict): Mapping of area id to row
+    """
+
+    def __init__(
+        self,
+        map_name: str,
+        area_ids: np.ndarray,
+        distances: np.ndarray,
+        predecessors: Optional[np.ndarray] = None,
+    ) -> None:
+        if distances.shape != (len(area_ids), len(area_ids), len(DIST_TYPES)):
+            raise ValueError(
+                f"Distances have shape {distances.shape}, expected ({len(area_ids)}, {len(area_ids)}, {len(DIST_TYPES)})"
+            )
+        if predecessors is not None and predecessors.shape != (
+            len(area_ids),
+            len(area_ids),
+            len(PATH_DIST_TYPES),
+        ):
+            raise ValueError(
+                f"Predecessors have shape {predecessors.shape}, expected ({len(area_ids)}, {len(area_ids)}, {len(PATH_DIST_TYPES)})"
+            )
+        self.map_name = map_name
+        self.area_ids = np.asarray(area_ids, dtype=np.int64)
+        self.distances = distances
+        self.predecessors = predecessors
+        self.index: dict[int, int] = {
+            area_id: row for row, area_id in enumerate(self.area_ids.tolist())
+        }
+        self._id_index = _IdIndex(self.area_ids)
+
+    @staticmethod
+    def paths(directory: Union[str, Path], map_name: str) -> tuple[Path, Path]:
+        """Returns the paths of the distance and the id file of a map"""
+        return (
+            Path(directory) / f"area_distance_matrix_{map_name}.npy",
+            Path(directory) / f"area_distance_ids_{map_name}.npy",
+        )
+
+    @staticmethod
+    def predecessors_path(directory: Union[str, Path], map_name: str) -> Path:
+        """Returns the path of the predecessor file of a map"""
+        return Path(directory) / f"area_predecessors_{map_name}.npy"
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, Path], map_name: str, mmap: bool = True
+    ) -> "AreaDistanceMatrix":
+        """Opens a matrix written by :meth:`save`
+
+        Args:
+            directory (str): Directory containing the matrix files
+            map_name (string): Name of the map
+            mmap (bool, optional): Whether to memory map the distances and predecessors. Defaults to True
+
+        Returns:
+            AreaDistanceMatrix for the map, with predecessors if their file exists"""
+        distance_path, ids_path = cls.paths(directory, map_name)
+        predecessors_path = cls.predecessors_path(directory, map_name)
+        mmap_mode = "r" if mmap else None
+        distances = np.load(distance_path, mmap_mode=mmap_mode)
+        predecessors = (
+            np.load(predecessors_path, mmap_mode=mmap_mode)
+            if predecessors_path.exists()
+            else None
+        )
+        return cls(map_name, np.load(ids_path), distances, predecessors)
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Writes the matrix as float32 .npy files that can be memory mapped
+
+        Predecessors, if any, are written as int32.
+
+        Args:
+            directory (str): Directory to write to
+
+        Returns:
+            Path of the distance file"""
+        distance_path, ids_path = self.paths(directory, self.map_name)
+        os.makedirs(directory, exist_ok=True)
+        np.save(distance_path, np.asarray(self.distances, dtype=np.float32))
+        np.save(ids_path, self.area_ids)
+        predecessors_path = self.predecessors_path(directory, self.map_name)
+        if self.predecessors is not None:
+            np.save(predecessors_path, np.asarray(self.predecessors, dtype=np.int32))
+        elif predecessors_path.exists():
+            # Would belong to an older matrix
+            predecessors_path.unlink()
+        return distance_path
+
+    @classmethod
+    def from_dict(cls, map_name: str, matrix: AreaMatrix) -> "AreaDistanceMatrix":
+        """Builds a matrix from the legacy nested dict layout
+
+        Args:
+            map_name (string): Name of the map
+            matrix (dict): Nested dict [area1][area2][dist_type] with stringified area ids
+
+        Returns:
+            AreaDistanceMatrix for the map"""
+        if isinstance(matrix, AreaDistanceMatrix):
+            return matrix
+        keys = list(matrix.keys())
+        distances = np.full(
+            (len(keys), len(keys), len(DIST_TYPES)), np.inf, dtype=np.float64
+        )
+        for i, area1 in enumerate(keys):
+            for j, area2 in enumerate(keys):
+                for dist_type, value in matrix[area1].get(area2, {}).items():
+                    distances[i, j, DIST_TYPE_INDEX[dist_type]] = value
+        return cls(map_name, np.array([int(k) for k in keys]), distances)
+
+    def to_dict(self) -> AreaMatrix:
+        """Returns the matrix in the legacy nested dict layout"""
+        return {key: dict(self[key].items()) for key in self}  # type: ignore[misc]
+
+    def save_json(self, directory: Union[str, Path]) -> Path:
+        """Writes the matrix in the legacy JSON layout (area_distance_matrix_<map>.json)
+
+        Args:
+            directory (str): Directory to write to
+
+        Returns:
+            Path of the written file"""
+        path = Path(directory) / f"area_distance_matrix_{self.map_name}.json"
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    def rows(self, area_ids: Union[np.ndarray, list[int]]) -> np.ndarray:
+        """Returns the rows of many area ids at once
+
+        Raises:
+            KeyError: If any of the area ids is not part of the matrix"""
+        return self._id_index.rows(area_ids)
+
+    def distance(self, area_a: int, area_b: int, dist_type: DistanceType) -> float:
+        """Returns the distance from area_a to area_b
+
+        Raises:
+            KeyError: If either area is not part of the matrix"""
+        return float(
+            self.distances[
+                self.index[area_a], self.index[area_b], DIST_TYPE_INDEX[dist_type]
+            ]
+        )
+
+    def path(self, area_a: int, area_b: int, dist_type: DistanceType) -> list[int]:
+        """Returns the area ids of a shortest path from area_a to area_b
+
+        Args:
+            area_a (int): Area id to start from
+            area_b (int): Area id to end in
+            dist_type (string): Either graph or geodesic
+
+        Returns:
+            List of area ids from area_a to area_b, empty if there is no path
+
+        Raises:
+            ValueError: If the matrix has no predecessors or dist_type has no paths
+            KeyError: If either area is not part of the matrix"""
+        if self.predecessors is None:
+            raise ValueError(f"Matrix of {self.map_name} has no predecessors.")
+        if dist_type not in PATH_DIST_TYPE_INDEX:
+            raise ValueError("Paths only exist for graph and geodesic distance.")
+        row_a, row_b = self.index[area_a], self.index[area_b]
+        predecessors = self.predecessors[row_a, :, PATH_DIST_TYPE_INDEX[dist_type]]
+        if row_a != row_b and predecessors[row_b] < 0:
+            return []
+        path_rows = [row_b]
+        while path_rows[-1] != row_a:
+            path_rows.append(int(predecessors[path_rows[-1]]))
+        return self.area_ids[path_rows[::-1]].tolist()
+
+    def __getitem__(self, area_a: str) -> "_AreaDistanceRow":
+        return _AreaDistanceRow(self, self.index[int(area_a)])
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(area_id) for area_id in self.index)
+
+    def __len__(self) -> int:
+        return len(self.area_ids)
+
+    def __repr__(self) -> str:
+        return f"AreaDistanceMatrix(map_name={self.map_name!r}, areas={len(self)})"
+
+
+class _AreaDistanceRow(Mapping):
+    """Legacy view of one row of an AreaDistanceMatrix"""
+
+    def __init__(self, matrix: AreaDistanceMatrix, row: int) -> None:
+        self._matrix = matrix
+        self._row = row
+
+    def __getitem__(self, area_b: str) -> dict[str, float]:
+        values = self._matrix.distances[self._row, self._matrix.index[int(area_b)]]
+        return {dist_type: float(values[i]) for i, dist_type in enumerate(DIST_TYPES)}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._matrix)
+
+    def __len__(self) -> int:
+        return len(self._matrix)
+
+
+class SymmetricAreaDistanceMatrix:
+    """Symmetric graph and geodesic distances between all pairs of areas of a map.
+
+    The distance between two areas is the shorter of both directions. ``distances``
+    is the condensed upper triangle in the layout of scipy.spatial.distance.squareform:
+    the pair of rows i < j is at ``n * i - i * (i + 1) // 2 + j - i - 1`` and its last
+    axis follows ``PATH_DIST_TYPES``. The distance of an area to itself is 0.
+
+    Attributes:
+        map_name (str): Name of the map
+        area_ids (np.ndarray): Area id of every row, shape (n,)
+        distances (np.ndarray): Condensed distances, shape (n * (n - 1) / 2, 2)
+    """
+
+    def __init__(
+        self, map_name: str, area_ids: np.ndarray, distances: np.ndarray
+    ) -> None:
+        n_pairs = len(area_ids) * (len(area_ids) - 1) // 2
+        if distances.shape != (n_pairs, len(PATH_DIST_TYPES)):
+            raise ValueError(
+                f"Distances have shape {distances.shape}, expected ({n_pairs}, {len(PATH_DIST_TYPES)})"
+            )
+        self.map_name = map_name
+        self.area_ids = np.asarray(area_ids, dtype=np.int64)
+        self.distances = distances
+        self._id_index = _IdIndex(self.area_ids)
+
+    @staticmethod
+    def paths(directory: Union[str, Path], map_name: str) -> tuple[Path, Path]:
+        """Returns the paths of the distance and the id file of a map"""
+        return (
+            Path(directory) / f"area_symmetric_matrix_{map_name}.npy",
+            Path(directory) / f"area_symmetric_ids_{map_name}.npy",
+        )
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, Path], map_name: str, mmap: bool = True
+    ) -> "SymmetricAreaDistanceMatrix":
+        """Opens a matrix written by :meth:`save`
+
+        Args:
+            directory (str): Directory containing the matrix files
+            map_name (string): Name of the map
+            mmap (bool, optional): Whether to memory map the distances. Defaults to True
+
+        Returns:
+            SymmetricAreaDistanceMatrix for the map"""
+        distance_path, ids_path = cls.paths(directory, map_name)
+        distances = np.load(distance_path, mmap_mode="r" if mmap else None)
+        return cls(map_name, np.load(ids_path), distances)
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Writes the matrix as float32 .npy files that can be memory mapped
+
+        Args:
+            directory (str): Directory to write to
+
+        Returns:
+            Path of the distance file"""
+        distance_path, ids_path = self.paths(directory, self.map_name)
+        os.makedirs(directory, exist_ok=True)
+        np.save(distance_path, np.asarray(self.distances, dtype=np.float32))
+        np.save(ids_path, self.area_ids)
+        return distance_path
+
+    @classmethod
+    def from_directed(
+        cls, map_name: str, area_ids: np.ndarray, distances: list[np.ndarray]
+    ) -> "SymmetricAreaDistanceMatrix":
+        """Builds the matrix from directed distances
+
+        Args:
+            map_name (string): Name of the map
+            area_ids (np.ndarray): Area id of every row, shape (n,)
+            distances (list): Directed distances of shape (n, n) for every type of PATH_DIST_TYPES
+
+        Returns:
+            SymmetricAreaDistanceMatrix for the map"""
+        upper = np.triu_indices(len(area_ids), k=1)
+        condensed = np.empty((len(upper[0]), len(PATH_DIST_TYPES)), dtype=np.float32)
+        for i, directed in enumerate(distances):
+            directed = np.asarray(directed)
+            condensed[:, i] = np.minimum(directed[upper], directed.T[upper])
+        return cls(map_name, area_ids, condensed)
+
+    @classmethod
+    def from_area_matrix(
+        cls, matrix: AreaDistanceMatrix
+    ) -> "SymmetricAreaDistanceMatrix":
+        """Builds the matrix from the directed distances of an AreaDistanceMatrix"""
+        return cls.from_directed(
+            matrix.map_name,
+            matrix.area_ids,
+            [
+                matrix.distances[..., DIST_TYPE_INDEX[dist_type]]
+                for dist_type in PATH_DIST_TYPES
+            ],
+        )
+
+    def rows(self, area_ids: Union[np.ndarray, list[int]]) -> np.ndarray:
+        """Returns the rows of many area ids at once
+
+        Raises:
+            KeyError: If any of the area ids is not part of the matrix"""
+        return self._id_index.rows(area_ids)
+
+    def pair_distances(
+        self,
+        area_ids_a: Union[np.ndarray, list[int]],
+        area_ids_b: Union[np.ndarray, list[int]],
+        dist_type: DistanceType,
+    ) -> np.ndarray:
+        """Returns the symmetric distances between many pairs of areas at once
+
+        Args:
+            area_ids_a (np.ndarray): Area ids of the first areas
+            area_ids_b (np.ndarray): Area ids of the second areas, broadcastable with area_ids_a
+            dist_type (string): Either graph or geodesic
+
+        Returns:
+            float64 distances with the broadcast shape of the inputs
+
+        Raises:
+            ValueError: If dist_type is not graph or geodesic
+            KeyError: If any area is not part of the matrix"""
+        if dist_type not in PATH_DIST_TYPE_INDEX:
+            raise ValueError("Symmetric distances only exist for graph and geodesic.")
+        rows_a, rows_b = np.broadcast_arrays(
+            self.rows(np.asarray(area_ids_a)), self.rows(np.asarray(area_ids_b))
+        )
+        low, high = np.minimum(rows_a, rows_b), np.maximum(rows_a, rows_b)
+        n = len(self.area_ids)
+        positions = n * low - low * (low + 1) // 2 + high - low - 1
+        distances = np.zeros(low.shape)
+        off_diagonal = low != high
+        distances[off_diagonal] = self.distances[
+            positions[off_diagonal], PATH_DIST_TYPE_INDEX[dist_type]
+        ]
+        return distances
+
+    def distance(self, area_a: int, area_b: int, dist_type: DistanceType) -> float:
+        """Returns the shorter of the distances from area_a to area_b and back
+
+        Raises:
+            ValueError: If dist_type is not graph or geodesic
+            KeyError: If either area is not part of the matrix"""
+        return float(self.pair_distances([area_a], [area_b], dist_type)[0])
+
+    def __len__(self) -> int:
+        return len(self.area_ids)
+
+    def __repr__(self) -> str:
+        return f"SymmetricAreaDistanceMatrix(map_name={self.map_name!r}, areas={len(self)})"
+
+
+class PlaceDistanceMatrix(Mapping):
+    """Distances between all pairs of named places of a map.
+
+    ``distances[i, j, k, r]`` is the distance from place i to place j for the k-th
+    distance type of ``DIST_TYPES`` and the r-th reference point of
+    ``REFERENCE_POINTS``. Places are sorted by name, the same order that
+    ``awpy.analytics.nav.generate_position_token`` uses for its tokens. The object
+    can also be indexed like the legacy nested dict:
+    ``matrix[place1][place2][dist_type][reference_point]``.
+
+    Attributes:
+        map_name (str): Name of the map
+        places (list): Sorted place names
+        distances (np.ndarray): Distances, shape (n, n, 3, 3)
+        index (dict): Mapping of place name to row
+    """
+
+    def __init__(self, map_name: str, places: list[str], distances: np.ndarray) -> None:
+        if distances.shape != (
+            len(places),
+            len(places),
+            len(DIST_TYPES),
+            len(REFERENCE_POINTS),
+        ):
+            raise ValueError(
+                f"Distances have shape {distances.shape}, expected ({len(places)}, {len(places)}, {len(DIST_TYPES)}, {len(REFERENCE_POINTS)})"
+            )
+        if list(places) != sorted(places):
+            raise ValueError("Places have to be sorted by name.")
+        self.map_name = map_name
+        self.places = list(places)
+        self.distances = distances
+        self.index: dict[str, int] = {place: row for row, place in enumerate(places)}
+
+    @staticmethod
+    def paths(directory: Union[str, Path], map_name: str) -> tuple[Path, Path]:
+        """Returns the paths of the distance and the place name file of a map"""
+        return (
+            Path(directory) / f"place_distance_matrix_{map_name}.npy",
+            Path(directory) / f"place_distance_names_{map_name}.npy",
+        )
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], map_name: str) -> "PlaceDistanceMatrix":
+        """Reads a matrix written by :meth:`save`
+
+        Args:
+            directory (str): Directory containing the matrix files
+            map_name (string): Name of the map
+
+        Returns:
+            PlaceDistanceMatrix for the map"""
+        distance_path, names_path = cls.paths(directory, map_name)
+        return cls(map_name, np.load(names_path).tolist(), np.load(distance_path))
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """Writes the matrix as float32 .npy files
+
+        Args:
+            directory (str): Directory to write to
+
+        Returns:
+            Path of the distance file"""
+        distance_path, names_path = self.paths(directory, self.map_name)
+        os.makedirs(directory, exist_ok=True)
+        np.save(distance_path, np.asarray(self.distances, dtype=np.float32))
+        np.save(names_path, np.array(self.places, dtype=str))
+        return distance_path
+
+    @classmethod
+    def from_dict(cls, map_name: str, matrix: PlaceMatrix) -> "PlaceDistanceMatrix":
+        """Builds a matrix from the legacy nested dict layout
+
+        Args:
+            map_name (string): Name of the map
+            matrix (dict): Nested dict [place1][place2][dist_type][reference_point]
+
+        Returns:
+            PlaceDistanceMatrix for the map"""
+        if isinstance(matrix, PlaceDistanceMatrix):
+            return matrix
+        places = sorted(matrix.keys())
+        distances = np.full(
+            (len(places), len(places), len(DIST_TYPES), len(REFERENCE_POINTS)),
+            np.inf,
+            dtype=np.float64,
+        )
+        for i, place1 in enumerate(places):
+            for j, place2 in enumerate(places):
+                for dist_type, values in matrix[place1].get(place2, {}).items():
+                    for reference_point, value in values.items():
+                        distances[
+                            i,
+                            j,
+                            DIST_TYPE_INDEX[dist_type],
+                            REFERENCE_POINT_INDEX[reference_point],
+                        ] = value
+        return cls(map_name, places, distances)
+
+    def to_dict(self) -> PlaceMatrix:
+        """Returns the matrix in the legacy nested dict layout"""
+        return {
+            place1: {place2: self[place1][place2] for place2 in self} for place1 in self
+        }
+
+    def rows(self, places: list[str]) -> np.ndarray:
+        """Returns the rows of many place names at once
+
+        Raises:
+            KeyError: If any of the places is not part of the matrix"""
+        return np.array([self.index[place] for place in places], dtype=np.int64)
+
+    def distance(
+        self,
+        place1: str,
+        place2: str,
+        dist_type: DistanceType,
+        reference_point: ReferencePoint,
+    ) -> float:
+        """Returns the distance from place1 to place2
+
+        Raises:
+            KeyError: If either place is not part of the matrix"""
+        return float(
+            self.distances[
+                self.index[place1],
+                self.index[place2],
+                DIST_TYPE_INDEX[dist_type],
+                REFERENCE_POINT_INDEX[reference_point],
+            ]
+        )
+
+    def __getitem__(self, place1: str) -> "_PlaceDistanceRow":
+        return _PlaceDistanceRow(self, self.index[place1])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.places)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def __repr__(self) -> str:
+        return f"PlaceDistanceMatrix(map_name={self.map_name!r}, places={len(self)})"
+
+
+class _PlaceDistanceRow(Mapping):
+    """Legacy view of one row of a PlaceDistanceMatrix"""
+
+    def __init__(self, matrix: PlaceDistanceMatrix, row: int) -> None:
+        self._matrix = matrix
+        self._row = row
+
+    def __getitem__(self, place2: str) -> dict[str, dict[str, float]]:
+        values = self._matrix.distances[self._row, self._matrix.index[place2]]
+        return {
+            dist_type: {
+                reference_point: float(values[i, j])
+                for j, reference_point in enumerate(REFERENCE_POINTS)
+            }
+            for i, dist_type in enumerate(DIST_TYPES)
+        }
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._matrix)
+
+    def __len__(self) -> int:
+        return len(self._matrix)
@@ -0,0 +1,382 @@
+"""Columnar representation of a map's navigation mesh.
+
+    Typical usage example:
+
+    from awpy.data import NAV
+
+    mesh = NAV["de_dust2"]
+    mesh[152]["areaName"]  # 'BombsiteA', same as the old dict of dicts
+    mesh.centers[mesh.row(152)]  # center of area 152 as a numpy array
+"""
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Iterator, Optional, Union
+
+import numpy as np
+
+from awpy.types import Area
+from awpy.data.landmarks import Landmarks
+from awpy.data.spatial import AreaGrid, AreaRaster
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from scipy.sparse import csr_matrix
+    from scipy.spatial import cKDTree
+
+# Edge length in game units of the cells of NavMesh.area_raster
+DEFAULT_RASTER_CELL_SIZE = 8.0
+# Number of landmarks of NavMesh.landmarks
+DEFAULT_LANDMARKS = 16
+
+
+class _IdIndex:
+    """Vectorized lookup of the rows of many ids at once, shared by the nav mesh and
+    the distance matrices.
+
+    Args:
+        ids (np.ndarray): Id of every row, shape (n,)
+    """
+
+    def __init__(self, ids: np.ndarray) -> None:
+        self._sorter = np.argsort(ids, kind="stable")
+        self._sorted_ids = np.asarray(ids)[self._sorter]
+
+    def rows(self, ids: Union[np.ndarray, list[int]]) -> np.ndarray:
+        """Returns the rows of ids, with the shape of ids
+
+        Raises:
+            KeyError: If any of the ids is not part of the index"""
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.searchsorted(self._sorted_ids, ids)
+        positions = np.clip(positions, 0, max(len(self._sorted_ids) - 1, 0))
+        if ids.size > 0 and (
+            len(self._sorted_ids) == 0 or np.any(self._sorted_ids[positions] != ids)
+        ):
+            raise KeyError("Area ID not found.")
+        return self._sorter[positions]
+
+
+class NavMesh(Mapping):
+    """Holds every area of a single map as contiguous numpy arrays.
+
+    The rows of all arrays follow the order of the areas in the source data.
+    The object is also a read-only mapping from area id to an :class:`Area` dict,
+    so code written against the old ``dict[int, Area]`` layout keeps working.
+
+    Attributes:
+        map_name (str): Name of the map
+        area_ids (np.ndarray): Area ids, shape (n,)
+        area_names (np.ndarray): Place name of each area, shape (n,)
+        north_west (np.ndarray): North west corner of each area, shape (n, 3)
+        south_east (np.ndarray): South east corner of each area, shape (n, 3)
+        centers (np.ndarray): Center of each area, shape (n, 3)
+        sizes (np.ndarray): Length of the diagonal of each area, shape (n,)
+        index (dict): Mapping of area id to row
+        edges (np.ndarray, optional): Directed edges as pairs of area ids, shape (m, 2)
+        edge_weights (np.ndarray, optional): Euclidean length of every edge, shape (m,)
+    """
+
+    def __init__(
+        self,
+        map_name: str,
+        area_ids: np.ndarray,
+        area_names: np.ndarray,
+        north_west: np.ndarray,
+        south_east: np.ndarray,
+    ) -> None:
+        self.map_name = map_name
+        self.area_ids = np.ascontiguousarray(area_ids, dtype=np.int64)
+        self.area_names = np.asarray(area_names, dtype=str)
+        self.north_west = np.ascontiguousarray(north_west, dtype=np.float64)
+        self.south_east = np.ascontiguousarray(south_east, dtype=np.float64)
+        self.centers = (self.north_west + self.south_east) / 2
+        self.sizes = np.sqrt(((self.north_west - self.south_east) ** 2).sum(axis=1))
+        self.index: dict[int, int] = {
+            area_id: row for row, area_id in enumerate(self.area_ids.tolist())
+        }
+        self._id_index = _IdIndex(self.area_ids)
+        self.edges: Optional[np.ndarray] = None
+        self.edge_weights: Optional[np.ndarray] = None
+        self._csr_graph: Optional["csr_matrix"] = None
+        self._kd_tree: Optional["cKDTree"] = None
+        self._area_grid: Optional[AreaGrid] = None
+        self._area_raster: Optional[AreaRaster] = None
+        self._place_table: Optional[tuple[np.ndarray, np.ndarray]] = None
+        self._landmarks: Optional[Landmarks] = None
+        # Numbers of landmarks known to be missing from the nav cache
+        self._uncached_landmarks: set[int] = set()
+
+    def set_edges(self, edges: np.ndarray, edge_weights: np.ndarray) -> None:
+        """Attaches the edge list of the map to the mesh
+
+        Args:
+            edges (np.ndarray): Directed edges as pairs of area ids, shape (m, 2)
+            edge_weights (np.ndarray): Weight of every edge, shape (m,)"""
+        self.edges = np.ascontiguousarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.edge_weights = np.ascontiguousarray(edge_weights, dtype=np.float64)
+        self._csr_graph = None
+        self._landmarks = None
+        self._uncached_landmarks.clear()
+
+    def csr_graph(self) -> "csr_matrix":
+        """Returns the directed, weighted adjacency matrix of the mesh for scipy.sparse.csgraph
+
+        Rows and columns follow the rows of the mesh. Edges are weighted by the
+        euclidean distance between area centers and duplicate edges are only kept once.
+        The matrix is built on the first call and cached.
+
+        Returns:
+            csr_matrix with shape (n, n)
+
+        Raises:
+            ValueError: If the mesh has no edges"""
+        if self._csr_graph is None:
+            from scipy.sparse import csr_matrix
+
+            if self.edges is None or self.edge_weights is None:
+                raise ValueError(f"Nav mesh of {self.map_name} has no edges.")
+            edge_rows = self.rows(self.edges.ravel()).reshape(-1, 2)
+            # Keep one entry per edge, csr_matrix would sum duplicates
+            _, unique = np.unique(edge_rows, axis=0, return_index=True)
+            graph = csr_matrix(
+                (
+                    self.edge_weights[unique],
+                    (edge_rows[unique, 0], edge_rows[unique, 1]),
+                ),
+                shape=(len(self), len(self)),
+            )
+            graph.sort_indices()
+            self._csr_graph = graph
+        return self._csr_graph
+
+    def place_table(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the sorted, unique place names of the mesh and the index of every area's place in them
+
+        Built on the first call and cached.
+
+        Returns:
+            Tuple of the place names (shape (n_places,)) and the place index of every row (shape (n,), int16)"""
+        if self._place_table is None:
+            places, place_index = np.unique(self.area_names, return_inverse=True)
+            self._place_table = (places, place_index.astype(np.int16).reshape(-1))
+        return self._place_table
+
+    def kd_tree(self) -> "cKDTree":
+        """Returns a KD-tree over the area centers. Its data indices are the rows of the mesh
+
+        The tree is built on the first call and cached."""
+        if self._kd_tree is None:
+            from scipy.spatial import cKDTree
+
+            self._kd_tree = cKDTree(self.centers)
+        return self._kd_tree
+
+    def area_grid(self) -> AreaGrid:
+        """Returns a grid over the bounding boxes of the areas. Its rows are the rows of the mesh
+
+        The grid is built on the first call and cached."""
+        if self._area_grid is None:
+            self._area_grid = AreaGrid(self.north_west, self.south_east)
+        return self._area_grid
+
+    def area_raster(
+        self, cell_size: Optional[float] = None, z_cutoff: Optional[float] = None
+    ) -> AreaRaster:
+        """Returns a raster of the area ids of the mesh
+
+        Rasters are loaded from (or compiled into) the nav cache and the last one is
+        kept on the mesh.
+
+        Args:
+            cell_size (float, optional): Edge length of a cell. Defaults to the cell size
+                of the raster already kept on the mesh, otherwise DEFAULT_RASTER_CELL_SIZE
+            z_cutoff (float, optional): Height separating the upper and the lower layer. Defaults to None
+
+        Returns:
+            AreaRaster of the mesh"""
+        from awpy.data.cache import load_area_raster, raster_checksum, save_area_raster
+
+        raster = self._area_raster
+        if (
+            raster is not None
+            and cell_size in (None, raster.cell_size)
+            and z_cutoff == raster.z_cutoff
+        ):
+            return raster
+        if cell_size is None:
+            cell_size = DEFAULT_RASTER_CELL_SIZE if raster is None else raster.cell_size
+        checksum = raster_checksum(self, cell_size, z_cutoff)
+        raster = load_area_raster(self.map_name, cell_size, checksum)
+        if raster is None:
+            raster = AreaRaster.build(
+                self.area_ids, self.north_west, self.south_east, cell_size, z_cutoff
+            )
+            save_area_raster(self.map_name, raster, checksum)
+        self._area_raster = raster
+        return raster
+
+    def landmarks(self, k: Optional[int] = None) -> Landmarks:
+        """Returns landmark distances for geodesic distance bounds on the graph of the mesh
+
+        Landmarks are loaded from (or compiled into) the nav cache and the last ones
+        are kept on the mesh. Geodesic searches in area_distance use them once they
+        exist (see cached_landmarks), so calling this once speeds up later searches.
+
+        Args:
+            k (int, optional): Number of landmarks. Defaults to the number of the landmarks
+                already kept on the mesh, otherwise DEFAULT_LANDMARKS
+
+        Returns:
+            Landmarks of the mesh
+
+        Raises:
+            ValueError: If the mesh has no edges"""
+        from awpy.data.cache import landmarks_checksum, load_landmarks, save_landmarks
+
+        landmarks = self._landmarks
+        if landmarks is not None and (
+            k in (None, len(landmarks))
+            # Every area already is a landmark
+            or (len(landmarks) == len(self) and k > len(self))
+        ):
+            return landmarks
+        if k is None:
+            k = DEFAULT_LANDMARKS if landmarks is None else len(landmarks)
+        graph = self.csr_graph()
+        checksum = landmarks_checksum(self, k)
+        landmarks = load_landmarks(self.map_name, k, checksum)
+        if landmarks is None:
+            landmarks = Landmarks.build(graph, k)
+            save_landmarks(self.map_name, k, landmarks, checksum)
+        self._landmarks = landmarks
+        self._uncached_landmarks.discard(k)
+        return landmarks
+
+    def cached_landmarks(self, k: Optional[int] = None) -> Optional[Landmarks]:
+        """Returns the landmarks kept on the mesh or in the nav cache without building any
+
+        Args:
+            k (int, optional): Number of landmarks to load if none are kept on the mesh.
+                Defaults to DEFAULT_LANDMARKS
+
+        Returns:
+            Landmarks of the mesh or None if they were never built"""
+        from awpy.data.cache import landmarks_checksum, load_landmarks
+
+        if self._landmarks is not None:
+            return self._landmarks
+        if k is None:
+            k = DEFAULT_LANDMARKS
+        if self.edges is None or k in self._uncached_landmarks:
+            return None
+        landmarks = load_landmarks(self.map_name, k, landmarks_checksum(self, k))
+        if landmarks is None:
+            self._uncached_landmarks.add(k)
+        else:
+            self._landmarks = landmarks
+        return landmarks
+
+    @classmethod
+    def from_dataframe(cls, map_name: str, df: "pd.DataFrame") -> "NavMesh":
+        """Builds a NavMesh from the rows of nav_info.csv belonging to one map
+
+        Args:
+            map_name (string): Name of the map
+            df (pd.DataFrame): Dataframe with the columns of nav_info.csv
+
+        Returns:
+            NavMesh for the map"""
+        return cls(
+            map_name,
+            df["areaId"].to_numpy(),
+            df["areaName"].fillna("").to_numpy(dtype=str),
+            df[["northWestX", "northWestY", "northWestZ"]].to_numpy(),
+            df[["southEastX", "southEastY", "southEastZ"]].to_numpy(),
+        )
+
+    @classmethod
+    def from_dict(cls, map_name: str, areas: Mapping) -> "NavMesh":
+        """Builds a NavMesh from the legacy ``dict[int, Area]`` layout
+
+        Args:
+            map_name (string): Name of the map
+            areas (dict): Dictionary mapping area ids to Area dicts
+
+        Returns:
+            NavMesh for the map"""
+        if isinstance(areas, NavMesh):
+            return areas
+        area_ids = list(areas.keys())
+        return cls(
+            map_name,
+            np.array(area_ids, dtype=np.int64),
+            np.array([areas[a]["areaName"] for a in area_ids], dtype=str),
+            np.array(
+                [
+                    [
+                        areas[a]["northWestX"],
+                        areas[a]["northWestY"],
+                        areas[a]["northWestZ"],
+                    ]
+                    for a in area_ids
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 3),
+            np.array(
+                [
+                    [
+                        areas[a]["southEastX"],
+                        areas[a]["southEastY"],
+                        areas[a]["southEastZ"],
+                    ]
+                    for a in area_ids
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 3),
+        )
+
+    def row(self, area_id: int) -> int:
+        """Returns the row of an area id
+
+        Raises:
+            KeyError: If the area id is not part of the mesh"""
+        return self.index[area_id]
+
+    def rows(self, area_ids: Union[np.ndarray, list[int]]) -> np.ndarray:
+        """Returns the rows of many area ids at once
+
+        Raises:
+            KeyError: If any of the area ids is not part of the mesh"""
+        return self._id_index.rows(area_ids)
+
+    def __getitem__(self, area_id: int) -> Area:
+        row = self.index[area_id]
+        north_west = self.north_west[row].tolist()
+        south_east = self.south_east[row].tolist()
+        return {
+            "areaName": str(self.area_names[row]),
+            "northWestX": north_west[0],
+            "northWestY": north_west[1],
+            "northWestZ": north_west[2],
+            "southEastX": south_east[0],
+            "southEastY": south_east[1],
+            "southEastZ": south_east[2],
+        }
+
+    def __contains__(self, area_id: object) -> bool:
+        try:
+            return area_id in self.index
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.area_ids)
+
+    def __repr__(self) -> str:
+        return f"NavMesh(map_name={self.map_name!r}, areas={len(self)})"
+
+    def to_dict(self) -> dict[int, Area]:
+        """Returns the mesh in the legacy ``dict[int, Area]`` layout"""
+        return {area_id: self[area_id] for area_id in self}
@@ -0,0 +1,204 @@
+"""Publishes the nav data of maps in shared memory for worker pools.
+
+Every process that imports awpy.data builds its own nav meshes and distance
+matrices. When nav heavy analytics are spread over many processes, the parent can
+publish the arrays of the maps it needs once with :func:`share_nav` and the
+workers attach to them with :func:`attach_nav`. Attached meshes and matrices are
+numpy views of the shared blocks, so the memory per worker stays flat.
+
+    Typical usage example:
+
+    from concurrent.futures import ProcessPoolExecutor
+    from awpy.data.shared import attach_nav, share_nav
+
+    with share_nav(["de_dust2", "de_inferno"]) as shared:
+        with ProcessPoolExecutor(initializer=attach_nav, initargs=(shared.spec,)) as pool:
+            distances = list(pool.map(frame_distance_job, jobs))
+
+The parent has to keep the SharedNav object alive until all workers are done.
+Small derived data (the area id index, area centers and the sparse graph) is
+still rebuilt by every worker.
+"""
+import sys
+from multiprocessing import shared_memory
+from typing import Any, Iterable
+
+import numpy as np
+
+from awpy.data import AREA_DIST_MATRIX, NAV, PLACE_DIST_MATRIX
+from awpy.data.matrix import AreaDistanceMatrix, PlaceDistanceMatrix
+from awpy.data.navmesh import NavMesh
+
+
+# Layout of one array inside a block: name -> (offset, dtype, shape)
+ArrayLayout = dict[str, tuple[int, str, tuple[int, ...]]]
+
+_ALIGNMENT = 64
+
+# Blocks attached by this process. They have to outlive the arrays viewing them
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _map_arrays(
+    map_name: str, area_matrix: bool, place_matrix: bool
+) -> dict[str, np.ndarray]:
+    mesh = NavMesh.from_dict(map_name, NAV[map_name])
+    arrays = {
+        "area_ids": mesh.area_ids,
+        "area_names": mesh.area_names,
+        "north_west": mesh.north_west,
+        "south_east": mesh.south_east,
+    }
+    if mesh.edges is not None and mesh.edge_weights is not None:
+        arrays["edges"] = mesh.edges
+        arrays["edge_weights"] = mesh.edge_weights
+    if area_matrix and map_name in AREA_DIST_MATRIX:
+        matrix = AreaDistanceMatrix.from_dict(map_name, AREA_DIST_MATRIX[map_name])
+        arrays["area_matrix_ids"] = matrix.area_ids
+        arrays["area_matrix"] = np.asarray(matrix.distances)
+        if matrix.predecessors is not None:
+            arrays["area_predecessors"] = np.asarray(matrix.predecessors)
+    if place_matrix and map_name in PLACE_DIST_MATRIX:
+        places = PlaceDistanceMatrix.from_dict(map_name, PLACE_DIST_MATRIX[map_name])
+        arrays["places"] = np.array(places.places, dtype=str)
+        arrays["place_matrix"] = places.distances
+    return arrays
+
+
+def _publish(
+    arrays: dict[str, np.ndarray]
+) -> tuple[shared_memory.SharedMemory, ArrayLayout]:
+    layout: ArrayLayout = {}
+    size = 0
+    for name, array in arrays.items():
+        layout[name] = (size, array.dtype.str, array.shape)
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, (offset, dtype, shape) in layout.items():
+        view: np.ndarray = np.ndarray(
+            shape, dtype=dtype, buffer=block.buf, offset=offset
+        )
+        view[...] = arrays[name]
+    return block, layout
+
+
+def _views(
+    block: shared_memory.SharedMemory, layout: ArrayLayout
+) -> dict[str, np.ndarray]:
+    views = {}
+    for name, (offset, dtype, shape) in layout.items():
+        view: np.ndarray = np.ndarray(
+            tuple(shape), dtype=dtype, buffer=block.buf, offset=offset
+        )
+        view.setflags(write=False)
+        views[name] = view
+    return views
+
+
+class SharedNav:
+    """Owner of the shared memory blocks created by :func:`share_nav`
+
+    Attributes:
+        spec (dict): Picklable description of the blocks, pass it to :func:`attach_nav`
+    """
+
+    def __init__(self) -> None:
+        self.spec: dict[str, tuple[str, ArrayLayout]] = {}
+        self._blocks: list[shared_memory.SharedMemory] = []
+
+    def add(self, map_name: str, arrays: dict[str, np.ndarray]) -> None:
+        """Copies the arrays of a map into a new shared memory block"""
+        block, layout = _publish(arrays)
+        self._blocks.append(block)
+        self.spec[map_name] = (block.name, layout)
+
+    def close(self) -> None:
+        """Releases and removes all blocks. Workers must not use them afterwards"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+        self.spec = {}
+
+    def __enter__(self) -> "SharedNav":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SharedNav(maps={list(self.spec)})"
+
+
+def share_nav(
+    map_names: Iterable[str], area_matrix: bool = True, place_matrix: bool = True
+) -> SharedNav:
+    """Publishes the nav mesh, edges and distance matrices of maps in shared memory
+
+    Args:
+        map_names (list): Maps to publish
+        area_matrix (bool, optional): Whether to publish the area distance matrices. Defaults to True
+        place_matrix (bool, optional): Whether to publish the place distance matrices. Defaults to True
+
+    Returns:
+        SharedNav owning the blocks. Close it (or use it as a context manager) once the workers are done
+
+    Raises:
+        ValueError: If a map is not in awpy.data.NAV
+    """
+    shared = SharedNav()
+    try:
+        for map_name in map_names:
+            if map_name not in NAV:
+                raise ValueError("Map not found.")
+            shared.add(map_name, _map_arrays(map_name, area_matrix, place_matrix))
+    except BaseException:
+        shared.close()
+        raise
+    return shared
+
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        # The publishing process owns the block and is the one to unlink it
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def attach_nav(spec: dict[str, tuple[str, ArrayLayout]]) -> None:
+    """Makes the maps published by :func:`share_nav` available in this process
+
+    The meshes and matrices are views of the shared blocks and replace the entries of
+    awpy.data.NAV, awpy.data.AREA_DIST_MATRIX and awpy.data.PLACE_DIST_MATRIX, so all
+    functions in awpy.analytics.nav use them. Can be used as a pool initializer.
+
+    Args:
+        spec (dict): SharedNav.spec of the publishing process
+    """
+    for map_name, (block_name, layout) in spec.items():
+        block = _attached.get(block_name)
+        if block is None:
+            block = _open_block(block_name)
+            _attached[block_name] = block
+        arrays = _views(block, layout)
+        mesh = NavMesh(
+            map_name,
+            arrays["area_ids"],
+            arrays["area_names"],
+            arrays["north_west"],
+            arrays["south_east"],
+        )
+        if "edges" in arrays:
+            mesh.set_edges(arrays["edges"], arrays["edge_weights"])
+        NAV[map_name] = mesh
+        if "area_matrix" in arrays:
+            AREA_DIST_MATRIX[map_name] = AreaDistanceMatrix(
+                map_name,
+                arrays["area_matrix_ids"],
+                arrays["area_matrix"],
+                arrays.get("area_predecessors"),
+            )
+        if "place_matrix" in arrays:
+            PLACE_DIST_MATRIX[map_name] = PlaceDistanceMatrix(
+                map_name, arrays["places"].tolist(), arrays["place_matrix"]
+            )
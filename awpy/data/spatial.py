@@ -0,0 +1,238 @@
+"""Spatial indices over the areas of a nav mesh.
+
+    Typical usage example:
+
+    from awpy.data import NAV
+
+    mesh = NAV["de_dust2"]
+    rows, contained = mesh.area_grid().locate(points)
+"""
+from typing import Optional
+
+import numpy as np
+
+
+class AreaGrid:
+    """Uniform 2D grid of buckets over the axis aligned bounding boxes of the areas.
+
+    Every cell lists the rows of all areas whose box overlaps it, stored in CSR
+    layout: the rows of cell c are ``cell_rows[cell_start[c]:cell_start[c + 1]]``.
+
+    Attributes:
+        mins (np.ndarray): Lower x, y, z corner of each area, shape (n, 3)
+        maxs (np.ndarray): Upper x, y, z corner of each area, shape (n, 3)
+        origin (np.ndarray): Lower x, y corner of the grid, shape (2,)
+        cell_size (float): Edge length of a cell
+        shape (tuple): Number of cells along x and y
+        cell_start (np.ndarray): Offset of each cell into cell_rows, shape (n_cells + 1,)
+        cell_rows (np.ndarray): Area rows of all cells, shape (n_entries,)
+    """
+
+    def __init__(
+        self,
+        north_west: np.ndarray,
+        south_east: np.ndarray,
+        cell_size: Optional[float] = None,
+    ) -> None:
+        self.mins = np.minimum(north_west, south_east)
+        self.maxs = np.maximum(north_west, south_east)
+        extents = self.maxs[:, :2] - self.mins[:, :2]
+        if cell_size is None:
+            # About one typical area per cell and layer
+            cell_size = float(np.median(extents.max(axis=1))) if len(extents) else 1.0
+        self.cell_size = max(float(cell_size), 1.0)
+        self.origin = self.mins[:, :2].min(axis=0) if len(extents) else np.zeros(2)
+        upper = self.maxs[:, :2].max(axis=0) if len(extents) else np.zeros(2)
+        self.shape: tuple[int, int] = tuple(  # type: ignore[assignment]
+            (np.floor((upper - self.origin) / self.cell_size).astype(int) + 1).tolist()
+        )
+        low = self._cells(self.mins[:, :2])
+        high = self._cells(self.maxs[:, :2])
+        spans = high - low + 1
+        counts = spans[:, 0] * spans[:, 1]
+        rows = np.repeat(np.arange(len(counts)), counts)
+        # Position of every entry inside the block of cells covered by its area
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cell_x = low[rows, 0] + local // spans[rows, 1]
+        cell_y = low[rows, 1] + local % spans[rows, 1]
+        cells = cell_x * self.shape[1] + cell_y
+        order = np.lexsort((rows, cells))
+        self.cell_rows = rows[order]
+        self.cell_start = np.zeros(self.shape[0] * self.shape[1] + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(cells, minlength=self.shape[0] * self.shape[1]),
+            out=self.cell_start[1:],
+        )
+
+    def _cells(self, xy: np.ndarray) -> np.ndarray:
+        cells = np.floor((xy - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def locate(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the area containing each point
+
+        An area contains a point if the point lies within its box in x and y (bounds included).
+        If several areas do, the one closest to the point in z wins (distance to the z range
+        of the area), remaining ties go to the area that comes first in the mesh.
+
+        Args:
+            points (np.ndarray): Points with shape (n, 3). Points that are not finite are never contained
+
+        Returns:
+            Tuple of the row of the containing area (shape (n,), -1 if there is none)
+            and whether a containing area was found (shape (n,))
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        found = np.full(len(points), -1, dtype=np.int64)
+        if len(self.mins) == 0:
+            return found, found >= 0
+        finite = np.flatnonzero(np.isfinite(points).all(axis=1))
+        xy = points[finite, :2]
+        raw_cells = np.floor((xy - self.origin) / self.cell_size)
+        inside = ((raw_cells >= 0) & (raw_cells < np.array(self.shape))).all(axis=1)
+        finite, xy = finite[inside], xy[inside]
+        cells = raw_cells[inside].astype(np.int64)
+        cells = cells[:, 0] * self.shape[1] + cells[:, 1]
+        starts = self.cell_start[cells]
+        counts = self.cell_start[cells + 1] - starts
+        # One entry per candidate (point, area) pair
+        point_idx = np.repeat(finite, counts)
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(
+            counts.sum()
+        )
+        rows = self.cell_rows[offsets]
+        candidates = points[point_idx]
+        contains = (
+            (self.mins[rows, :2] <= candidates[:, :2])
+            & (candidates[:, :2] <= self.maxs[rows, :2])
+        ).all(axis=1)
+        point_idx, rows, candidates = (
+            point_idx[contains],
+            rows[contains],
+            candidates[contains],
+        )
+        z_dist = np.maximum(
+            np.maximum(self.mins[rows, 2] - candidates[:, 2], 0),
+            candidates[:, 2] - self.maxs[rows, 2],
+        )
+        order = np.lexsort((rows, z_dist, point_idx))
+        point_idx, rows = point_idx[order], rows[order]
+        first = np.ones(len(point_idx), dtype=bool)
+        first[1:] = point_idx[1:] != point_idx[:-1]
+        found[point_idx[first]] = rows[first]
+        return found, found >= 0
+
+
+class AreaRaster:
+    """Area id of every cell of a regular 2D grid over a map, one grid per z layer.
+
+    Maps with a z_cutoff (see awpy.data.MAP_DATA) get two layers: index 0 holds the
+    areas at or above the cutoff and index 1 the areas below it. A cell holds the area
+    whose bounding box contains the cell center (the highest one where areas overlap)
+    or, if there is none, the area of the layer with the closest center in x and y.
+    Looking up a point is an integer division and one array read.
+
+    Attributes:
+        grid (np.ndarray): Area ids, shape (n_layers, n_x, n_y)
+        origin (np.ndarray): Lower x, y corner of the grid, shape (2,)
+        cell_size (float): Edge length of a cell
+        z_cutoff (float, optional): Height separating the two layers
+    """
+
+    def __init__(
+        self,
+        grid: np.ndarray,
+        origin: np.ndarray,
+        cell_size: float,
+        z_cutoff: Optional[float] = None,
+    ) -> None:
+        self.grid = grid
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.z_cutoff = None if z_cutoff is None else float(z_cutoff)
+
+    @classmethod
+    def build(
+        cls,
+        area_ids: np.ndarray,
+        north_west: np.ndarray,
+        south_east: np.ndarray,
+        cell_size: float,
+        z_cutoff: Optional[float] = None,
+    ) -> "AreaRaster":
+        """Rasterizes the areas of a mesh
+
+        Args:
+            area_ids (np.ndarray): Area ids, shape (n,)
+            north_west (np.ndarray): North west corner of each area, shape (n, 3)
+            south_east (np.ndarray): South east corner of each area, shape (n, 3)
+            cell_size (float): Edge length of a cell
+            z_cutoff (float, optional): Height separating the upper and the lower layer. Defaults to None
+
+        Returns:
+            AreaRaster of the areas
+
+        Raises:
+            ValueError: If there are no areas or cell_size is not positive
+        """
+        from scipy.spatial import cKDTree
+
+        if len(area_ids) == 0:
+            raise ValueError("Cannot rasterize a mesh without areas.")
+        if not cell_size > 0:
+            raise ValueError(f"'cell_size' has to be positive not {cell_size}")
+        mins = np.minimum(north_west, south_east)
+        maxs = np.maximum(north_west, south_east)
+        origin = mins[:, :2].min(axis=0)
+        shape = np.floor((maxs[:, :2].max(axis=0) - origin) / cell_size).astype(int) + 1
+        cell_x, cell_y = np.meshgrid(
+            origin[0] + (np.arange(shape[0]) + 0.5) * cell_size,
+            origin[1] + (np.arange(shape[1]) + 0.5) * cell_size,
+            indexing="ij",
+        )
+        cell_centers = np.column_stack([cell_x.ravel(), cell_y.ravel()])
+        center_z = (mins[:, 2] + maxs[:, 2]) / 2
+        if z_cutoff is None:
+            layers = [np.arange(len(area_ids))]
+        else:
+            layers = [
+                np.flatnonzero(center_z >= z_cutoff),
+                np.flatnonzero(center_z < z_cutoff),
+            ]
+        grid = np.zeros((len(layers), shape[0], shape[1]), dtype=np.int32)
+        for layer, rows in enumerate(layers):
+            if len(rows) == 0:
+                rows = np.arange(len(area_ids))
+            area_grid = AreaGrid(north_west[rows], south_east[rows])
+            # Above every area, so overlapping areas resolve to the highest one
+            top = np.full((len(cell_centers), 1), maxs[rows, 2].max() + 1)
+            found, contained = area_grid.locate(np.hstack([cell_centers, top]))
+            if not contained.all():
+                centers = (mins[rows, :2] + maxs[rows, :2]) / 2
+                _, nearest = cKDTree(centers).query(cell_centers[~contained])
+                found[~contained] = nearest
+            grid[layer] = area_ids[rows][found].reshape(shape[0], shape[1])
+        return cls(grid, origin, cell_size, z_cutoff)
+
+    def lookup(self, points: np.ndarray) -> np.ndarray:
+        """Returns the area id of the cell of every point
+
+        Points outside the grid use the closest cell on its border.
+
+        Args:
+            points (np.ndarray): Points with shape (n, 3)
+
+        Returns:
+            Area ids with shape (n,). Points that are not finite get area id 0
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        area_ids = np.zeros(len(points), dtype=np.int64)
+        finite = np.isfinite(points).all(axis=1)
+        cells = np.floor((points[finite, :2] - self.origin) / self.cell_size)
+        cells = np.clip(cells, 0, np.array(self.grid.shape[1:]) - 1).astype(np.int64)
+        if self.z_cutoff is None:
+            layers = np.zeros(len(cells), dtype=np.int64)
+        else:
+            layers = (points[finite, 2] < self.z_cutoff).astype(np.int64)
+        area_ids[finite] = self.grid[layers, cells[:, 0], cells[:, 1]]
+        return area_ids
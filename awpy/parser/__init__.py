@@ -1,3 +1,16 @@
+import importlib
+from typing import Any
+
 __all__ = ["demoparser.py"]
 
-from awpy.parser.demoparser import DemoParser
+_LAZY_ATTRIBUTES = {"DemoParser": "awpy.parser.demoparser"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
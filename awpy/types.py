@@ -25,6 +25,7 @@ class Area(TypedDict):
 
 
 DistanceType = Literal["graph", "geodesic", "euclidean"]
+ReferencePoint = Literal["centroid", "representative_point", "median_dist"]
 AreaMatrix = dict[str, dict[str, dict[DistanceType, float]]]
 PlaceMatrix = dict[
     str,
@@ -32,7 +33,7 @@ PlaceMatrix = dict[
         str,
         dict[
             DistanceType,
-            dict[Literal["centroid", "representative_point", "median_dist"], float],
+            dict[ReferencePoint, float],
         ],
     ],
 ]
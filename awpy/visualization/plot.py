@@ -9,6 +9,7 @@
 """
 import os
 import shutil
+from functools import lru_cache
 from typing import Optional, Literal, cast
 import numpy as np
 import imageio
@@ -19,8 +20,100 @@ from awpy.data import MAP_DATA
 from awpy.types import GameFrame, GameRound
 
 
+MAP_IMAGE_CACHE_SIZE = 32
+
+
+def _read_map_image(base_path: str, suffix: str, has_lower: bool) -> np.ndarray:
+    map_bg = imageio.imread(base_path + suffix + ".png")
+    if has_lower:
+        map_bg_lower = imageio.imread(base_path + "_lower" + suffix + ".png")
+        map_bg = np.concatenate([map_bg, map_bg_lower])
+    return map_bg
+
+
+def _downsample_image(image: np.ndarray, factor: int) -> np.ndarray:
+    """Averages blocks of factor x factor pixels. Trailing rows and columns that do not fill a block are dropped"""
+    height = image.shape[0] // factor * factor
+    width = image.shape[1] // factor * factor
+    blocks = image[:height, :width].reshape(
+        height // factor, factor, width // factor, factor, *image.shape[2:]
+    )
+    return blocks.mean(axis=(1, 3)).round().astype(image.dtype)
+
+
+@lru_cache(maxsize=MAP_IMAGE_CACHE_SIZE)
+def _load_map_image(
+    map_name: str, map_type: str, dark: bool, downsample: int
+) -> np.ndarray:
+    if downsample > 1:
+        map_bg = _downsample_image(
+            _load_map_image(map_name, map_type, dark, 1), downsample
+        )
+    else:
+        base_path = os.path.join(
+            os.path.dirname(__file__), f"""../data/map/{map_name}"""
+        )
+        has_lower = map_name in MAP_DATA and "z_cutoff" in MAP_DATA[map_name]
+        if map_type == "original":
+            map_bg = _read_map_image(base_path, "", has_lower)
+        else:
+            try:
+                col = "light"
+                if dark:
+                    col = "dark"
+                map_bg = _read_map_image(base_path, f"_{col}", has_lower)
+            except FileNotFoundError:
+                map_bg = _read_map_image(base_path, "", has_lower)
+    # The same array is handed to every caller
+    map_bg.setflags(write=False)
+    return map_bg
+
+
+def load_map_image(
+    map_name: str = "de_dust2",
+    map_type: str = "original",
+    dark: bool = False,
+    downsample: int = 1,
+) -> np.ndarray:
+    """Returns the decoded radar image of a map.
+
+    Maps with a z_cutoff have their lower level appended below the upper level.
+    Decoded images are kept in a process wide LRU cache of MAP_IMAGE_CACHE_SIZE entries,
+    so repeated calls (like one per frame in plot_round) only read the file once.
+    The returned array is shared between callers and therefore read-only.
+
+    Args:
+        map_name (string, optional): Map to search. Defaults to "de_dust2"
+        map_type (string, optional): "original" or "simpleradar". Defaults to "original"
+        dark (bool, optional): Only for use with map_type="simpleradar".
+            Indicates if you want to use the SimpleRadar dark map type
+            Defaults to False
+        downsample (int, optional): Integer factor to reduce the resolution by.
+            Defaults to 1 (full resolution)
+
+    Returns:
+        numpy array of shape (height, width, channels)
+
+    Raises:
+        ValueError: Raises a ValueError if downsample is smaller than 1
+    """
+    if downsample < 1:
+        raise ValueError(f"'downsample' has to be at least 1 not {downsample}")
+    if map_type == "original":
+        dark = False
+    return _load_map_image(map_name, map_type, bool(dark), int(downsample))
+
+
+def clear_map_image_cache() -> None:
+    """Drops all decoded radar images from the cache"""
+    _load_map_image.cache_clear()
+
+
 def plot_map(
-    map_name: str = "de_dust2", map_type: str = "original", dark: bool = False
+    map_name: str = "de_dust2",
+    map_type: str = "original",
+    dark: bool = False,
+    downsample: int = 1,
 ) -> tuple[plt.Figure, plt.Axes]:
     """Plots a blank map.
 
@@ -30,32 +123,21 @@ def plot_map(
         dark (bool, optional): Only for use with map_type="simpleradar".
             Indicates if you want to use the SimpleRadar dark map type
             Defaults to False
+        downsample (int, optional): Integer factor to reduce the resolution of the radar by.
+            The axes keep the coordinates of the full resolution image.
+            Defaults to 1 (full resolution)
 
     Returns:
         matplotlib fig and ax
     """
-    base_path = os.path.join(os.path.dirname(__file__), f"""../data/map/{map_name}""")
-    if map_type == "original":
-        map_bg = imageio.imread(base_path + ".png")
-        if map_name in MAP_DATA and "z_cutoff" in MAP_DATA[map_name]:
-            map_bg_lower = imageio.imread(base_path + "_lower.png")
-            map_bg = np.concatenate([map_bg, map_bg_lower])
-    else:
-        try:
-            col = "light"
-            if dark:
-                col = "dark"
-            map_bg = imageio.imread(base_path + f"_{col}.png")
-            if map_name in MAP_DATA and "z_cutoff" in MAP_DATA[map_name]:
-                map_bg_lower = imageio.imread(base_path + f"_lower_{col}.png")
-                map_bg = np.concatenate([map_bg, map_bg_lower])
-        except FileNotFoundError:
-            map_bg = imageio.imread(base_path + ".png")
-            if map_name in MAP_DATA and "z_cutoff" in MAP_DATA[map_name]:
-                map_bg_lower = imageio.imread(base_path + "_lower.png")
-                map_bg = np.concatenate([map_bg, map_bg_lower])
+    map_bg = load_map_image(map_name, map_type, dark, downsample)
     fig, ax = plt.subplots()
-    ax.imshow(map_bg, zorder=0)
+    if downsample > 1:
+        height = map_bg.shape[0] * downsample
+        width = map_bg.shape[1] * downsample
+        ax.imshow(map_bg, zorder=0, extent=(-0.5, width - 0.5, height - 0.5, -0.5))
+    else:
+        ax.imshow(map_bg, zorder=0)
     return fig, ax
 
 
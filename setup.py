@@ -66,6 +66,8 @@ setup(
             "data/map/*.json",
             "data/nav/*.txt",
             "data/nav/*.csv",
+            "data/nav/*.json",
+            "data/nav/*.npy",
             "*.mod",
             "*.sum",
         ]
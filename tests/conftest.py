@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def nav_cache_dir(tmp_path_factory):
+    """Points the nav cache to a temporary directory for the whole session, so tests
+    never read stale files from or write to the user's ~/.cache/awpy"""
+    previous = os.environ.get("AWPY_CACHE_DIR")
+    os.environ["AWPY_CACHE_DIR"] = str(tmp_path_factory.mktemp("awpy_cache"))
+    yield
+    if previous is None:
+        del os.environ["AWPY_CACHE_DIR"]
+    else:
+        os.environ["AWPY_CACHE_DIR"] = previous
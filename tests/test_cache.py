@@ -0,0 +1,145 @@
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pytest
+
+from awpy.data import (
+    NAV,
+    NAV_GRAPHS,
+    PATH,
+    build_nav_graph,
+    compile_nav,
+    register_nav,
+)
+from awpy.analytics.nav import area_distance
+import awpy.data
+from awpy.data.cache import (
+    clear_nav_cache,
+    load_nav_cache,
+    nav_cache_dir,
+    read_edge_list,
+    save_nav_cache,
+    sources_checksum,
+)
+
+
+class TestCache:
+    """Class to test the compiled nav cache"""
+
+    def setup_class(self):
+        """Setup class by redirecting the cache to a temporary directory"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {"AWPY_CACHE_DIR": self.tmp_dir.name})
+        self.env.start()
+
+    def teardown_class(self):
+        """Restore the cache directory"""
+        self.env.stop()
+        self.tmp_dir.cleanup()
+
+    def test_cache_dir(self):
+        """Tests that the cache directory follows AWPY_CACHE_DIR"""
+        assert str(nav_cache_dir()).startswith(self.tmp_dir.name)
+
+    def test_roundtrip(self):
+        """Tests compiling, loading and invalidating a map"""
+        mesh = compile_nav("de_cache")
+        checksum = sources_checksum(
+            [PATH + "nav/nav_info.csv", PATH + "nav/de_cache.txt"]
+        )
+        assert (nav_cache_dir() / "de_cache.npz").exists()
+        loaded = load_nav_cache("de_cache", checksum)
+        assert loaded is not None
+        assert np.array_equal(loaded.area_ids, mesh.area_ids)
+        assert np.array_equal(loaded.centers, mesh.centers)
+        assert np.array_equal(loaded.edges, mesh.edges)
+        assert np.array_equal(loaded.edge_weights, mesh.edge_weights)
+        assert loaded.to_dict() == NAV["de_cache"].to_dict()
+        assert load_nav_cache("de_cache", "stale") is None
+        clear_nav_cache("de_cache")
+        assert load_nav_cache("de_cache", checksum) is None
+        assert save_nav_cache(mesh, checksum) is not None
+        assert load_nav_cache("de_cache", checksum) is not None
+
+    def test_edges(self):
+        """Tests the edge list and the graph built from it"""
+        edges = read_edge_list(PATH + "nav/de_cache.txt")
+        assert edges.shape[1] == 2
+        graph = build_nav_graph(compile_nav("de_cache"))
+        assert graph.number_of_edges() == len(edges)
+        a, b = edges[0].tolist()
+        assert graph[a][b]["weight"] > 0
+
+    def test_register_nav(self):
+        """Tests adding a custom map"""
+        areas_csv = os.path.join(self.tmp_dir.name, "de_custom.csv")
+        edges_txt = os.path.join(self.tmp_dir.name, "de_custom.txt")
+        with open(areas_csv, "w", encoding="utf8") as f:
+            f.write(
+                "areaId,areaName,northWestX,northWestY,northWestZ,southEastX,southEastY,southEastZ\n"
+                "1,Start,0,10,0,10,0,0\n"
+                "2,,10,10,0,20,0,0\n"
+                "3,End,20,10,0,30,0,0\n"
+            )
+        with open(edges_txt, "w", encoding="utf8") as f:
+            f.write("1,2\n2,1\n2,3\n3,2\n")
+        assert "de_custom" not in NAV
+        register_nav("de_custom", areas_csv, edges_txt)
+        try:
+            assert "de_custom" in NAV
+            assert "de_custom" not in NAV.loaded()
+            assert (nav_cache_dir() / "de_custom.npz").exists()
+            assert NAV["de_custom"][2]["areaName"] == ""
+            assert NAV_GRAPHS["de_custom"].number_of_edges() == 4
+            assert area_distance("de_custom", 1, 3, "graph")["distance"] == 2
+            assert area_distance("de_custom", 1, 3, "geodesic")["distance"] == 20
+            # Unchanged files are not compiled again
+            with patch("awpy.data.compile_nav") as compile_mock:
+                register_nav("de_custom", areas_csv, edges_txt)
+                assert compile_mock.call_count == 0
+            # Invalid files are rejected and keep the previous registration
+            invalid_edges_txt = os.path.join(self.tmp_dir.name, "de_custom_invalid.txt")
+            with open(invalid_edges_txt, "w", encoding="utf8") as f:
+                f.write("1,2\n3,4\n")
+            with pytest.raises(ValueError):
+                register_nav("de_custom", areas_csv, invalid_edges_txt)
+            assert NAV["de_custom"].edges.shape == (4, 2)
+        finally:
+            NAV._map_names.remove("de_custom")
+            NAV_GRAPHS._map_names.remove("de_custom")
+            NAV.pop("de_custom", None)
+            NAV_GRAPHS.pop("de_custom", None)
+            awpy.data._CUSTOM_NAV.pop("de_custom")
+
+    def test_register_nav_invalid(self):
+        """Tests the validation of custom maps"""
+        areas_csv = os.path.join(self.tmp_dir.name, "de_invalid.csv")
+        with pytest.raises(ValueError):
+            register_nav("de_dust2", areas_csv)
+        for map_name in [
+            "",
+            ".",
+            "..",
+            "../de_invalid",
+            "de/invalid",
+            "de invalid",
+            "de_dust2.raster_8",
+        ]:
+            with pytest.raises(ValueError):
+                register_nav(map_name, areas_csv)
+        with open(areas_csv, "w", encoding="utf8") as f:
+            f.write("areaId,northWestX\n1,0\n")
+        with pytest.raises(ValueError):
+            register_nav("de_invalid", areas_csv)
+        with open(areas_csv, "w", encoding="utf8") as f:
+            f.write(
+                "areaId,northWestX,northWestY,northWestZ,southEastX,southEastY,southEastZ\n"
+                "1,0,10,0,10,0,0\n"
+                "1,10,10,0,20,0,0\n"
+            )
+        with pytest.raises(ValueError):
+            register_nav("de_invalid", areas_csv)
+        with pytest.raises(FileNotFoundError):
+            register_nav("de_invalid", areas_csv + ".missing")
+        assert "de_invalid" not in NAV
@@ -1,6 +1,14 @@
+import pytest
 import networkx
 
-from awpy.data import MAP_DATA, NAV, NAV_CSV, NAV_GRAPHS, PLACE_DIST_MATRIX
+from awpy.data import (
+    MAP_DATA,
+    NAV,
+    NAV_CSV,
+    NAV_GRAPHS,
+    PLACE_DIST_MATRIX,
+    LazyMapDict,
+)
 
 
 class TestDataImports:
@@ -56,3 +64,18 @@ class TestDataImports:
             "representative_point": 2135.6869302332207,
             "median_dist": 2196.9121452155255,
         }
+
+    def test_lazy_loading(self):
+        """Tests that maps are only materialized when accessed"""
+        lazy_nav = LazyMapDict(lambda: ["de_a", "de_b"], lambda m: {"name": m})
+        assert "de_a" in lazy_nav
+        assert "de_c" not in lazy_nav
+        assert lazy_nav.keys() == ["de_a", "de_b"]
+        assert lazy_nav.loaded() == []
+        assert lazy_nav["de_b"] == {"name": "de_b"}
+        assert lazy_nav.loaded() == ["de_b"]
+        assert lazy_nav.get("de_c") is None
+        assert dict(lazy_nav) == {"de_a": {"name": "de_a"}, "de_b": {"name": "de_b"}}
+        with pytest.raises(KeyError):
+            _ = lazy_nav["de_c"]
+        assert "de_dust2" in NAV_GRAPHS
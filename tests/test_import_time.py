@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import pytest
+
+# Entry point -> (budget in seconds for the cumulative import time, modules it must not import)
+IMPORT_BUDGETS = {
+    "awpy": (0.1, ["numpy", "pandas", "awpy.parser.wrapper"]),
+    "awpy.data": (0.5, ["pandas", "networkx", "scipy", "sympy", "shapely"]),
+    "awpy.analytics.nav": (
+        0.75,
+        ["pandas", "networkx", "scipy", "sympy", "shapely", "awpy.parser.wrapper"],
+    ),
+}
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """Imports a module in a fresh interpreter with `python -X importtime`
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Tuple of the cumulative import time of the module in seconds and the set of all imported modules
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0.0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        imported.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(cumulative_us) / 1e6
+    return cumulative, imported
+
+
+class TestImportTime:
+    """Class to test how expensive it is to import the common entry points"""
+
+    @pytest.mark.parametrize("module", list(IMPORT_BUDGETS))
+    def test_import_budget(self, module):
+        """Tests that an entry point stays within its import time budget"""
+        budget, forbidden = IMPORT_BUDGETS[module]
+        cumulative, imported = import_time(module)
+        assert module in imported
+        assert imported.isdisjoint(forbidden), imported.intersection(forbidden)
+        assert cumulative < budget, f"import {module} took {cumulative:.3f}s"
+
+    def test_lazy_attributes(self):
+        """Tests that the lazily loaded names still resolve"""
+        import awpy
+        import awpy.analytics
+
+        assert callable(awpy.analytics.player_stats)
+        assert "DemoParser" in dir(awpy)
+        with pytest.raises(AttributeError):
+            _ = awpy.does_not_exist
@@ -0,0 +1,63 @@
+import threading
+import pytest
+
+from awpy.data.lru import LRUCache
+
+
+class TestLRUCache:
+    """Class to test the LRU cache"""
+
+    def test_eviction(self):
+        """Tests that the least recently used entry is evicted"""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert "a" in cache
+        assert "c" in cache
+        assert len(cache) == 2
+        assert cache.get("b", "default") == "default"
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 2, "maxsize": 2}
+        cache.resize(1)
+        assert "a" not in cache
+        cache.clear()
+        assert cache.stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 1}
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=-1)
+
+    def test_get_or_compute(self):
+        """Tests computing missing values"""
+        cache = LRUCache(maxsize=10)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("a", compute) == 1
+        assert cache.get_or_compute("a", compute) == 1
+        assert len(calls) == 1
+        assert cache.get("a", valid=lambda value: value > 1) is None
+        assert cache.stats()["misses"] == 2
+        disabled = LRUCache(maxsize=0)
+        disabled.put("a", 1)
+        assert len(disabled) == 0
+
+    def test_threads(self):
+        """Tests concurrent use from several threads"""
+        cache = LRUCache(maxsize=50)
+
+        def work(offset):
+            for i in range(1000):
+                cache.get_or_compute((i + offset) % 100, lambda: i)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 8000
+        assert stats["size"] == 50
@@ -0,0 +1,158 @@
+import json
+import tempfile
+import pytest
+import numpy as np
+
+from awpy.data import PLACE_DIST_MATRIX
+from awpy.data.matrix import (
+    AreaDistanceMatrix,
+    PlaceDistanceMatrix,
+    SymmetricAreaDistanceMatrix,
+    DIST_TYPES,
+    REFERENCE_POINTS,
+)
+
+
+class TestMatrix:
+    """Class to test the array backed distance matrices"""
+
+    def setup_class(self):
+        """Setup class by defining a legacy area matrix"""
+        self.legacy_matrix = {
+            "1": {
+                "1": {"graph": 0.0, "geodesic": 0.0, "euclidean": 0.0},
+                "2": {"graph": 1.0, "geodesic": 1.5, "euclidean": 1.0},
+            },
+            "2": {
+                "1": {
+                    "graph": float("inf"),
+                    "geodesic": float("inf"),
+                    "euclidean": 1.0,
+                },
+                "2": {"graph": 0.0, "geodesic": 0.0, "euclidean": 0.0},
+            },
+        }
+
+    def test_area_matrix(self):
+        """Tests conversion from and to the legacy layout"""
+        matrix = AreaDistanceMatrix.from_dict("de_mock", self.legacy_matrix)
+        assert matrix.distances.shape == (2, 2, len(DIST_TYPES))
+        assert matrix.distance(1, 2, "geodesic") == 1.5
+        assert matrix.distance(2, 1, "graph") == float("inf")
+        assert matrix["1"]["2"] == self.legacy_matrix["1"]["2"]
+        assert matrix.to_dict() == self.legacy_matrix
+        assert matrix.rows([2, 1]).tolist() == [1, 0]
+        with pytest.raises(KeyError):
+            matrix.distance(1, 3, "graph")
+        with pytest.raises(ValueError):
+            AreaDistanceMatrix("de_mock", np.array([1]), np.zeros((2, 2, 3)))
+
+    def test_area_matrix_file(self):
+        """Tests saving and memory mapping a matrix"""
+        matrix = AreaDistanceMatrix.from_dict("de_mock", self.legacy_matrix)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            matrix.save(tmp_dir)
+            loaded = AreaDistanceMatrix.load(tmp_dir, "de_mock")
+            assert isinstance(loaded.distances, np.memmap)
+            assert loaded.to_dict() == self.legacy_matrix
+            assert loaded.predecessors is None
+            del loaded
+            with open(matrix.save_json(tmp_dir), encoding="utf8") as f:
+                assert json.load(f) == self.legacy_matrix
+
+    def test_area_matrix_paths(self):
+        """Tests walking predecessors"""
+        matrix = AreaDistanceMatrix.from_dict("de_mock", self.legacy_matrix)
+        with pytest.raises(ValueError):
+            matrix.path(1, 2, "graph")
+        # 1 -> 2 -> 3 for both path types, nothing leads back to 1
+        predecessors = np.full((3, 3, 2), -9999, dtype=np.int32)
+        predecessors[0, 1] = 0
+        predecessors[0, 2] = 1
+        predecessors[1, 2] = 1
+        matrix = AreaDistanceMatrix(
+            "de_mock", np.array([1, 2, 3]), np.zeros((3, 3, 3)), predecessors
+        )
+        assert matrix.path(1, 3, "geodesic") == [1, 2, 3]
+        assert matrix.path(2, 2, "graph") == [2]
+        assert matrix.path(3, 1, "graph") == []
+        with pytest.raises(ValueError):
+            matrix.path(1, 3, "euclidean")
+        with pytest.raises(ValueError):
+            AreaDistanceMatrix(
+                "de_mock", np.array([1, 2, 3]), np.zeros((3, 3, 3)), predecessors[:2]
+            )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            matrix.save(tmp_dir)
+            loaded = AreaDistanceMatrix.load(tmp_dir, "de_mock")
+            assert loaded.predecessors.dtype == np.int32
+            assert loaded.path(1, 3, "graph") == [1, 2, 3]
+            del loaded
+            # Saving without predecessors removes the stale file
+            AreaDistanceMatrix("de_mock", matrix.area_ids, matrix.distances).save(
+                tmp_dir
+            )
+            assert AreaDistanceMatrix.load(tmp_dir, "de_mock").predecessors is None
+
+    def test_symmetric_matrix(self):
+        """Tests the condensed symmetric area matrix"""
+        rng = np.random.default_rng(0)
+        directed = rng.uniform(1, 10, size=(5, 5, 3))
+        directed[2, 4] = np.inf
+        directed[4, 2] = np.inf
+        directed[0, 3, 1] = np.inf
+        area_ids = np.array([7, 3, 11, 5, 2])
+        matrix = AreaDistanceMatrix("de_mock", area_ids, directed)
+        symmetric = SymmetricAreaDistanceMatrix.from_area_matrix(matrix)
+        assert symmetric.distances.shape == (10, 2)
+        expected = np.minimum(directed, directed.transpose(1, 0, 2)).astype(np.float32)
+        for i in range(5):
+            expected[i, i] = 0
+        for dist_type in ["graph", "geodesic"]:
+            pair_distances = symmetric.pair_distances(
+                area_ids[:, None], area_ids[None, :], dist_type
+            )
+            assert np.array_equal(
+                pair_distances, expected[..., DIST_TYPES.index(dist_type)]
+            )
+        assert symmetric.distance(11, 2, "geodesic") == float("inf")
+        assert symmetric.distance(5, 7, "geodesic") == symmetric.distance(
+            7, 5, "geodesic"
+        )
+        with pytest.raises(ValueError):
+            symmetric.distance(7, 3, "euclidean")
+        with pytest.raises(KeyError):
+            symmetric.distance(7, 4, "graph")
+        with pytest.raises(ValueError):
+            SymmetricAreaDistanceMatrix("de_mock", area_ids, np.zeros((9, 2)))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            symmetric.save(tmp_dir)
+            loaded = SymmetricAreaDistanceMatrix.load(tmp_dir, "de_mock")
+            assert isinstance(loaded.distances, np.memmap)
+            assert loaded.distances.dtype == np.float32
+            assert np.array_equal(loaded.distances, symmetric.distances)
+            assert np.array_equal(loaded.area_ids, area_ids)
+            del loaded
+
+    def test_place_matrix(self):
+        """Tests the array backed place matrix"""
+        matrix = PLACE_DIST_MATRIX["de_nuke"]
+        assert isinstance(matrix, PlaceDistanceMatrix)
+        assert matrix.places == sorted(matrix.places)
+        assert matrix.distances.shape == (
+            len(matrix.places),
+            len(matrix.places),
+            len(DIST_TYPES),
+            len(REFERENCE_POINTS),
+        )
+        assert matrix.distance("Silo", "TSpawn", "graph", "centroid") == 27
+        assert matrix["Silo"]["TSpawn"]["graph"]["median_dist"] == 28.0
+        legacy = matrix.to_dict()
+        assert PlaceDistanceMatrix.from_dict("de_nuke", legacy).to_dict() == legacy
+        with pytest.raises(ValueError):
+            PlaceDistanceMatrix("de_mock", ["b", "a"], np.zeros((2, 2, 3, 3)))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            matrix.save(tmp_dir)
+            loaded = PlaceDistanceMatrix.load(tmp_dir, "de_nuke")
+            assert loaded.places == matrix.places
+            assert np.array_equal(loaded.distances, matrix.distances.astype(np.float32))
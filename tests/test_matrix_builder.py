@@ -0,0 +1,159 @@
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from awpy.analytics.matrix_builder import build_matrices, compute_block
+from awpy.analytics.nav import compute_area_distance_matrix, main
+from awpy.data.matrix import (
+    AreaDistanceMatrix,
+    PlaceDistanceMatrix,
+    SymmetricAreaDistanceMatrix,
+    REFERENCE_POINT_INDEX,
+)
+
+
+def failing_build(map_name, output_dir):
+    """Derived build that always fails, importable by pool workers"""
+    raise RuntimeError("failed")
+
+
+def failing_block(map_name, start, stop):
+    """compute_block that fails for the first block and is slow for the others"""
+    if start == 0:
+        raise RuntimeError("failed")
+    time.sleep(0.5)
+    return compute_block(map_name, start, stop)
+
+
+class TestMatrixBuilder:
+    """Class to test the parallel distance matrix builder"""
+
+    def setup_class(self):
+        """Setup class by computing the reference matrix"""
+        self.map_name = "de_vertigo"
+        self.expected = compute_area_distance_matrix(self.map_name)
+
+    def check_area_matrix(self, directory):
+        """Compares a built matrix with compute_area_distance_matrix"""
+        matrix = AreaDistanceMatrix.load(directory, self.map_name)
+        assert np.array_equal(matrix.area_ids, self.expected.area_ids)
+        assert np.array_equal(
+            matrix.distances, self.expected.distances.astype(np.float32)
+        )
+        assert np.array_equal(matrix.predecessors, self.expected.predecessors)
+
+    def test_build_resume(self):
+        """Tests that checkpointed blocks are not computed again"""
+        with pytest.raises(ValueError):
+            build_matrices(["de_does_not_exist"])
+        with pytest.raises(ValueError):
+            build_matrices([self.map_name], block_size=0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                # An interrupted run that finished the first block
+                compute_block(self.map_name, 0, 300)
+                with patch(
+                    "awpy.analytics.matrix_builder.compute_block",
+                    wraps=compute_block,
+                ) as compute_mock:
+                    paths = build_matrices(
+                        [self.map_name],
+                        os.path.join(tmp_dir, "out"),
+                        processes=1,
+                        block_size=300,
+                        places=False,
+                        symmetric=False,
+                    )
+                assert [call.args[1] for call in compute_mock.call_args_list] == [
+                    300,
+                    600,
+                ]
+                assert paths[self.map_name].name.endswith(f"{self.map_name}.npy")
+                self.check_area_matrix(os.path.join(tmp_dir, "out"))
+                assert not os.path.exists(
+                    SymmetricAreaDistanceMatrix.paths(
+                        os.path.join(tmp_dir, "out"), self.map_name
+                    )[0]
+                )
+                assert not any(
+                    "matrix_block" in file
+                    for file in os.listdir(os.path.join(tmp_dir, "nav"))
+                )
+
+    def test_build_pool(self):
+        """Tests building area and place matrices in a process pool"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                out_dir = os.path.join(tmp_dir, "out")
+                main(
+                    [
+                        "build-matrices",
+                        self.map_name,
+                        "--output",
+                        out_dir,
+                        "--processes",
+                        "2",
+                        "--block-size",
+                        "400",
+                    ]
+                )
+                self.check_area_matrix(out_dir)
+                places = PlaceDistanceMatrix.load(out_dir, self.map_name)
+                assert places.places == sorted(places.places)
+                assert places.distances.dtype == np.float32
+                diagonal = places.distances[
+                    np.arange(len(places)), np.arange(len(places))
+                ]
+                assert np.all(diagonal[..., REFERENCE_POINT_INDEX["centroid"]] == 0)
+                symmetric = SymmetricAreaDistanceMatrix.load(out_dir, self.map_name)
+                assert np.array_equal(
+                    symmetric.distances,
+                    SymmetricAreaDistanceMatrix.from_area_matrix(
+                        self.expected
+                    ).distances,
+                )
+
+    def test_build_failure(self, caplog):
+        """Tests that a failing derived build names its map and step"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                with patch(
+                    "awpy.analytics.matrix_builder.build_place_matrix", failing_build
+                ):
+                    for processes in [1, 2]:
+                        caplog.clear()
+                        with pytest.raises(RuntimeError):
+                            build_matrices(
+                                [self.map_name],
+                                os.path.join(tmp_dir, "out"),
+                                processes=processes,
+                                symmetric=False,
+                            )
+                        assert f"{self.map_name}: failing_build failed" in caplog.text
+
+    def test_build_failure_cancels(self):
+        """Tests that a failing block cancels the blocks still queued"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                with patch(
+                    "awpy.analytics.matrix_builder.compute_block", failing_block
+                ):
+                    with pytest.raises(RuntimeError):
+                        build_matrices(
+                            [self.map_name],
+                            os.path.join(tmp_dir, "out"),
+                            processes=2,
+                            block_size=50,
+                        )
+                blocks = [
+                    file
+                    for file in os.listdir(os.path.join(tmp_dir, "nav"))
+                    if "matrix_block" in file
+                ]
+                # Only the blocks the two workers and their call queue already hold
+                # finish, not the rest of the 16
+                assert len(blocks) <= 5
@@ -1,5 +1,6 @@
 import sys
 import os
+import tempfile
 import math
 from collections import defaultdict
 from unittest.mock import patch
@@ -8,22 +9,39 @@ import numpy as np
 
 
 from awpy.data import NAV, create_nav_graphs
+from awpy.data.matrix import AreaDistanceMatrix, DIST_TYPE_INDEX
 from awpy.analytics.nav import (
     area_distance,
+    area_distances,
     find_closest_area,
+    find_closest_areas,
+    locate_areas,
+    area_raster,
+    place_names,
+    place_indices,
     generate_position_token,
     tree,
     point_distance,
     point_in_area,
     generate_centroids,
     stepped_hull,
+    _stepped_hull_array,
+    CENTROID_CACHE,
     position_state_distance,
     token_state_distance,
     get_array_for_frame,
     frame_distance,
     token_distance,
     generate_area_distance_matrix,
+    compute_area_distance_matrix,
+    reconstruct_path,
+    distance_field,
+    DISTANCE_FIELD_CACHE,
+    AREA_DISTANCE_CACHE,
     generate_place_distance_matrix,
+    compute_place_distance_matrix,
+    generate_symmetric_distance_matrix,
+    symmetric_area_distances,
 )
 
 
@@ -286,7 +304,9 @@ class TestNav:
         for file in os.listdir(self.dir):
             if (
                 file == self.file_name
-                or file == f"area_distance_matrix_{self.map_name}.json"
+                or file == f"area_distance_matrix_{self.map_name}.npy"
+                or file == f"area_distance_ids_{self.map_name}.npy"
+                or file == f"area_predecessors_{self.map_name}.npy"
                 or file == f"place_distance_matrix_{self.map_name}.json"
             ):
                 os.remove(os.path.join(self.dir, file))
@@ -335,6 +355,219 @@ class TestNav:
         assert isinstance(area_found, dict)
         assert area_found["areaId"] == 152
 
+    def test_find_areas(self):
+        """Tests find_closest_areas against the linear scan"""
+        with pytest.raises(ValueError):
+            find_closest_areas(map_name="test", points=np.zeros((1, 3)))
+        with pytest.raises(ValueError):
+            find_closest_areas(map_name="de_dust2", points=np.zeros((1, 2)))
+        mesh = NAV["de_dust2"]
+        rng = np.random.default_rng(0)
+        points = rng.uniform(
+            mesh.centers.min(axis=0), mesh.centers.max(axis=0), size=(200, 3)
+        )
+        # Exactly on an area center, halfway between two centers and not finite
+        points[0] = mesh.centers[mesh.row(152)]
+        points[1] = (mesh.centers[0] + mesh.centers[1]) / 2
+        points[2] = np.nan
+        area_ids, distances = find_closest_areas("de_dust2", points)
+        assert area_ids.shape == (200,)
+        assert area_ids[0] == 152
+        assert distances[0] == 0
+        assert area_ids[2] == 0
+        assert distances[2] == float("inf")
+        for point, area_id, distance in zip(points, area_ids, distances):
+            closest = find_closest_area("de_dust2", point.tolist())
+            assert closest["areaId"] == area_id
+            assert closest["distance"] == distance
+        area_ids, distances = find_closest_areas("de_dust2", np.zeros((0, 3)))
+        assert len(area_ids) == len(distances) == 0
+
+    def test_locate_areas(self):
+        """Tests locate_areas"""
+        with pytest.raises(ValueError):
+            locate_areas(map_name="test", points=np.zeros((1, 3)))
+        with pytest.raises(ValueError):
+            locate_areas(map_name="de_dust2", points=np.zeros((1, 2)))
+        fake_nav = {
+            1: {
+                "areaName": "Lower",
+                "northWestX": 0.0,
+                "northWestY": 10.0,
+                "northWestZ": 0.0,
+                "southEastX": 100.0,
+                "southEastY": 0.0,
+                "southEastZ": 0.0,
+            },
+            2: {
+                "areaName": "Upper",
+                "northWestX": 0.0,
+                "northWestY": 10.0,
+                "northWestZ": 200.0,
+                "southEastX": 10.0,
+                "southEastY": 0.0,
+                "southEastZ": 200.0,
+            },
+            3: {
+                "areaName": "Far",
+                "northWestX": 500.0,
+                "northWestY": 510.0,
+                "northWestZ": 0.0,
+                "southEastX": 510.0,
+                "southEastY": 500.0,
+                "southEastZ": 0.0,
+            },
+            4: {
+                "areaName": "Next",
+                "northWestX": 100.0,
+                "northWestY": 10.0,
+                "northWestZ": 0.0,
+                "southEastX": 110.0,
+                "southEastY": 0.0,
+                "southEastZ": 0.0,
+            },
+        }
+        points = np.array(
+            [
+                # Far from the center of the long area 1 but inside it
+                [95, 5, 0],
+                # Both 1 and 2 contain the point in x and y
+                [5, 5, 190],
+                [5, 5, 10],
+                # Outside of every area, closest to the center of 3
+                [400, 400, 0],
+                [np.nan, 0, 0],
+            ]
+        )
+        with patch("awpy.analytics.nav.NAV", {"de_fake": fake_nav}):
+            area_ids, contained = locate_areas("de_fake", points)
+            assert area_ids.tolist() == [1, 2, 1, 3, 0]
+            assert contained.tolist() == [True, True, True, False, False]
+            assert find_closest_area("de_fake", [95, 5, 0])["areaId"] == 4
+        mesh = NAV["de_dust2"]
+        area_ids, contained = locate_areas("de_dust2", mesh.centers)
+        assert contained.all()
+        located = mesh.rows(area_ids)
+        lower = np.minimum(mesh.north_west, mesh.south_east)[located, :2]
+        upper = np.maximum(mesh.north_west, mesh.south_east)[located, :2]
+        assert (lower <= mesh.centers[:, :2]).all()
+        assert (mesh.centers[:, :2] <= upper).all()
+
+    def test_area_raster(self):
+        """Tests the rasterized area lookup"""
+        with pytest.raises(ValueError):
+            area_raster("test")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                raster = area_raster("de_nuke", cell_size=16)
+                assert raster.grid.shape[0] == 2
+                assert raster.z_cutoff == -495
+                assert raster.cell_size == 16
+                assert os.path.exists(
+                    os.path.join(tmp_dir, "nav", "de_nuke.raster_16.npz")
+                )
+                # The raster is kept and reused without a cell size
+                assert area_raster("de_nuke") is raster
+                # and loaded from the cache instead of being rebuilt
+                NAV["de_nuke"]._area_raster = None
+                with patch("awpy.data.navmesh.AreaRaster.build") as build_mock:
+                    assert np.array_equal(area_raster("de_nuke", 16).grid, raster.grid)
+                    assert build_mock.call_count == 0
+                # The cells at the centers of large areas hold an area containing them
+                mesh = NAV["de_nuke"]
+                sizes = np.abs(mesh.north_west - mesh.south_east)[:, :2].min(axis=1)
+                rows = np.flatnonzero(sizes > 64)
+                found = mesh.rows(raster.lookup(mesh.centers[rows]))
+                lower = np.minimum(mesh.north_west, mesh.south_east)[found, :2]
+                upper = np.maximum(mesh.north_west, mesh.south_east)[found, :2]
+                assert (lower <= mesh.centers[rows, :2]).all()
+                assert (mesh.centers[rows, :2] <= upper).all()
+                point = mesh.centers[rows[0]].tolist()
+                closest = find_closest_area("de_nuke", point, use_raster=True)
+                assert closest["areaId"] == raster.lookup(np.array([point]))[0]
+                assert closest["distance"] == pytest.approx(
+                    math.dist(point, mesh.centers[mesh.row(closest["areaId"])])
+                )
+                area_ids, _ = find_closest_areas(
+                    "de_nuke", mesh.centers[rows], use_raster=True
+                )
+                assert np.array_equal(area_ids, raster.lookup(mesh.centers[rows]))
+                NAV["de_nuke"]._area_raster = None
+
+    def test_landmarks(self):
+        """Tests the landmark bounds used by geodesic searches"""
+        mesh = NAV["de_nuke"]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                mesh._landmarks = None
+                mesh._uncached_landmarks.clear()
+                area_a, area_b = mesh.area_ids[0].item(), mesh.area_ids[-1].item()
+                # Geodesic searches never build landmarks themselves
+                with patch("awpy.data.navmesh.Landmarks.build") as build_mock:
+                    unbounded = area_distance("de_nuke", area_a, area_b, "geodesic")
+                    assert mesh.cached_landmarks() is None
+                    assert build_mock.call_count == 0
+                landmarks = mesh.landmarks(k=4)
+                assert mesh.cached_landmarks() is landmarks
+                assert area_distance("de_nuke", area_a, area_b, "geodesic") == (
+                    unbounded
+                )
+                assert len(landmarks) == 4
+                assert len(set(landmarks.rows.tolist())) == 4
+                assert os.path.exists(
+                    os.path.join(tmp_dir, "nav", "de_nuke.landmarks_4.npz")
+                )
+                assert mesh.landmarks() is landmarks
+                mesh._landmarks = None
+                with patch("awpy.data.navmesh.Landmarks.build") as build_mock:
+                    assert np.array_equal(mesh.landmarks(4).rows, landmarks.rows)
+                    assert build_mock.call_count == 0
+                rng = np.random.default_rng(2)
+                pairs = rng.choice(mesh.area_ids, size=(50, 2))
+                rows_a, rows_b = mesh.rows(pairs[:, 0]), mesh.rows(pairs[:, 1])
+                exact = np.array(
+                    [
+                        area_distance("de_nuke", int(a), int(b), "geodesic")["distance"]
+                        for a, b in pairs
+                    ]
+                )
+                lower = landmarks.lower_bound(rows_a, rows_b)
+                upper = landmarks.upper_bound(rows_a, rows_b)
+                assert np.all(lower <= exact + 1e-6)
+                assert np.all(exact <= upper + 1e-6)
+                assert landmarks.upper_bound(rows_a[0], rows_a[0]) == 0
+                # Pruned searches find the same paths as full ones
+                pruned = [
+                    area_distance("de_nuke", a, b, "geodesic")
+                    for a, b in pairs[:10].tolist()
+                ]
+                with patch("awpy.analytics.nav.NAV", {"de_nuke": mesh.to_dict()}):
+                    for (a, b), distance_obj in zip(pairs[:10].tolist(), pruned):
+                        assert (
+                            area_distance("de_nuke", a, b, "geodesic") == distance_obj
+                        )
+                mesh._landmarks = None
+
+    def test_place_indices(self):
+        """Tests place_names and place_indices"""
+        with pytest.raises(ValueError):
+            place_names("test")
+        with pytest.raises(ValueError):
+            place_indices("test", np.zeros((1, 3)))
+        names = place_names("de_dust2")
+        assert names == sorted(
+            {NAV["de_dust2"][a]["areaName"] for a in NAV["de_dust2"]}
+        )
+        assert place_names("de_dust2") == names
+        mesh = NAV["de_dust2"]
+        points = np.vstack([mesh.centers[:20], [[np.nan, 0, 0]]])
+        indices = place_indices("de_dust2", points)
+        assert indices.dtype == np.int16
+        assert indices[-1] == -1
+        for point, index in zip(points[:-1], indices[:-1]):
+            area_id = find_closest_area("de_dust2", point.tolist())["areaId"]
+            assert names[index] == NAV["de_dust2"][area_id]["areaName"]
+
     def test_area_distance(self):
         """Tests area distance"""
         with pytest.raises(ValueError):
@@ -371,6 +604,298 @@ class TestNav:
         assert isinstance(euc_dist, dict)
         assert len(euc_dist["areas"]) == 0
 
+    def test_distance_field(self):
+        """Tests distance_field"""
+        with pytest.raises(ValueError):
+            distance_field("test", 152)
+        with pytest.raises(ValueError):
+            distance_field("de_dust2", 0)
+        with pytest.raises(ValueError):
+            distance_field("de_dust2", [])
+        with pytest.raises(ValueError):
+            distance_field("de_dust2", 152, "test")
+        mesh = NAV["de_dust2"]
+        others = mesh.area_ids[::100].tolist()
+        for dist_type in ["graph", "geodesic", "euclidean"]:
+            field = distance_field("de_dust2", 152, dist_type)
+            assert field.shape == (len(mesh),)
+            assert not field.flags.writeable
+            for area_id in others:
+                assert field[mesh.row(area_id)] == pytest.approx(
+                    area_distance("de_dust2", 152, area_id, dist_type)["distance"]
+                )
+        DISTANCE_FIELD_CACHE.clear()
+        field = distance_field("de_dust2", [152, others[1]], "geodesic")
+        assert distance_field("de_dust2", (others[1], 152), "geodesic") is field
+        assert DISTANCE_FIELD_CACHE.stats()["hits"] == 1
+        assert np.array_equal(
+            field,
+            np.minimum(
+                distance_field("de_dust2", 152, "geodesic"),
+                distance_field("de_dust2", others[1], "geodesic"),
+            ),
+        )
+        # Patched meshes never see fields of another mesh with the same name
+        fake_nav = {"de_dust2": {152: mesh[152]}}
+        with patch("awpy.analytics.nav.NAV", fake_nav):
+            assert distance_field("de_dust2", 152, "euclidean").tolist() == [0]
+
+    def test_area_distances(self):
+        """Tests the batched area distances against area_distance"""
+        with pytest.raises(ValueError):
+            area_distances("test", [[152, 152]])
+        with pytest.raises(ValueError):
+            area_distances("de_dust2", [[152, 0]])
+        with pytest.raises(ValueError):
+            area_distances("de_dust2", [[152, 152]], "test")
+        rng = np.random.default_rng(3)
+        pairs = rng.choice(NAV["de_dust2"].area_ids, size=(40, 2))
+        # Repeated sources and an unreachable pair
+        pairs = np.vstack([pairs, pairs[:5, ::-1], [[8251, 8773]], pairs[:3]])
+        assert area_distances("de_dust2", np.empty((0, 2))).shape == (0,)
+        matrix = compute_area_distance_matrix("de_dust2")
+        for dist_type in ["graph", "geodesic", "euclidean"]:
+            expected = [
+                area_distance("de_dust2", area_a, area_b, dist_type)
+                for area_a, area_b in pairs.tolist()
+            ]
+            expected_distances = [e["distance"] for e in expected]
+            expected_paths = [e["areas"] for e in expected]
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+                distances = area_distances("de_dust2", pairs, dist_type)
+                assert distances == pytest.approx(expected_distances)
+                distances, paths = area_distances(
+                    "de_dust2", pairs, dist_type, return_paths=True
+                )
+                assert distances == pytest.approx(expected_distances)
+                assert paths == expected_paths
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_dust2": matrix}):
+                with patch("scipy.sparse.csgraph.dijkstra") as dijkstra_mock:
+                    distances, paths = area_distances(
+                        "de_dust2", pairs, dist_type, return_paths=True
+                    )
+                    dijkstra_mock.assert_not_called()
+                assert distances == pytest.approx(expected_distances)
+                assert paths == expected_paths
+
+    def test_symmetric_area_distances(self):
+        """Tests the shorter of both directions between many areas"""
+        with pytest.raises(ValueError):
+            symmetric_area_distances("de_does_not_exist", [152], [8970])
+        with pytest.raises(ValueError):
+            symmetric_area_distances("de_dust2", [152], [8970], "manhattan")
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+            with pytest.raises(ValueError):
+                symmetric_area_distances("de_dust2", [152], [0])
+        mesh = NAV["de_nuke"]
+        rng = np.random.default_rng(2)
+        area_ids_a = rng.choice(mesh.area_ids, size=7)
+        area_ids_b = rng.choice(mesh.area_ids, size=3)
+        matrix = compute_area_distance_matrix("de_nuke")
+        symmetric_matrix = generate_symmetric_distance_matrix("de_nuke")
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_nuke": matrix}):
+            assert symmetric_matrix.distances.tobytes() == (
+                generate_symmetric_distance_matrix("de_nuke").distances.tobytes()
+            )
+        for dist_type in ["graph", "geodesic"]:
+            rows_a, rows_b = matrix.rows(area_ids_a), matrix.rows(area_ids_b)
+            index = DIST_TYPE_INDEX[dist_type]
+            expected = np.minimum(
+                matrix.distances[rows_a[:, None], rows_b[None, :], index],
+                matrix.distances[rows_b[None, :], rows_a[:, None], index],
+            )
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+                # Searches from the smaller side, the result keeps the argument order
+                searched = symmetric_area_distances(
+                    "de_nuke", area_ids_a, area_ids_b, dist_type
+                )
+                assert searched.shape == (7, 3)
+                assert np.allclose(searched, expected)
+                assert np.allclose(
+                    symmetric_area_distances(
+                        "de_nuke", area_ids_b, area_ids_a, dist_type
+                    ),
+                    expected.T,
+                )
+                with patch(
+                    "awpy.analytics.nav.SYMMETRIC_DIST_MATRIX",
+                    {"de_nuke": symmetric_matrix},
+                ):
+                    assert np.allclose(
+                        symmetric_area_distances(
+                            "de_nuke", area_ids_a, area_ids_b, dist_type
+                        ),
+                        expected,
+                    )
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_nuke": matrix}):
+                assert np.allclose(
+                    symmetric_area_distances(
+                        "de_nuke", area_ids_a, area_ids_b, dist_type
+                    ),
+                    expected,
+                )
+        # State distances agree with every source of the distances
+        pos_state1 = np.stack([area_ids_a[:5], area_ids_a[2:]])[..., None]
+        pos_state2 = np.stack([area_ids_b[:2], area_ids_a[:2]])[..., None]
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_nuke": matrix}):
+            expected_state = position_state_distance(
+                "de_nuke", pos_state1, pos_state2, "geodesic"
+            )
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+            assert position_state_distance(
+                "de_nuke", pos_state1, pos_state2, "geodesic"
+            ) == pytest.approx(expected_state)
+            with patch(
+                "awpy.analytics.nav.SYMMETRIC_DIST_MATRIX",
+                {"de_nuke": symmetric_matrix},
+            ):
+                assert position_state_distance(
+                    "de_nuke", pos_state1, pos_state2, "geodesic"
+                ) == pytest.approx(expected_state)
+
+    def test_geodesic_approx(self):
+        """Tests the landmark approximation of geodesic distance against exact results"""
+        with pytest.raises(ValueError):
+            area_distances("de_dust2", [[152, 0]], "geodesic_approx")
+        for map_name in ["de_dust2", "de_nuke", "de_train"]:
+            mesh = NAV[map_name]
+            rng = np.random.default_rng(4)
+            pairs = rng.choice(mesh.area_ids, size=(500, 2))
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+                exact = area_distances(map_name, pairs, "geodesic")
+                approx = area_distances(map_name, pairs, "geodesic_approx")
+                assert area_distance(
+                    map_name, *pairs[0].tolist(), "geodesic_approx"
+                ) == {
+                    "distanceType": "geodesic_approx",
+                    "distance": approx[0],
+                    "areas": [],
+                }
+            landmarks = mesh.landmarks()
+            rows = mesh.rows(pairs.ravel()).reshape(-1, 2)
+            with np.errstate(invalid="ignore"):
+                gap = landmarks.upper_bound(rows[:, 0], rows[:, 1]) - approx
+            reachable = np.isfinite(exact)
+            # Unreachable pairs stay unreachable
+            assert np.all(np.isinf(approx[~reachable]))
+            # The documented bound: approx <= exact <= approx + (upper - lower)
+            assert np.all(approx[reachable] <= exact[reachable] + 1e-6)
+            bounded = reachable & np.isfinite(gap)
+            assert np.all(exact[bounded] - approx[bounded] <= gap[bounded] + 1e-6)
+            # Pairs without an upper bound are exact
+            assert np.allclose(approx[~np.isfinite(gap)], exact[~np.isfinite(gap)])
+            relative = (exact[reachable] - approx[reachable]) / np.maximum(
+                exact[reachable], 1
+            )
+            assert np.median(relative) < 0.01
+        # With an area matrix the exact value is returned
+        matrix = compute_area_distance_matrix("de_nuke")
+        pairs = np.random.default_rng(4).choice(NAV["de_nuke"].area_ids, size=(50, 2))
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_nuke": matrix}):
+            assert np.allclose(
+                area_distances("de_nuke", pairs, "geodesic_approx"),
+                area_distances("de_nuke", pairs, "geodesic"),
+            )
+        point_a, point_b = [-2497, -224, 200], [-1900, -1200, 100]
+        assert (
+            point_distance("de_dust2", point_a, point_b, "geodesic_approx")["distance"]
+            <= point_distance("de_dust2", point_a, point_b, "geodesic")["distance"]
+        )
+        pos_state1 = np.array([[[-500, -850, 100], [-445, -105, 135]]])
+        pos_state2 = np.array([[[-550, -100, 130], [-500, -850, 100]]])
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+            approx_state = position_state_distance(
+                "de_ancient", pos_state1, pos_state2, "geodesic_approx"
+            )
+            exact_state = position_state_distance(
+                "de_ancient", pos_state1, pos_state2, "geodesic"
+            )
+        assert isinstance(approx_state, float)
+        assert approx_state <= exact_state + 1e-6
+        assert 0 < approx_state
+
+    def test_area_distance_cache(self):
+        """Tests the opt-in area_distance cache"""
+        AREA_DISTANCE_CACHE.disable()
+        mesh = NAV["de_ancient"]
+        area_a, area_b = mesh.area_ids[0].item(), mesh.area_ids[50].item()
+        uncached = area_distance("de_ancient", area_a, area_b, "geodesic")
+        assert AREA_DISTANCE_CACHE.stats()["misses"] == 0
+        AREA_DISTANCE_CACHE.enable(maxsize=2)
+        try:
+            assert area_distance("de_ancient", area_a, area_b, "geodesic") == uncached
+            cached = area_distance("de_ancient", area_a, area_b, "geodesic")
+            assert cached == uncached
+            cached["areas"].append(-1)
+            assert area_distance("de_ancient", area_a, area_b, "geodesic") == uncached
+            for dist_type in ["graph", "euclidean"]:
+                area_distance("de_ancient", area_a, area_b, dist_type)
+            stats = AREA_DISTANCE_CACHE.stats()
+            assert (stats["hits"], stats["misses"]) == (2, 3)
+            assert (stats["size"], stats["maxsize"]) == (2, 2)
+            # Patched meshes never see results of another mesh with the same name
+            fake_nav = {"de_ancient": {area_a: mesh[area_a], area_b: mesh[area_b]}}
+            with patch("awpy.analytics.nav.NAV", fake_nav):
+                area_distance("de_ancient", area_a, area_b, "euclidean")
+            assert AREA_DISTANCE_CACHE.stats()["misses"] == 4
+            with pytest.raises(ValueError):
+                AREA_DISTANCE_CACHE.warm("test")
+            with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+                with pytest.raises(ValueError):
+                    AREA_DISTANCE_CACHE.warm("de_ancient")
+                pos_state1 = np.array([[[-500, -850, 100], [-445, -105, 135]]])
+                pos_state2 = np.array([[[-550, -100, 130], [-500, -850, 100]]])
+                expected = position_state_distance(
+                    "de_ancient", pos_state1, pos_state2, distance_type="graph"
+                )
+                expected_objs = {
+                    dist_type: area_distance("de_ancient", area_a, area_b, dist_type)
+                    for dist_type in ["graph", "geodesic", "euclidean"]
+                }
+                AREA_DISTANCE_CACHE.warm(
+                    "de_ancient", compute_area_distance_matrix("de_ancient")
+                )
+                assert AREA_DISTANCE_CACHE.stats()["matrices"] == 1
+                with patch("awpy.analytics.nav.area_distance") as area_distance_mock:
+                    assert (
+                        position_state_distance(
+                            "de_ancient", pos_state1, pos_state2, distance_type="graph"
+                        )
+                        == expected
+                    )
+                    area_distance_mock.assert_not_called()
+                with patch("awpy.analytics.nav._area_distance") as search_mock:
+                    for dist_type, expected_obj in expected_objs.items():
+                        warmed = area_distance("de_ancient", area_a, area_b, dist_type)
+                        assert warmed["distanceType"] == dist_type
+                        assert warmed["distance"] == pytest.approx(
+                            expected_obj["distance"]
+                        )
+                        assert len(warmed["areas"]) == len(expected_obj["areas"])
+                        assert warmed["areas"][:1] == expected_obj["areas"][:1]
+                        assert warmed["areas"][-1:] == expected_obj["areas"][-1:]
+                    AREA_DISTANCE_CACHE.disable()
+                    AREA_DISTANCE_CACHE.warm(
+                        "de_ancient", compute_area_distance_matrix("de_ancient")
+                    )
+                    assert (
+                        area_distance("de_ancient", area_a, area_b, "geodesic_approx")[
+                            "distance"
+                        ]
+                        == expected_objs["geodesic"]["distance"]
+                    )
+                    search_mock.assert_not_called()
+                assert AREA_DISTANCE_CACHE.stats()["hits"] == 1
+        finally:
+            AREA_DISTANCE_CACHE.disable()
+        assert AREA_DISTANCE_CACHE.stats() == {
+            "hits": 0,
+            "misses": 0,
+            "size": 0,
+            "maxsize": 0,
+            "matrices": 0,
+        }
+
     def test_point_distance(self):
         """Tests point distance"""
         with pytest.raises(ValueError):
@@ -576,13 +1101,67 @@ class TestNav:
 
         assert isinstance(result_matrix, dict)
         assert os.path.exists(
-            os.path.join(self.dir, "area_distance_matrix_de_mock.json")
+            os.path.join(self.dir, "area_distance_matrix_de_mock.npy")
         )
+        assert os.path.exists(os.path.join(self.dir, "area_distance_ids_de_mock.npy"))
 
         assert self.expected_area_matrix == result_matrix
+        saved_matrix = AreaDistanceMatrix.load(self.dir, "de_mock")
+        assert isinstance(saved_matrix.distances, np.memmap)
+        assert saved_matrix.distances.dtype == np.float32
+        assert saved_matrix.distance(3, 2, "geodesic") == 3.0
+        assert saved_matrix.distance(2, 1, "graph") == float("inf")
+        assert saved_matrix["3"]["2"]["graph"] == 2.0
         with pytest.raises(ValueError):
             _ = generate_area_distance_matrix("de_does_not_exist")
 
+    def test_compute_area_distance_matrix(self):
+        """Tests the all pairs matrix against area_distance"""
+        with pytest.raises(ValueError):
+            compute_area_distance_matrix("de_does_not_exist")
+        matrix = compute_area_distance_matrix("de_dust2")
+        n_areas = len(NAV["de_dust2"])
+        assert matrix.distances.shape == (n_areas, n_areas, 3)
+        rng = np.random.default_rng(0)
+        for area_a, area_b in rng.choice(NAV["de_dust2"].area_ids, size=(20, 2)):
+            for dist_type in ["graph", "geodesic", "euclidean"]:
+                assert matrix.distance(area_a, area_b, dist_type) == pytest.approx(
+                    area_distance("de_dust2", area_a, area_b, dist_type)["distance"]
+                )
+        assert matrix.predecessors.shape == (n_areas, n_areas, 2)
+        assert compute_area_distance_matrix("de_dust2", False).predecessors is None
+
+    def test_reconstruct_path(self):
+        """Tests reconstruct_path against area_distance"""
+        with pytest.raises(ValueError):
+            reconstruct_path("de_does_not_exist", 152, 152)
+        with pytest.raises(ValueError):
+            reconstruct_path("de_dust2", 0, 152)
+        with pytest.raises(ValueError):
+            reconstruct_path("de_dust2", 152, 152, "euclidean")
+        area_ids = NAV["de_dust2"].area_ids
+        rng = np.random.default_rng(1)
+        pairs = rng.choice(area_ids, size=(20, 2)).tolist() + [[8251, 8773]]
+        expected = {
+            (area_a, area_b, dist_type): area_distance(
+                "de_dust2", area_a, area_b, dist_type
+            )["areas"]
+            for area_a, area_b in pairs
+            for dist_type in ["graph", "geodesic"]
+        }
+        # Without a matrix the path comes from area_distance
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+            for (area_a, area_b, dist_type), path in expected.items():
+                assert reconstruct_path("de_dust2", area_a, area_b, dist_type) == path
+            matrix = compute_area_distance_matrix("de_dust2")
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {"de_dust2": matrix}):
+            with patch("awpy.analytics.nav.area_distance") as area_distance_mock:
+                for (area_a, area_b, dist_type), path in expected.items():
+                    assert (
+                        reconstruct_path("de_dust2", area_a, area_b, dist_type) == path
+                    )
+                area_distance_mock.assert_not_called()
+
     def test_generate_place_distance_matrix(self):
         """Tests generate_place_distance_matrix"""
         # Need to mock awpy.data.NAV to properly test this
@@ -613,6 +1192,40 @@ class TestNav:
         with pytest.raises(ValueError):
             _ = generate_place_distance_matrix("de_does_not_exist")
 
+    def test_compute_place_distance_matrix(self):
+        """Tests the dense place distance matrix against its definition"""
+        with pytest.raises(ValueError):
+            compute_place_distance_matrix("de_does_not_exist")
+        area_matrix = compute_area_distance_matrix("de_vertigo")
+        with patch("awpy.analytics.nav.AREA_DIST_MATRIX", {}):
+            searched = compute_place_distance_matrix("de_vertigo")
+        from_matrix = compute_place_distance_matrix("de_vertigo", area_matrix)
+        assert searched.places == place_names("de_vertigo")
+        assert np.allclose(searched.distances, from_matrix.distances, rtol=1e-6)
+        centroids, reps = generate_centroids("de_vertigo")
+        mesh = NAV["de_vertigo"]
+        place1, place2 = searched.places[1], searched.places[-1]
+        rows1 = np.flatnonzero(mesh.area_names == place1)
+        rows2 = np.flatnonzero(mesh.area_names == place2)
+        for dist_type in ["graph", "geodesic", "euclidean"]:
+            assert searched.distance(
+                place1, place2, dist_type, "median_dist"
+            ) == pytest.approx(
+                np.median(
+                    area_matrix.distances[np.ix_(rows1, rows2)][
+                        ..., DIST_TYPE_INDEX[dist_type]
+                    ]
+                )
+            )
+            assert searched.distance(
+                place1, place2, dist_type, "representative_point"
+            ) == pytest.approx(
+                area_matrix.distance(reps[place1], reps[place2], dist_type)
+            )
+            assert from_matrix.distance(
+                place2, place1, dist_type, "centroid"
+            ) == area_matrix.distance(centroids[place2], centroids[place1], dist_type)
+
     def test_generate_centroids(self):
         """Tests generate centroids"""
         with pytest.raises(ValueError):
@@ -677,6 +1290,33 @@ class TestNav:
             "Kitchen": 441,
         }
 
+    def test_centroid_cache(self):
+        """Tests that centroids are computed once per nav mesh"""
+        expected = generate_centroids("de_inferno")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with patch.dict(os.environ, {"AWPY_CACHE_DIR": tmp_dir}):
+                CENTROID_CACHE.clear()
+                assert generate_centroids("de_inferno") == expected
+                assert os.path.exists(
+                    os.path.join(tmp_dir, "nav", "de_inferno.centroids.npz")
+                )
+                centroids, _ = generate_centroids("de_inferno")
+                # The cached dicts are not shared with callers
+                centroids["Quad"] = -1
+                assert CENTROID_CACHE.stats()["hits"] == 1
+                CENTROID_CACHE.clear()
+                with patch("awpy.analytics.nav._compute_centroids") as compute_mock:
+                    # Loaded from the nav cache
+                    assert generate_centroids("de_inferno") == expected
+                    assert compute_mock.call_count == 0
+                # Meshes that are not the one in NAV are computed again
+                with patch(
+                    "awpy.analytics.nav.NAV",
+                    {"de_inferno": NAV["de_inferno"].to_dict()},
+                ):
+                    assert generate_centroids("de_inferno") == expected
+                assert CENTROID_CACHE.stats()["misses"] == 2
+
     def test_stepped_hull(self):
         """Tests stepped hull"""
         hull = stepped_hull(
@@ -693,6 +1333,13 @@ class TestNav:
         assert hull == [(0, 1), (0, 0), (1, 0), (1, 1), (0, 1)]
         assert stepped_hull([(1, 1)]) == [(1, 1)]
         assert stepped_hull([]) == []
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            points = rng.integers(0, 5, size=(rng.integers(1, 20), 2)).astype(float)
+            assert _stepped_hull_array(points).tolist() == [
+                list(point)
+                for point in stepped_hull([tuple(point) for point in points.tolist()])
+            ]
 
     def test_position_state_distance(self):
         """Tests position state distance"""
@@ -768,6 +1415,37 @@ class TestNav:
         assert isinstance(dist, float)
         assert sys.maxsize / 7 < dist < sys.maxsize / 5
 
+    def test_token_state_distance_missing_places(self):
+        """Tests token distances on a map whose place matrix lacks places of the nav mesh"""
+        names = place_names("de_vertigo")
+        assert "BPlatform" in names
+        token_a = np.zeros(len(names))
+        token_a[names.index("APlatform")] = 1
+        token_b = np.zeros(len(names))
+        token_b[names.index("BackofB")] = 1
+        # Values of the previous, dict based implementation
+        for distance_type, expected in [
+            ("geodesic", 3972.730308010518),
+            ("graph", 39.0),
+            ("euclidean", 2352.0270512900142),
+        ]:
+            assert token_state_distance(
+                "de_vertigo", token_a, token_b, distance_type
+            ) == pytest.approx(expected)
+        # Places that are not in the matrix are compared by their centroids
+        token_c = np.zeros(len(names))
+        token_c[names.index("BPlatform")] = 1
+        centroids, _ = generate_centroids("de_vertigo")
+        expected = min(
+            area_distance(
+                "de_vertigo", centroids["APlatform"], centroids["BPlatform"], "graph"
+            )["distance"],
+            area_distance(
+                "de_vertigo", centroids["BPlatform"], centroids["APlatform"], "graph"
+            )["distance"],
+        )
+        assert token_state_distance("de_vertigo", token_a, token_c, "graph") == expected
+
     def test_token_state_distance(self):
         """Tests token state distance"""
         token_array1 = np.array(
@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+
+from awpy.data import NAV, NavMesh
+from awpy.data.navmesh import _IdIndex
+
+
+class TestNavMesh:
+    """Class to test the columnar nav mesh"""
+
+    def setup_class(self):
+        """Setup class by defining a small mesh"""
+        self.areas = {
+            7: {
+                "areaName": "Place1",
+                "northWestX": 0.0,
+                "northWestY": 2.0,
+                "northWestZ": 0.0,
+                "southEastX": 2.0,
+                "southEastY": 0.0,
+                "southEastZ": 0.0,
+            },
+            3: {
+                "areaName": "Place2",
+                "northWestX": 2.0,
+                "northWestY": 2.0,
+                "northWestZ": 1.0,
+                "southEastX": 4.0,
+                "southEastY": 0.0,
+                "southEastZ": 1.0,
+            },
+        }
+        self.mesh = NavMesh.from_dict("de_mock", self.areas)
+
+    def test_arrays(self):
+        """Tests the array attributes"""
+        assert self.mesh.area_ids.tolist() == [7, 3]
+        assert self.mesh.area_names.tolist() == ["Place1", "Place2"]
+        assert self.mesh.centers.tolist() == [[1.0, 1.0, 0.0], [3.0, 1.0, 1.0]]
+        assert np.allclose(self.mesh.sizes, [np.sqrt(8), np.sqrt(8)])
+        assert self.mesh.row(3) == 1
+        assert self.mesh.rows([3, 7, 3]).tolist() == [1, 0, 1]
+        with pytest.raises(KeyError):
+            self.mesh.rows([5])
+
+    def test_id_index(self):
+        """Tests the id to row lookup shared with the distance matrices"""
+        index = _IdIndex(np.array([9, 2, 5]))
+        assert index.rows([5, 9, 2]).tolist() == [2, 0, 1]
+        assert index.rows(np.array([[2], [5]])).tolist() == [[1], [2]]
+        for missing in ([1], [10], [2, 6]):
+            with pytest.raises(KeyError):
+                index.rows(missing)
+        with pytest.raises(KeyError):
+            _IdIndex(np.array([], dtype=np.int64)).rows([1])
+        assert _IdIndex(np.array([], dtype=np.int64)).rows([]).tolist() == []
+
+    def test_mapping(self):
+        """Tests the read-only dict view"""
+        assert list(self.mesh) == [7, 3]
+        assert len(self.mesh) == 2
+        assert 7 in self.mesh
+        assert 5 not in self.mesh
+        assert self.mesh[7] == self.areas[7]
+        assert self.mesh.to_dict() == self.areas
+        with pytest.raises(KeyError):
+            _ = self.mesh[5]
+
+    def test_nav(self):
+        """Tests that NAV holds nav meshes"""
+        mesh = NAV["de_dust2"]
+        assert isinstance(mesh, NavMesh)
+        assert mesh[152]["areaName"] == "BombsiteA"
+        assert NavMesh.from_dict("de_dust2", mesh) is mesh
+
+    def test_csr_graph(self):
+        """Tests the sparse adjacency matrix"""
+        mesh = NavMesh.from_dict("de_mock", self.areas)
+        with pytest.raises(ValueError):
+            mesh.csr_graph()
+        mesh.set_edges(np.array([[7, 3], [7, 3], [3, 3]]), np.array([2.0, 2.0, 0.0]))
+        graph = mesh.csr_graph()
+        assert graph.shape == (2, 2)
+        assert graph.nnz == 2
+        assert graph[0, 1] == 2.0
+        assert NAV["de_dust2"].csr_graph().nnz == len(
+            np.unique(NAV["de_dust2"].edges, axis=0)
+        )
@@ -0,0 +1,51 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from awpy.analytics.nav import area_distance
+from awpy.data import NAV, PLACE_DIST_MATRIX
+from awpy.data.shared import attach_nav, share_nav
+
+
+def _shared_worker(map_name: str) -> dict:
+    """Inspects the nav data a pool worker sees after attaching"""
+    mesh = NAV[map_name]
+    return {
+        "owns_data": mesh.north_west.flags.owndata or mesh.area_ids.flags.owndata,
+        "writeable": mesh.north_west.flags.writeable,
+        "area_ids": mesh.area_ids.tolist(),
+        "place_distances": PLACE_DIST_MATRIX[map_name].distances.sum(),
+        "distance": area_distance(map_name, 473, 4084, "geodesic")["distance"],
+    }
+
+
+class TestShared:
+    """Class to test sharing nav data between processes"""
+
+    def test_share_nav(self):
+        """Tests that pool workers read the published arrays"""
+        with share_nav(["de_nuke"]) as shared:
+            assert list(shared.spec) == ["de_nuke"]
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=attach_nav,
+                initargs=(shared.spec,),
+            ) as pool:
+                result = pool.submit(_shared_worker, "de_nuke").result()
+        assert shared.spec == {}
+        assert not result["owns_data"]
+        assert not result["writeable"]
+        assert result["area_ids"] == NAV["de_nuke"].area_ids.tolist()
+        assert result["place_distances"] == PLACE_DIST_MATRIX["de_nuke"].distances.sum()
+        assert result["distance"] == pytest.approx(
+            area_distance("de_nuke", 473, 4084, "geodesic")["distance"]
+        )
+
+    def test_share_nav_unknown_map(self):
+        """Tests that unknown maps are rejected"""
+        with pytest.raises(ValueError):
+            share_nav(["de_does_not_exist"])
@@ -2,6 +2,7 @@ import os
 from unittest.mock import patch
 import pytest
 import matplotlib
+import imageio
 from awpy.visualization.plot import (
     position_transform,
     position_transform_all,
@@ -9,6 +10,8 @@ from awpy.visualization.plot import (
     plot_nades,
     plot_positions,
     plot_round,
+    load_map_image,
+    clear_map_image_cache,
 )
 
 
@@ -50,6 +53,30 @@ class TestVis:
         fig, axis = plot_map(map_name="de_anubis", map_type="simplerader")
         # Currently there is no map that has a z_cutoff but is missing simpleradar
 
+    def test_load_map_image(self):
+        """Test that radar images are decoded once and cached"""
+        clear_map_image_cache()
+        with patch(
+            "awpy.visualization.plot.imageio.imread", wraps=imageio.imread
+        ) as imread_mock:
+            image = load_map_image("de_vertigo")
+            assert imread_mock.call_count == 2
+            assert image.shape[0] == 2048
+            assert not image.flags.writeable
+            assert load_map_image("de_vertigo") is image
+            # dark is ignored for the original radar
+            assert load_map_image("de_vertigo", dark=True) is image
+            assert imread_mock.call_count == 2
+            small = load_map_image("de_vertigo", downsample=4)
+            assert imread_mock.call_count == 2
+            assert small.shape == (512, 256, image.shape[2])
+            assert small.dtype == image.dtype
+            assert small[0, 0, 0] == round(image[:4, :4, 0].mean())
+        with pytest.raises(ValueError):
+            load_map_image("de_vertigo", downsample=0)
+        fig, axis = plot_map(map_name="de_vertigo", downsample=4)
+        assert axis.images[0].get_extent() == [-0.5, 1023.5, 2047.5, -0.5]
+
     @patch("awpy.visualization.plot.mpl.axes.Axes.scatter")
     def test_plot_positions(self, scatter_mock):
         """Test plot positions"""